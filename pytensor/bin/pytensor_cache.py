@@ -1,6 +1,7 @@
 import logging
 import os
 import sys
+import time
 
 
 if sys.platform == "win32":
@@ -34,6 +35,16 @@ def print_help(exit_status):
         'Type "pytensor-cache cleanup" to delete keys in the old ' "format/code version"
     )
     print('Type "pytensor-cache purge" to force deletion of the cache directory')
+    print(
+        'Type "pytensor-cache trim [size]" to delete the least recently used '
+        "modules until the cache fits in size megabytes (defaults to the "
+        "cmodule__max_size flag)"
+    )
+    print(
+        'Type "pytensor-cache precompile <path>" to compile the C modules of '
+        "the functions defined in a Python module or file, or of a pickled "
+        "list of graphs"
+    )
     print(
         'Type "pytensor-cache basecompiledir" '
         "to print the parent of the cache directory"
@@ -50,6 +61,32 @@ def print_help(exit_status):
     sys.exit(exit_status)
 
 
+def trim(max_size):
+    """Trim the cache to `max_size` megabytes and report the reclaimed space."""
+    if max_size <= 0:
+        print(
+            "No maximum cache size: set the cmodule__max_size flag or "
+            'call "pytensor-cache trim <size in megabytes>"'
+        )
+        return
+    cache = get_module_cache(init_args=dict(do_refresh=False))
+    reclaimed = cache.trim(max_size * 2**20)
+    print(f"Reclaimed {reclaimed / 2**20:.1f} MB in {cache.dirname}")
+
+
+def precompile(path):
+    """Compile the functions defined in `path` and report the cache usage."""
+    start_time = time.perf_counter()
+    n_functions, hits, misses, compile_time = pytensor.compile.compiledir.precompile(
+        path
+    )
+    print(
+        f"Precompiled {n_functions} functions in "
+        f"{time.perf_counter() - start_time:.1f}s into {config.compiledir}: "
+        f"{hits} hits, {misses} misses, {compile_time:.1f}s compiling"
+    )
+
+
 def main():
     if len(sys.argv) == 1:
         print(config.compiledir)
@@ -91,6 +128,8 @@ def main():
             print("Lock successfully removed!")
         elif sys.argv[1] == "purge":
             pytensor.compile.compiledir.compiledir_purge()
+        elif sys.argv[1] == "trim":
+            trim(config.cmodule__max_size)
         elif sys.argv[1] == "basecompiledir":
             # Simply print the base_compiledir
             print(pytensor.config.base_compiledir)
@@ -103,6 +142,14 @@ def main():
             pytensor.compile.compiledir.basecompiledir_purge()
         else:
             print_help(exit_status=1)
+    elif len(sys.argv) == 3 and sys.argv[1] == "trim":
+        try:
+            max_size = int(sys.argv[2])
+        except ValueError:
+            print_help(exit_status=1)
+        trim(max_size)
+    elif len(sys.argv) == 3 and sys.argv[1] == "precompile":
+        precompile(sys.argv[2])
     else:
         print_help(exit_status=1)
 
@@ -59,3 +59,4 @@ from pytensor.compile.ops import (
 )
 from pytensor.compile.profiling import ProfileStats
 from pytensor.compile.sharedvalue import SharedVariable, shared, shared_constructor
+from pytensor.compile.tieredmode import TieredMode
@@ -0,0 +1,209 @@
+"""
+Evaluate the calls of a function made by concurrent callers in batches.
+
+`BatchedFunction` compiles a vectorized version of a graph with
+`vectorize_graph`, in which each input has an additional leading batch
+dimension. The calls made by concurrent callers, e.g. the threads of a
+server, are queued, and a background thread evaluates them together with a
+single call of the vectorized function, whose outputs are then split between
+the callers.
+
+"""
+
+import logging
+import queue
+import threading
+import time
+from collections.abc import Sequence
+from concurrent.futures import Future
+from typing import Optional
+
+import numpy as np
+
+from pytensor.compile.function.pfunc import pfunc
+from pytensor.compile.io import In
+from pytensor.compile.sharedvalue import SharedVariable
+from pytensor.graph.basic import Variable
+from pytensor.graph.replace import vectorize_graph
+from pytensor.tensor.type import TensorType
+
+
+_logger = logging.getLogger("pytensor.compile.batching")
+
+
+class BatchedFunction:
+    r"""A function whose concurrent calls are evaluated in batches.
+
+    The calls are queued and evaluated by a background thread. The thread
+    waits at most `max_delay` seconds after the first call in the queue for
+    more calls, or until `max_batch_size` calls are queued, stacks their
+    arguments, and evaluates the vectorized graph once. The calls whose
+    arguments do not have the same shapes are evaluated in separate batches,
+    and an error raised by the evaluation of a batch is raised by all its
+    calls. Each call returns its own copy of the outputs.
+    `BatchedFunction.submit` returns a `concurrent.futures.Future`, which
+    `asyncio.wrap_future` turns into an awaitable.
+
+    Parameters
+    ----------
+    inputs
+        The inputs of the function, `TensorVariable`\s without a batch
+        dimension.
+    outputs
+        The outputs of the function, a single variable or a list.
+    max_batch_size
+        The largest number of calls evaluated together.
+    max_delay
+        The longest time, in seconds, a call waits for other calls to be
+        evaluated with.
+    mode
+        The `Mode` used to compile the vectorized graph.
+    name
+        The name of the compiled `Function`.
+
+    Examples
+    --------
+    >>> import pytensor.tensor as pt
+    >>> from concurrent.futures import ThreadPoolExecutor
+    >>> from pytensor.compile.batching import BatchedFunction
+    >>> x = pt.dvector("x")
+    >>> f = BatchedFunction([x], pt.exp(x).sum(), max_batch_size=8)
+    >>> with ThreadPoolExecutor(8) as executor:
+    ...     results = list(executor.map(f, [[0.0, 1.0]] * 16))
+    >>> float(results[0])
+    3.718281828459045
+    >>> f.close()
+
+    """
+
+    def __init__(
+        self,
+        inputs: Sequence[Variable],
+        outputs,
+        max_batch_size: int = 32,
+        max_delay: float = 1e-3,
+        mode=None,
+        name: Optional[str] = None,
+    ):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        if max_delay < 0:
+            raise ValueError("max_delay must be non-negative")
+        self.inputs = list(inputs)
+        for inp in self.inputs:
+            if isinstance(inp, In):
+                raise TypeError(
+                    "BatchedFunction does not accept In instances, give the variables"
+                )
+            if isinstance(inp, SharedVariable) or not isinstance(inp.type, TensorType):
+                raise TypeError(f"Input {inp} is not a symbolic TensorVariable")
+
+        self.unpack_single = not isinstance(outputs, (list, tuple))
+        self.outputs = [outputs] if self.unpack_single else list(outputs)
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay
+
+        batched_inputs = [
+            inp.type.clone(shape=(None, *inp.type.shape))(name=inp.name)
+            for inp in self.inputs
+        ]
+        batched_outputs = vectorize_graph(
+            self.outputs, replace=dict(zip(self.inputs, batched_inputs))
+        )
+        # The outputs that do not depend on the inputs are not vectorized
+        self.batched = [
+            batched.type.ndim == out.type.ndim + 1
+            for out, batched in zip(self.outputs, batched_outputs)
+        ]
+        self.fn = pfunc(batched_inputs, batched_outputs, mode=mode, name=name)
+
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def submit(self, *args) -> Future:
+        """Queue a call of the function and return the `Future` of its result."""
+        if len(args) != len(self.inputs):
+            raise TypeError(f"Expected {len(self.inputs)} arguments, got {len(args)}")
+        values = [
+            inp.type.filter(arg, allow_downcast=None)
+            for inp, arg in zip(self.inputs, args)
+        ]
+        future: Future = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Cannot call a closed BatchedFunction")
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._worker, name="pytensor-batching", daemon=True
+                )
+                self._thread.start()
+            self._queue.put((values, future))
+        return future
+
+    def __call__(self, *args):
+        return self.submit(*args).result()
+
+    def close(self):
+        """Evaluate the queued calls and stop the background thread."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            thread = self._thread
+            if thread is not None:
+                self._queue.put(None)
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+
+    def _worker(self):
+        closing = False
+        while not closing:
+            request = self._queue.get()
+            if request is None:
+                return
+            requests = [request]
+            deadline = time.perf_counter() + self.max_delay
+            while len(requests) < self.max_batch_size:
+                timeout = deadline - time.perf_counter()
+                try:
+                    request = (
+                        self._queue.get(timeout=timeout)
+                        if timeout > 0
+                        else self._queue.get_nowait()
+                    )
+                except queue.Empty:
+                    break
+                if request is None:
+                    closing = True
+                    break
+                requests.append(request)
+
+            groups: dict[tuple, list] = {}
+            for request in requests:
+                if request[1].set_running_or_notify_cancel():
+                    key = tuple(value.shape for value in request[0])
+                    groups.setdefault(key, []).append(request)
+            for group in groups.values():
+                self._evaluate(group)
+
+    def _evaluate(self, requests):
+        try:
+            batch = [
+                np.stack(values) for values in zip(*(values for values, _ in requests))
+            ]
+            outputs = self.fn(*batch)
+        except Exception as e:
+            _logger.debug("Batched evaluation failed", exc_info=True)
+            for _, future in requests:
+                future.set_exception(e)
+            return
+
+        # Each call gets its own arrays, which do not keep the whole batch alive
+        for i, (_, future) in enumerate(requests):
+            result = [
+                out[i, ...].copy() if batched else out.copy()
+                for out, batched in zip(outputs, self.batched)
+            ]
+            future.set_result(result[0] if self.unpack_single else result)
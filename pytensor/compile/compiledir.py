@@ -3,15 +3,21 @@ This module contains housekeeping functions for cleaning/purging the "compiledir
 It is used by the "pytensor-cache" CLI tool, located in the /bin folder of the repository.
 """
 
+import importlib
 import logging
 import os
 import pickle
+import runpy
 import shutil
 
 import numpy as np
 
+from pytensor.compile.function import function
+from pytensor.compile.function.types import Function
 from pytensor.configdefaults import config
+from pytensor.graph.fg import FunctionGraph
 from pytensor.graph.op import Op
+from pytensor.link.c.basic import get_module_cache
 from pytensor.link.c.type import CType
 from pytensor.utils import flatten
 
@@ -267,3 +273,57 @@ def basecompiledir_ls():
 
 def basecompiledir_purge():
     shutil.rmtree(config.base_compiledir)
+
+
+def precompile(path, n_workers=0):
+    """
+    Compile ahead of time the C modules of all the functions defined in `path`.
+
+    `path` is either a Python file or an importable module name, which is run
+    and whose module-level `Function` objects are counted, or a pickle file
+    containing a list of `Function` objects, `FunctionGraph` objects or
+    ``(inputs, outputs)`` pairs, which are compiled with the default mode.
+
+    The missing modules of each function are compiled concurrently, by
+    `n_workers` compiler processes (0 means one per CPU).
+
+    Returns
+    -------
+    A tuple ``(n_functions, hits, misses, compile_time)``, where ``hits`` is
+    the number of modules that were found in the cache, ``misses`` the number
+    of modules that were compiled, and ``compile_time`` the time spent
+    compiling them, in seconds.
+
+    """
+    cache = get_module_cache()
+    stats = list(cache.stats)
+    compile_time = cache.time_spent_compiling
+
+    with config.change_flags(cmodule__compilation_workers=n_workers):
+        if path.endswith(".py") or not os.path.isfile(path):
+            if path.endswith(".py"):
+                namespace = runpy.run_path(path, run_name="__precompile__")
+            else:
+                namespace = vars(importlib.import_module(path))
+            functions = [f for f in namespace.values() if isinstance(f, Function)]
+        else:
+            with open(path, "rb") as f:
+                graphs = pickle.load(f)
+            functions = []
+            for graph in graphs:
+                if isinstance(graph, Function):
+                    functions.append(graph)
+                elif isinstance(graph, FunctionGraph):
+                    functions.append(function(graph.inputs, graph.outputs))
+                else:
+                    inputs, outputs = graph
+                    functions.append(function(inputs, outputs))
+
+    hits = cache.stats[0] + cache.stats[1] - stats[0] - stats[1]
+    misses = cache.stats[2] - stats[2]
+    return (
+        len(functions),
+        hits,
+        misses,
+        cache.time_spent_compiling - compile_time,
+    )
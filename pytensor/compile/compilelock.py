@@ -1,10 +1,16 @@
 """
-Locking mechanism to ensure no two compilations occur simultaneously
-in the same compilation directory (which can cause crashes).
+Locking mechanism to ensure no two processes modify the same part of a
+compilation directory simultaneously (which can cause crashes).
+
+`lock_ctx` locks a whole compilation directory, and is used for structural
+operations on the cache. `module_lock_ctx` only locks one module of it, so
+that unrelated modules can be compiled concurrently. `compile_thread_lock`
+serializes the compilations run by the threads of a single process.
 """
 
 import os
 import threading
+import time
 from contextlib import contextmanager
 from typing import Optional, Union
 
@@ -14,8 +20,11 @@ from pytensor.configdefaults import config
 
 
 __all__ = [
+    "compile_thread_lock",
     "force_unlock",
     "lock_ctx",
+    "module_lock_ctx",
+    "remove_module_lock",
 ]
 
 
@@ -26,6 +35,18 @@ class ThreadFileLocks(threading.local):
 
 local_mem = ThreadFileLocks()
 
+# Seconds between two attempts to acquire a module lock
+_POLL_INTERVAL = 0.05
+
+compile_thread_lock = threading.RLock()
+"""Lock held while a thread rewrites a graph and links it into a `Function`.
+
+The rewrites, the generation of the C code and the in-memory state of the
+`ModuleCache` are not thread-safe, so the functions compiled in background
+threads (e.g. by `TieredMode`) wait for the other compilations of the process.
+It is re-entrant, since compiling a graph can compile inner graphs.
+"""
+
 
 def force_unlock(lock_dir: os.PathLike):
     """Forces the release of the lock on a specific directory.
@@ -71,16 +92,144 @@ def lock_ctx(
     # locks are kept in a dictionary to account for changing compiledirs
     dir_key = f"{lock_dir}-{os.getpid()}"
 
-    if dir_key not in local_mem._locks:
-        local_mem._locks[dir_key] = True
-        fl = filelock.FileLock(os.path.join(lock_dir, ".lock"))
-        fl.acquire(timeout=timeout)
+    with _file_lock_ctx(os.path.join(lock_dir, ".lock"), dir_key, timeout):
+        yield
+
+
+@contextmanager
+def module_lock_ctx(
+    module_hash: str,
+    lock_dir: Optional[Union[str, os.PathLike]] = None,
+    *,
+    timeout: Optional[float] = None,
+):
+    """Context manager that locks a single module of a compilation directory.
+
+    The lock files are kept in the ``lock_dir`` subdirectory of the
+    compilation directory. Holding this lock does not prevent other modules,
+    or the directory as a whole with `lock_ctx`, from being locked, but each
+    attempt to acquire it is made while holding the lock of the whole
+    directory, so that `remove_module_lock` never deletes a lock file that is
+    being acquired.
+
+    Parameters
+    ----------
+    module_hash
+        The hash of the module to lock, as returned by
+        `pytensor.link.c.cmodule.get_module_hash`.
+    lock_dir
+        The compilation directory the module belongs to.
+        Defaults to `pytensor.config.compiledir`.
+    timeout
+        Timeout in seconds for waiting in lock acquisition.
+        Defaults to `pytensor.config.compile__timeout`.
+    """
+    if lock_dir is None:
+        lock_dir = config.compiledir
+
+    if timeout is None:
+        timeout = config.compile__timeout
+
+    module_key = f"{lock_dir}-{module_hash}-{os.getpid()}"
+
+    with _file_lock_ctx(
+        os.path.join(lock_dir, "lock_dir", f"{module_hash}.lock"),
+        module_key,
+        timeout,
+        parent_lock_dir=lock_dir,
+    ):
+        yield
+
+
+def remove_module_lock(
+    module_hash: str, lock_dir: Optional[Union[str, os.PathLike]] = None
+) -> bool:
+    """Delete the lock file of a module, if no process holds it.
+
+    The lock file is deleted while holding the lock of the whole compilation
+    directory, which `module_lock_ctx` also holds when it acquires a module
+    lock, so no process can be waiting on the deleted file.
+
+    Parameters
+    ----------
+    module_hash
+        The hash of the module whose lock file should be deleted.
+    lock_dir
+        The compilation directory the module belongs to.
+        Defaults to `pytensor.config.compiledir`.
+
+    Returns
+    -------
+    bool
+        Whether the lock file was deleted.
+    """
+    if lock_dir is None:
+        lock_dir = config.compiledir
+
+    lock_file = os.path.join(lock_dir, "lock_dir", f"{module_hash}.lock")
+    with lock_ctx(lock_dir):
+        if not os.path.exists(lock_file):
+            return False
+        fl = filelock.FileLock(lock_file)
+        try:
+            fl.acquire(timeout=0)
+        except filelock.Timeout:
+            return False
+        try:
+            os.remove(lock_file)
+        except OSError:
+            return False
+        finally:
+            fl.release()
+    return True
+
+
+@contextmanager
+def _file_lock_ctx(
+    lock_file: str,
+    lock_key: str,
+    timeout: float,
+    parent_lock_dir: Optional[Union[str, os.PathLike]] = None,
+):
+    """Acquire a `FileLock` on `lock_file`, unless this thread already holds it.
+
+    With `parent_lock_dir`, each attempt to acquire the lock is made while
+    holding the lock of that directory.
+    """
+    if lock_key not in local_mem._locks:
+        local_mem._locks[lock_key] = True
+        fl = filelock.FileLock(lock_file)
+        if parent_lock_dir is None:
+            fl.acquire(timeout=timeout)
+        else:
+            _acquire_under_dir_lock(fl, parent_lock_dir, timeout)
         try:
             yield
         finally:
             if fl.is_locked:
                 fl.release()
-            if dir_key in local_mem._locks:
-                del local_mem._locks[dir_key]
+            if lock_key in local_mem._locks:
+                del local_mem._locks[lock_key]
     else:
         yield
+
+
+def _acquire_under_dir_lock(
+    fl: filelock.FileLock, lock_dir: Union[str, os.PathLike], timeout: float
+):
+    """Acquire `fl`, trying only while holding the lock of `lock_dir`.
+
+    The lock of `lock_dir` is released between the attempts, so that it is
+    not held while waiting for `fl`.
+    """
+    start_time = time.monotonic()
+    while True:
+        with lock_ctx(lock_dir, timeout=timeout):
+            os.makedirs(os.path.dirname(fl.lock_file), exist_ok=True)
+            try:
+                fl.acquire(timeout=0)
+                return
+            except filelock.Timeout:
+                if 0 <= timeout < time.monotonic() - start_time:
+                    raise
+        time.sleep(_POLL_INTERVAL)
@@ -0,0 +1,77 @@
+"""
+A pool of copies of a `Function` that can be called from several threads.
+
+A `Function` evaluates its graph in the storage it owns, so it cannot be
+called by several threads at the same time. `FunctionPool` gives each thread
+its own copy of the original `Function`, made with `Function.copy` the first
+time the thread calls it, so that the graph is not rewritten again, and the
+compiled C modules are reused.
+
+"""
+
+import threading
+
+from pytensor.compile.function.types import Function
+
+
+class FunctionPool:
+    r"""Call a `Function` from several threads at the same time.
+
+    Each thread calling the pool gets its own `Function`, created the first
+    time it calls it and freed when the thread exits. The `Function`\s of the
+    threads share the storage of the shared variables of `fn`, so that the
+    values set, or updated, by a thread are seen by the others, but they have
+    separate storage for the other inputs, the intermediate results and the
+    outputs. The default values of the other inputs are the ones of `fn` when
+    the thread's `Function` is created.
+
+    `fn` itself is only used as a template and can still be called by one
+    thread at a time.
+
+    Parameters
+    ----------
+    fn
+        The `Function` to call.
+
+    Notes
+    -----
+    Calling functions that update the same shared variables from several
+    threads at the same time is not atomic: the threads may read the value of
+    a shared variable before another thread writes its update.
+
+    Examples
+    --------
+    >>> import pytensor.tensor as pt
+    >>> from concurrent.futures import ThreadPoolExecutor
+    >>> from pytensor import function
+    >>> from pytensor.compile.function.pool import FunctionPool
+    >>> x = pt.dscalar("x")
+    >>> pool = FunctionPool(function([x], 2 * x))
+    >>> with ThreadPoolExecutor(4) as executor:
+    ...     [float(y) for y in executor.map(pool, [1.0, 2.0, 3.0])]
+    [2.0, 4.0, 6.0]
+
+    """
+
+    def __init__(self, fn: Function):
+        if not isinstance(fn, Function):
+            raise TypeError(f"Expected a Function, got {fn}")
+        self.fn = fn
+        self._local = threading.local()
+
+    def get(self) -> Function:
+        """Return the `Function` of the calling thread."""
+        try:
+            return self._local.fn
+        except AttributeError:
+            pass
+        thread_fn = self.fn.copy(share_memory=False, name=self.fn.name)
+        self._local.fn = thread_fn
+        return thread_fn
+
+    def __call__(self, *args, **kwargs):
+        return self.get()(*args, **kwargs)
+
+    def call_many(self, inputs, stack=False):
+        """Call `Function.call_many` on the `Function` of the calling thread."""
+        return self.get().call_many(inputs, stack)
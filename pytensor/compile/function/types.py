@@ -1,10 +1,12 @@
 """Objects that orchestrate graph construction, rewriting, and linking."""
 
+import asyncio
 import copy
 import copyreg
 import logging
 import time
 import warnings
+import weakref
 from itertools import chain
 from typing import TYPE_CHECKING, Optional
 
@@ -12,6 +14,8 @@ import numpy as np
 
 import pytensor
 import pytensor.compile.profiling
+import pytensor.compile.rewritecache
+from pytensor.compile.compilelock import compile_thread_lock
 from pytensor.compile.io import In, SymbolicInput, SymbolicOutput
 from pytensor.compile.ops import deep_copy_op, view_op
 from pytensor.configdefaults import config
@@ -392,6 +396,8 @@ class Function:
         self.name = name
         self.nodes_with_inner_function = []
         self.output_keys = output_keys
+        # The locks that serialize the calls of `Function.acall`, per event loop
+        self._acall_locks: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
 
         # See if we have any mutable / borrow inputs
         # TODO: this only need to be set if there is more than one input
@@ -738,25 +744,26 @@ class Function:
         elif isinstance(profile, str):
             profile = pytensor.compile.profiling.ProfileStats(message=profile)
 
-        f_cpy = maker.__class__(
-            inputs=ins,
-            outputs=outs,
-            fgraph=fg_cpy,
-            mode=maker.mode,
-            profile=profile,
-            # When removing updates containing variables
-            # not used in the output function, copy
-            # generates an unused implicit input.
-            # We ignore the resulting errors,
-            # but could change it to 'warn' if this might
-            # cause problems.
-            on_unused_input="ignore",
-            function_builder=maker.function_builder,
-            # As this is an rewritten graph, it can contain inplace. DebugMode
-            # check that.
-            accept_inplace=True,
-            no_fgraph_prep=True,
-        ).create(input_storage, storage_map=new_storage_map)
+        with compile_thread_lock:
+            f_cpy = maker.__class__(
+                inputs=ins,
+                outputs=outs,
+                fgraph=fg_cpy,
+                mode=maker.mode,
+                profile=profile,
+                # When removing updates containing variables
+                # not used in the output function, copy
+                # generates an unused implicit input.
+                # We ignore the resulting errors,
+                # but could change it to 'warn' if this might
+                # cause problems.
+                on_unused_input="ignore",
+                function_builder=maker.function_builder,
+                # As this is an rewritten graph, it can contain inplace.
+                # DebugMode check that.
+                accept_inplace=True,
+                no_fgraph_prep=True,
+            ).create(input_storage, storage_map=new_storage_map)
 
         for in_ori, in_cpy, ori, cpy in zip(
             maker.inputs, f_cpy.maker.inputs, self.input_storage, f_cpy.input_storage
@@ -788,6 +795,14 @@ class Function:
         f_cpy.maker.fgraph.name = name
         return f_cpy
 
+    def _restore_defaults(self):
+        """Put the default values back in the storage of the inputs."""
+        for i, (required, refeed, value) in enumerate(self.defaults):
+            if refeed:
+                if isinstance(value, Container):
+                    value = value.storage[0]
+                self[i] = value
+
     def __call__(self, *args, **kwargs):
         """
         Evaluates value of a function on given arguments.
@@ -817,13 +832,7 @@ class Function:
             if ``output_subset`` is not passed.
         """
 
-        def restore_defaults():
-            for i, (required, refeed, value) in enumerate(self.defaults):
-                if refeed:
-                    if isinstance(value, Container):
-                        value = value.storage[0]
-                    self[i] = value
-
+        restore_defaults = self._restore_defaults
         profile = self.profile
         t0 = time.perf_counter()
 
@@ -1070,6 +1079,420 @@ class Function:
             else:
                 return [outputs[i] for i in output_subset]
 
+    def call_many(self, inputs, stack=False):
+        r"""Evaluate the function on each sequence of arguments of `inputs`.
+
+        This is equivalent to ``[f(*args) for args in inputs]``, but the
+        checks of `Function.__call__` that do not depend on the values of the
+        arguments are only done once, and the `CVM` loops over the calls in C,
+        which removes most of the overhead of calling small graphs.
+
+        Parameters
+        ----------
+        inputs
+            An iterable of sequences of positional arguments, which must all
+            have the same length.
+        stack
+            If ``True``, the values of each output are stacked along a new
+            first axis.
+
+        Returns
+        -------
+        The list of the results of the calls, or if `stack` is ``True``, the
+        stacked outputs in the structure of the result of a single call.
+
+        """
+        calls = [tuple(args) for args in inputs]
+        n_args = len(calls[0]) if calls else 0
+        if any(len(args) != n_args for args in calls):
+            raise TypeError("All the calls must have the same number of arguments")
+
+        containers = self.input_storage[:n_args]
+        if (
+            self.profile
+            or getattr(self.vm, "need_update_inputs", True)
+            or n_args > len(self.input_storage)
+            or any(c.implicit for c in containers)
+            or any(c.required for c in self.input_storage[n_args:])
+            or any(spec.mutable for spec in self.maker.inputs[:n_args])
+        ):
+            # Let `Function.__call__` deal with the profiling, the errors and
+            # the aliasing of the mutable inputs.
+            results = [self(*args) for args in calls]
+            return self._stack_results(results) if stack else results
+
+        t0 = time.perf_counter()
+        if self.trust_input:
+            values = calls
+        else:
+            columns = []
+            for i, c in enumerate(containers):
+                column = [args[i] for args in calls]
+                not_none = [j for j, arg in enumerate(column) if arg is not None]
+                try:
+                    filtered = c.type.filter_many(
+                        [column[j] for j in not_none],
+                        strict=c.strict,
+                        allow_downcast=c.allow_downcast,
+                    )
+                except Exception as e:
+                    e.args = (
+                        f"Bad input argument at index {i} (0-based). "
+                        f"{get_variable_trace_string(self.maker.inputs[i].variable)}",
+                        *e.args,
+                    )
+                    raise
+                for j, value in zip(not_none, filtered):
+                    column[j] = value
+                columns.append(column)
+            values = list(zip(*columns)) if columns else [()] * len(calls)
+
+        cells = [c.storage for c in containers]
+        t0_fn = time.perf_counter()
+        try:
+            if hasattr(self.vm, "position_of_error"):
+                all_outputs = self.vm(input_cells=cells, inputs=values)
+            else:
+                all_outputs = []
+                for call_values in values:
+                    for cell, value in zip(cells, call_values):
+                        cell[0] = value
+                    all_outputs.append(self.vm())
+        except Exception:
+            self._restore_defaults()
+            if getattr(self.vm, "position_of_error", -1) != -1:
+                thunk = None
+                if hasattr(self.vm, "thunks"):
+                    thunk = self.vm.thunks[self.vm.position_of_error]
+                raise_with_op(
+                    self.maker.fgraph,
+                    node=self.vm.nodes[self.vm.position_of_error],
+                    thunk=thunk,
+                    storage_map=getattr(self.vm, "storage_map", None),
+                )
+            raise
+        dt_fn = time.perf_counter() - t0_fn
+        self.maker.mode.fn_time += dt_fn
+
+        for c in self.input_storage:
+            if c.required:
+                c.storage[0] = None
+        if getattr(self.vm, "allow_gc", False):
+            for o_container, o_variable in zip(
+                self.output_storage, self.maker.fgraph.outputs
+            ):
+                if o_variable.owner is not None:
+                    o_container.storage[0] = None
+        self._restore_defaults()
+
+        dt_call = time.perf_counter() - t0
+        pytensor.compile.profiling.total_fct_exec_time += dt_call
+        self.maker.mode.call_time += dt_call
+
+        n_outputs = self.n_returned_outputs
+        if self.return_none:
+            results = [None] * len(all_outputs)
+        elif self.unpack_single and n_outputs == 1:
+            results = [outputs[0] for outputs in all_outputs]
+        elif self.output_keys is not None:
+            results = [
+                dict(zip(self.output_keys, outputs[:n_outputs]))
+                for outputs in all_outputs
+            ]
+        else:
+            results = [list(outputs[:n_outputs]) for outputs in all_outputs]
+        return self._stack_results(results) if stack else results
+
+    def _stack_results(self, results):
+        """Stack the values of each output in the `results` of several calls."""
+        if self.return_none:
+            return None
+        if self.unpack_single and self.n_returned_outputs == 1:
+            return np.stack(results)
+        if self.output_keys is not None:
+            return {
+                key: np.stack([result[key] for result in results])
+                for key in self.output_keys
+            }
+        return [np.stack(values) for values in zip(*results)]
+
+    def call_into(self, out, *args, **kwargs):
+        r"""Evaluate the function and write its outputs into the arrays of `out`.
+
+        The arrays are put in the storage of the outputs before the graph is
+        evaluated, so that the thunks that reuse their output storage, like
+        most C thunks and the `DeepCopyOp`\s inserted to protect the outputs,
+        write the results directly into them. The other outputs are copied
+        into their arrays after the evaluation.
+
+        Parameters
+        ----------
+        out
+            A list with one array per output of the function, or ``None`` to
+            let the function allocate the output, or a single array for a
+            function with a single output. The arrays must have the dtype and
+            the number of dimensions of the outputs.
+        args, kwargs
+            The inputs of the function, as for `Function.__call__`.
+            ``output_subset`` is not supported.
+
+        Returns
+        -------
+        The arrays of `out`, with the outputs allocated by the function in
+        place of the ``None`` entries.
+
+        Raises
+        ------
+        TypeError
+            Before the evaluation, if an array does not have the dtype, the
+            number of dimensions or the static shape of its output.
+        ValueError
+            After the evaluation, if the shape of an output is not the shape
+            of its array. The function has then been evaluated, and its
+            updates have been applied.
+        """
+        if "output_subset" in kwargs:
+            raise TypeError("output_subset is not supported by Function.call_into")
+        single = not isinstance(out, (list, tuple))
+        buffers = [out] if single else list(out)
+        if len(buffers) != self.n_returned_outputs:
+            raise ValueError(
+                f"Expected {self.n_returned_outputs} output arrays, got {len(buffers)}"
+            )
+
+        input_values = [
+            c.storage[0] for c in self.input_storage if c.storage[0] is not None
+        ] + [arg for arg in (*args, *kwargs.values()) if isinstance(arg, np.ndarray)]
+        # The storage of the outputs is given a view of each array, as some
+        # thunks resize the arrays of the wrong size they find there, which
+        # only succeeds for the arrays that own their data.
+        views = [None] * len(buffers)
+        prefilled = []
+        for i, (buffer, container, variable) in enumerate(
+            zip(buffers, self.output_storage, self.maker.fgraph.outputs)
+        ):
+            if buffer is None:
+                continue
+            try:
+                variable.type.filter(buffer, strict=True)
+            except TypeError as e:
+                raise TypeError(f"Bad output array at index {i}: {e}") from e
+            if (
+                variable.owner is not None
+                and buffer.flags.c_contiguous
+                and buffer.flags.aligned
+                and buffer.flags.writeable
+                and not any(
+                    isinstance(value, np.ndarray) and np.may_share_memory(buffer, value)
+                    for value in input_values
+                )
+            ):
+                views[i] = buffer.view()
+                container.storage[0] = views[i]
+                prefilled.append((container.storage, views[i]))
+
+        # The storage of the outputs is emptied at the start of each call,
+        # so that the values previously returned are not overwritten.
+        pre_call_clear = getattr(self.vm, "pre_call_clear", None)
+        saved_pre_call_clear = None
+        if prefilled and pre_call_clear is not None:
+            saved_pre_call_clear = list(pre_call_clear)
+            prefilled_ids = {id(cell) for cell, _ in prefilled}
+            pre_call_clear[:] = [
+                cell for cell in saved_pre_call_clear if id(cell) not in prefilled_ids
+            ]
+        try:
+            outputs = self(*args, **kwargs)
+        finally:
+            if saved_pre_call_clear is not None:
+                pre_call_clear[:] = saved_pre_call_clear
+            # Later calls must not write into the arrays of the caller
+            for cell, view in prefilled:
+                if cell[0] is view:
+                    cell[0] = None
+
+        if self.return_none:
+            outputs = []
+        elif self.unpack_single and self.n_returned_outputs == 1:
+            outputs = [outputs]
+        elif self.output_keys is not None:
+            outputs = [outputs[key] for key in self.output_keys]
+
+        results = []
+        for i, (buffer, view, value) in enumerate(zip(buffers, views, outputs)):
+            if buffer is None:
+                results.append(value)
+                continue
+            if np.shape(value) != buffer.shape:
+                raise ValueError(
+                    f"Output {i} has shape {np.shape(value)}, but the output "
+                    f"array has shape {buffer.shape}"
+                )
+            if value is not view:
+                buffer[...] = value
+            results.append(buffer)
+        return results[0] if single else results
+
+    async def acall(self, *args, executor=None, **kwargs):
+        r"""Evaluate the function in `executor` without blocking the event loop.
+
+        The calls of `Function.acall` on the same function are run one at a
+        time, in the order they were made, and the calls that are waiting for
+        their turn do not use a thread of `executor`. When the task awaiting
+        the result is cancelled, the `VM` stops before running its next thunk
+        and the next call can start.
+
+        Parameters
+        ----------
+        args, kwargs
+            The inputs of the function, as for `Function.__call__`.
+        executor
+            The `concurrent.futures.Executor` that evaluates the function.
+            Defaults to the default executor of the event loop.
+
+        Notes
+        -----
+        A thunk that is already running when the call is cancelled is not
+        interrupted, and neither are the inner functions of `Op`\s like
+        `Scan`. The `VM`\s that evaluate C thunks without releasing the GIL
+        also prevent the event loop from running until they are done.
+        """
+        from pytensor.link.vm import CancellationEvent
+
+        loop = asyncio.get_running_loop()
+        lock = self._acall_locks.get(loop)
+        if lock is None:
+            lock = self._acall_locks[loop] = asyncio.Lock()
+
+        await lock.acquire()
+        cancel_event = CancellationEvent()
+        try:
+            future = loop.run_in_executor(
+                executor, self._cancellable_call, cancel_event, args, kwargs
+            )
+        except BaseException:
+            lock.release()
+            raise
+
+        def done(future):
+            # The next call starts once the cancelled evaluation has stopped
+            lock.release()
+            if not future.cancelled():
+                future.exception()
+
+        future.add_done_callback(done)
+        try:
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            cancel_event.set()
+            raise
+
+    def _cancellable_call(self, cancel_event, args, kwargs):
+        """Call the function with `cancel_event` as the `VM.cancel_event` of its `VM`."""
+        cancel_event.check()
+        vm = self.vm
+        if not hasattr(vm, "cancel_event"):
+            return self(*args, **kwargs)
+        vm.cancel_event = cancel_event
+        try:
+            return self(*args, **kwargs)
+        finally:
+            vm.cancel_event = None
+
+    def vectorize(self, batch_axes=1, mode=None) -> "Function":
+        r"""Compile a version of the function with leading batch dimensions.
+
+        The graph given to `pytensor.function`, before it was rewritten, is
+        vectorized with `vectorize_graph`, so that the core `Op`\s are turned
+        into `Elemwise`\s or `Blockwise`\s, and the result is compiled.
+
+        Parameters
+        ----------
+        batch_axes
+            The number of leading batch dimensions added to each input, either
+            an ``int`` used for all the inputs, or a sequence with one ``int``
+            per input. The inputs with 0 batch dimensions are not batched.
+            The batch dimensions of the inputs are broadcasted together.
+        mode
+            The `Mode` used to compile the new function. Defaults to the mode
+            of this function.
+
+        Returns
+        -------
+        A `Function` with the same inputs, shared variables and updates. Its
+        inputs with batch dimensions are required, even if they have a
+        default value here.
+        """
+        from pytensor.graph.replace import vectorize_graph
+        from pytensor.tensor.type import TensorType
+
+        maker = self.maker
+        explicit_inputs = [spec for spec in maker.inputs if not spec.implicit]
+        if isinstance(batch_axes, int):
+            batch_axes = [batch_axes] * len(explicit_inputs)
+        else:
+            batch_axes = list(batch_axes)
+        if len(batch_axes) != len(explicit_inputs):
+            raise ValueError(
+                f"Expected {len(explicit_inputs)} batch_axes, got {len(batch_axes)}"
+            )
+
+        replace = {}
+        for spec, n_batch in zip(explicit_inputs, batch_axes):
+            if n_batch < 0:
+                raise ValueError(f"Invalid number of batch axes: {n_batch}")
+            if n_batch == 0:
+                continue
+            var = spec.variable
+            if not isinstance(var.type, TensorType):
+                raise TypeError(f"Cannot add batch dimensions to input {var}")
+            replace[var] = var.type.clone(shape=(None,) * n_batch + var.type.shape)(
+                name=var.name
+            )
+
+        updated = [spec for spec in maker.inputs if spec.update is not None]
+        vectorized = vectorize_graph(
+            [spec.variable for spec in maker.outputs]
+            + [spec.update for spec in updated],
+            replace=replace,
+        )
+        new_outputs = vectorized[: len(maker.outputs)]
+        new_updates = dict(zip(updated, vectorized[len(maker.outputs) :]))
+        for spec, new_update in new_updates.items():
+            if new_update.type.ndim != spec.update.type.ndim:
+                raise ValueError(
+                    f"The update of {spec.variable} depends on the batched inputs"
+                )
+
+        inputs = []
+        for spec in maker.inputs:
+            new_spec = copy.copy(spec)
+            if spec.variable in replace:
+                new_spec.variable = replace[spec.variable]
+                new_spec.value = None
+            if spec in new_updates:
+                new_spec.update = new_updates[spec]
+            inputs.append(new_spec)
+        outputs = []
+        for spec, new_output in zip(maker.outputs, new_outputs):
+            spec = copy.copy(spec)
+            spec.variable = new_output
+            outputs.append(spec)
+        if maker.return_none:
+            outputs = None
+        elif maker.unpack_single:
+            (outputs,) = outputs
+
+        return orig_function(
+            inputs,
+            outputs,
+            mode=maker.mode if mode is None else mode,
+            accept_inplace=maker.accept_inplace,
+            name=maker.name,
+            on_unused_input=maker.on_unused_input,
+            output_keys=maker.output_keys,
+        )
+
     value = property(
         lambda self: self._value,
         None,  # this property itself is not settable
@@ -1403,12 +1826,30 @@ class FunctionMaker:
             rewriter_profile = None
             rewrite_time = None
 
+            rewrite_cache_key = None
+            if config.rewrite_cache:
+                rewrite_cache_key = pytensor.compile.rewritecache.rewrite_cache_key(
+                    fgraph, inputs, mode
+                )
+
             with config.change_flags(
                 mode=mode,
                 compute_test_value=config.compute_test_value_opt,
                 traceback__limit=config.traceback__compile_limit,
             ):
-                rewriter_profile = rewriter(fgraph)
+                if (
+                    rewrite_cache_key is not None
+                    and pytensor.compile.rewritecache.load_rewritten_fgraph(
+                        fgraph, rewrite_cache_key
+                    )
+                ):
+                    _logger.debug("Loaded the rewritten graph from the cache")
+                else:
+                    rewriter_profile = rewriter(fgraph)
+                    if rewrite_cache_key is not None:
+                        pytensor.compile.rewritecache.save_rewritten_fgraph(
+                            fgraph, rewrite_cache_key
+                        )
 
                 end_rewriter = time.perf_counter()
                 rewrite_time = end_rewriter - start_rewriter
@@ -1747,19 +2188,20 @@ def orig_function(
     fn = None
     try:
         Maker = getattr(mode, "function_maker", FunctionMaker)
-        m = Maker(
-            inputs,
-            outputs,
-            mode,
-            accept_inplace=accept_inplace,
-            profile=profile,
-            on_unused_input=on_unused_input,
-            output_keys=output_keys,
-            name=name,
-            fgraph=fgraph,
-        )
-        with config.change_flags(compute_test_value="off"):
-            fn = m.create(defaults)
+        with compile_thread_lock:
+            m = Maker(
+                inputs,
+                outputs,
+                mode,
+                accept_inplace=accept_inplace,
+                profile=profile,
+                on_unused_input=on_unused_input,
+                output_keys=output_keys,
+                name=name,
+                fgraph=fgraph,
+            )
+            with config.change_flags(compute_test_value="off"):
+                fn = m.create(defaults)
     finally:
         if profile and fn:
             t2 = time.perf_counter()
@@ -46,6 +46,7 @@ predefined_linkers = {
     "cvm": VMLinker(use_cloop=True),  # Use allow_gc PyTensor flag
     "vm_nogc": VMLinker(allow_gc=False, use_cloop=False),
     "cvm_nogc": VMLinker(allow_gc=False, use_cloop=True),
+    "vm_parallel": VMLinker(use_cloop=False, n_threads=0),
     "jax": JAXLinker(),
     "numba": NumbaLinker(),
 }
@@ -0,0 +1,191 @@
+"""
+On-disk cache of the graphs rewritten by `FunctionMaker.prepare_fgraph`.
+
+When ``config.rewrite_cache`` is enabled, the result of rewriting a
+`FunctionGraph` is pickled in the ``rewrite_cache`` directory of the
+compiledir, under a key made of the structure of the graph, the rewrite query
+of the `Mode` and the config. Compiling the same graph again in another
+process then loads the rewritten graph instead of running the rewrites.
+
+Like the C module cache, it is read and written without taking any lock: the
+files are written atomically, and a corrupted or unreadable file only causes
+the graph to be rewritten again.
+
+"""
+
+import hashlib
+import logging
+import os
+import pickle
+from typing import TYPE_CHECKING, Optional
+
+import pytensor
+from pytensor.configdefaults import config
+from pytensor.graph.basic import Apply, Constant, clone_get_equiv
+from pytensor.graph.destroyhandler import DestroyHandler
+from pytensor.graph.rewriting.db import RewriteDatabaseQuery
+
+
+if TYPE_CHECKING:
+    from pytensor.compile.io import SymbolicInput
+    from pytensor.compile.mode import Mode
+    from pytensor.graph.fg import FunctionGraph
+
+
+_logger = logging.getLogger("pytensor.compile.rewritecache")
+
+
+def _cache_dir():
+    return os.path.join(config.compiledir, "rewrite_cache")
+
+
+def _constant_ref(var):
+    assert isinstance(var, Constant)
+    return (
+        "c",
+        hashlib.sha256(pickle.dumps((var.type, var.data, _tag_items(var)))).digest(),
+    )
+
+
+def _tag_items(var):
+    # Rewrites may use the tags of variables, e.g. ``lower_triangular``, but
+    # not their traces, and test values are not computed when caching.
+    return sorted(
+        (name, value)
+        for name, value in var.tag.__dict__.items()
+        if name not in ("trace", "test_value")
+    )
+
+
+def rewrite_cache_key(
+    fgraph: "FunctionGraph", input_specs: list["SymbolicInput"], mode: "Mode"
+) -> Optional[str]:
+    """Return the key under which the rewritten `fgraph` is cached.
+
+    The key is a hash of the structure of `fgraph` (the pickled operations
+    and types of its nodes, the tags of its variables and the data of its
+    constants, in topological order), of the mutability of its inputs, of the
+    rewrite query and the target language of `mode`, and of the config.
+    Graphs that are not structurally identical may get different keys, in
+    which case the cache is simply missed.
+
+    Returns ``None`` when the graph cannot be cached, e.g. when `mode` uses a
+    rewriter that is not a `RewriteDatabaseQuery`, when test values are
+    computed during the rewrites, or when an `Op` cannot be pickled.
+
+    """
+    if not isinstance(mode._optimizer, RewriteDatabaseQuery):
+        return None
+    if config.compute_test_value_opt != "off":
+        # The test values of the rewritten graph are not part of the key.
+        return None
+
+    h = hashlib.sha256()
+    h.update(pytensor.__version__.encode())
+    h.update(str(mode._optimizer).encode())
+    # Some rewrites depend on the linker the graph is rewritten for.
+    h.update(type(mode.linker).__name__.encode())
+    h.update(str(pytensor.compile.mode.get_target_language(mode)).encode())
+    h.update(str(sorted(mode.optdb._names)).encode())
+    h.update(config.get_config_hash(in_c_key_only=False).encode())
+    h.update(str(sorted((fgraph.update_mapping or {}).items())).encode())
+    h.update(str([spec.mutable for spec in input_specs]).encode())
+
+    try:
+        h.update(pickle.dumps([(var.type, _tag_items(var)) for var in fgraph.inputs]))
+        refs = {var: ("i", i) for i, var in enumerate(fgraph.inputs)}
+        op_digests: dict = {}
+        for node_idx, node in enumerate(fgraph.toposort()):
+            input_refs = []
+            for var in node.inputs:
+                if var not in refs:
+                    refs[var] = _constant_ref(var)
+                input_refs.append(refs[var])
+            if node.op not in op_digests:
+                op_digests[node.op] = hashlib.sha256(pickle.dumps(node.op)).digest()
+            h.update(
+                pickle.dumps(
+                    (
+                        op_digests[node.op],
+                        input_refs,
+                        [(out.type, _tag_items(out)) for out in node.outputs],
+                    )
+                )
+            )
+            for out_idx, out in enumerate(node.outputs):
+                refs[out] = ("o", node_idx, out_idx)
+        output_refs = []
+        for var in fgraph.outputs:
+            if var not in refs:
+                refs[var] = _constant_ref(var)
+            output_refs.append(refs[var])
+        h.update(pickle.dumps(output_refs))
+    except Exception:
+        _logger.debug("Could not compute the rewrite cache key", exc_info=True)
+        return None
+    return h.hexdigest()
+
+
+def load_rewritten_fgraph(fgraph: "FunctionGraph", key: str) -> bool:
+    """Replace the outputs of `fgraph` by the cached rewritten graph of `key`.
+
+    Returns ``True`` on a hit, and ``False`` if there is no usable rewritten
+    graph in the cache, in which case `fgraph` is left untouched.
+
+    """
+    try:
+        with open(os.path.join(_cache_dir(), f"{key}.pkl"), "rb") as f:
+            cached_inputs, cached_outputs = pickle.load(f)
+    except FileNotFoundError:
+        return False
+    except Exception:
+        _logger.debug(f"Could not load rewritten graph {key}", exc_info=True)
+        return False
+    if len(cached_inputs) != len(fgraph.inputs) or len(cached_outputs) != len(
+        fgraph.outputs
+    ):
+        return False
+
+    memo = dict(zip(cached_inputs, fgraph.inputs))
+    equiv = clone_get_equiv(
+        cached_inputs, cached_outputs, copy_inputs=False, copy_orphans=False, memo=memo
+    )
+    new_outputs = [equiv[out] for out in cached_outputs]
+    if not hasattr(fgraph, "destroyers") and any(
+        node.op.destroy_map for node in equiv.values() if isinstance(node, Apply)
+    ):
+        fgraph.attach_feature(DestroyHandler())
+    for i, new_out in enumerate(new_outputs):
+        fgraph.change_node_input(
+            "output", i, new_out, reason="rewrite_cache", import_missing=True
+        )
+    return True
+
+
+def save_rewritten_fgraph(fgraph: "FunctionGraph", key: str):
+    """Store the rewritten `fgraph` in the cache under `key`.
+
+    The inputs of `fgraph` are replaced by placeholders of the same type, so
+    that the values of shared variables are not stored.
+
+    """
+    memo = {var: var.type() for var in fgraph.inputs}
+    equiv = clone_get_equiv(
+        fgraph.inputs, fgraph.outputs, copy_inputs=False, copy_orphans=False, memo=memo
+    )
+    cached = (
+        [equiv[var] for var in fgraph.inputs],
+        [equiv[var] for var in fgraph.outputs],
+    )
+
+    path = os.path.join(_cache_dir(), f"{key}.pkl")
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(_cache_dir(), exist_ok=True)
+        with open(tmp_path, "wb") as f:
+            pickle.dump(cached, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+    except Exception:
+        _logger.debug(f"Could not save rewritten graph {key}", exc_info=True)
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
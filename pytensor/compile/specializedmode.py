@@ -0,0 +1,340 @@
+"""
+A `Mode` that compiles variants of a function specialized to the input shapes.
+
+Many rewrites and C implementations are only possible, or are more efficient,
+when the shapes of the inputs are known. `ShapeSpecializedMode` returns a
+`Function` that records the shapes of the arguments it is called with. Once
+the same shapes have been seen `min_calls` times, the graph is compiled again
+with `specify_shape` applied to the inputs, in a background thread, and the
+following calls with these shapes are forwarded to that variant. The
+`max_variants` most recently used variants are kept.
+
+"""
+
+import copyreg
+import logging
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+import numpy as np
+
+from pytensor.compile.compilelock import compile_thread_lock
+from pytensor.compile.function.types import Function, FunctionMaker, _pickle_Function
+from pytensor.compile.mode import Mode
+from pytensor.compile.tieredmode import _clone_specs, _schedule_promotion
+from pytensor.configdefaults import config
+from pytensor.graph.replace import clone_replace
+from pytensor.tensor.shape import specify_shape
+from pytensor.tensor.type import TensorType
+
+
+_logger = logging.getLogger("pytensor.compile.specializedmode")
+
+
+class ShapeSpecializedFunction(Function):
+    r"""A `Function` that forwards its calls to variants specialized to the input shapes.
+
+    The shapes of the tensor inputs given to `Function.__call__` form the
+    signature of a call. The calls with a signature that has no variant yet
+    are evaluated by this `Function`, and a variant is compiled once the
+    signature has been seen ``min_calls`` times. The variants share the
+    storage of the shared variables and of the inputs with updates with this
+    `Function`.
+
+    The call that follows a change of the value of an input with
+    `Function.__setitem__` is evaluated by this `Function`.
+
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.variants: OrderedDict[tuple, Function] = OrderedDict()
+        self._signature_counts: OrderedDict[tuple, int] = OrderedDict()
+        self._pending: set[tuple] = set()
+        self._variants_lock = threading.Lock()
+        self._value_set = False
+        # The name and type of the inputs that can be given by the caller
+        self._explicit_inputs = [
+            (spec.name, isinstance(spec.variable.type, TensorType))
+            for spec in self.maker.inputs
+            if not spec.implicit
+        ]
+
+    def _signature(self, args, kwargs) -> Optional[tuple]:
+        if len(args) > len(self._explicit_inputs):
+            return None
+        signature = []
+        for i, (name, is_tensor) in enumerate(self._explicit_inputs):
+            if i < len(args):
+                value = args[i]
+            elif name is not None and name in kwargs:
+                value = kwargs[name]
+            else:
+                signature.append(None)
+                continue
+            signature.append(np.shape(value) if is_tensor else None)
+        if all(shape is None for shape in signature):
+            return None
+        return tuple(signature)
+
+    def _select(self, args, kwargs) -> Function:
+        """Return the variant for the arguments, or this `Function` if there is none."""
+        maker = self.maker
+        if maker.unrewritten is None or maker.max_variants == 0:
+            return self
+        if "output_subset" in kwargs or self._value_set:
+            return self
+        signature = self._signature(args, kwargs)
+        if signature is None:
+            return self
+
+        with self._variants_lock:
+            variant = self.variants.get(signature)
+            if variant is not None:
+                self.variants.move_to_end(signature)
+                return variant
+            if signature in self._pending:
+                return self
+            count = self._signature_counts.pop(signature, 0) + 1
+            if count < maker.min_calls:
+                self._signature_counts[signature] = count
+                while len(self._signature_counts) > 4 * maker.max_variants:
+                    self._signature_counts.popitem(last=False)
+                return self
+            self._pending.add(signature)
+
+        if maker.background:
+            flags = config.snapshot_flags()
+            _schedule_promotion(lambda: self._specialize(signature, flags))
+            return self
+        self._specialize(signature, config.snapshot_flags())
+        return self.variants.get(signature, self)
+
+    def _specialize(self, signature, flags):
+        try:
+            with (
+                compile_thread_lock,
+                config.thread_flags(flags),
+                config.change_flags(compute_test_value="off"),
+            ):
+                variant = self.maker.create_variant(self, signature)
+        except Exception:
+            _logger.warning(
+                f"Could not specialize {self.name or 'a function'} to the input "
+                f"shapes {signature}",
+                exc_info=True,
+            )
+            # Do not try again, the calls with these shapes use this function
+            variant = self
+        with self._variants_lock:
+            self._pending.discard(signature)
+            self.variants[signature] = variant
+            while len(self.variants) > self.maker.max_variants:
+                self.variants.popitem(last=False)
+
+    def __call__(self, *args, **kwargs):
+        fn = self._select(args, kwargs)
+        if fn is self:
+            try:
+                return super().__call__(*args, **kwargs)
+            finally:
+                self._value_set = False
+        fn.trust_input = self.trust_input
+        return fn(*args, **kwargs)
+
+    def _cancellable_call(self, cancel_event, args, kwargs):
+        fn = self._select(args, kwargs)
+        if fn is self:
+            try:
+                return super()._cancellable_call(cancel_event, args, kwargs)
+            finally:
+                self._value_set = False
+        fn.trust_input = self.trust_input
+        return fn._cancellable_call(cancel_event, args, kwargs)
+
+    def __setitem__(self, item, value):
+        super().__setitem__(item, value)
+        # Only this function sees the value in the next call
+        self._value_set = True
+
+    def free(self):
+        super().free()
+        for variant in list(self.variants.values()):
+            if variant is not self:
+                variant.free()
+
+
+copyreg.pickle(ShapeSpecializedFunction, _pickle_Function)
+
+
+class ShapeSpecializedFunctionMaker(FunctionMaker):
+    r"""A `FunctionMaker` that creates `ShapeSpecializedFunction`\s.
+
+    A copy of the graph is kept before it is rewritten, from which
+    `ShapeSpecializedFunctionMaker.create_variant` compiles the variants.
+
+    """
+
+    def __init__(
+        self,
+        inputs,
+        outputs,
+        mode=None,
+        accept_inplace=False,
+        function_builder=ShapeSpecializedFunction,
+        profile=None,
+        on_unused_input=None,
+        fgraph=None,
+        output_keys=None,
+        name=None,
+        no_fgraph_prep=False,
+    ):
+        # The functions compiled from a `FunctionGraph` are not specialized
+        self.unrewritten = (
+            _clone_specs(inputs, outputs, None)[:2] if fgraph is None else None
+        )
+        self.variant_kwargs = dict(
+            accept_inplace=accept_inplace,
+            profile=profile,
+            on_unused_input="ignore",
+            output_keys=output_keys,
+            name=name,
+        )
+        super().__init__(
+            inputs,
+            outputs,
+            mode,
+            accept_inplace=accept_inplace,
+            function_builder=function_builder,
+            profile=profile,
+            on_unused_input=on_unused_input,
+            fgraph=fgraph,
+            output_keys=output_keys,
+            name=name,
+            no_fgraph_prep=no_fgraph_prep,
+        )
+        mode = self.mode
+        self.max_variants = getattr(mode, "max_variants", 0)
+        self.min_calls = getattr(mode, "min_calls", 1)
+        self.background = getattr(mode, "background", False)
+
+    def create_variant(self, fn: Function, signature: tuple) -> Function:
+        """Compile the variant of `fn` for the input shapes in `signature`.
+
+        `signature` has one entry per input that is not implicit, either the
+        shape of the input or ``None`` if it is not specialized.
+
+        """
+        inputs, outputs, _ = _clone_specs(*self.unrewritten, None)
+        explicit_inputs = [spec for spec in inputs if not spec.implicit]
+        replace = {
+            spec.variable: specify_shape(spec.variable, shape)
+            for spec, shape in zip(explicit_inputs, signature)
+            if shape is not None and len(shape) == spec.variable.type.ndim
+        }
+
+        is_list = isinstance(outputs, list)
+        out_specs = outputs if is_list else [] if outputs is None else [outputs]
+        updated = [spec for spec in inputs if spec.update is not None]
+        new_graphs = clone_replace(
+            [spec.variable for spec in out_specs] + [spec.update for spec in updated],
+            replace=replace,
+        )
+        for spec, new_var in zip(out_specs + updated, new_graphs):
+            if spec in updated:
+                spec.update = new_var
+            else:
+                spec.variable = new_var
+
+        maker = FunctionMaker(inputs, outputs, self.mode, **self.variant_kwargs)
+        # Share the storage of the inputs that keep a state between calls
+        variant = maker.create(
+            [
+                value if required or refeed else container
+                for (required, refeed, value), container in zip(
+                    fn.defaults, fn.input_storage
+                )
+            ]
+        )
+        variant.unpack_single = fn.unpack_single
+        variant.trust_input = fn.trust_input
+        return variant
+
+
+class ShapeSpecializedMode(Mode):
+    r"""A `Mode` that compiles variants of a function for the input shapes it is called with.
+
+    The functions compiled with this mode are `ShapeSpecializedFunction`\s.
+    The generic function and its variants are compiled with the `linker`
+    and `optimizer` of the mode, the variants with the static shapes of the
+    tensor inputs set by `specify_shape`.
+
+    Parameters
+    ----------
+    max_variants
+        The largest number of variants kept per function. The least recently
+        used variant is dropped when a new one is compiled.
+    min_calls
+        The number of calls with the same input shapes after which a variant
+        is compiled.
+    background
+        Whether the variants are compiled in a background thread, in which
+        case the generic function evaluates the calls until the variant is
+        ready, or during the call that triggers their compilation.
+
+    """
+
+    def __init__(
+        self,
+        linker=None,
+        optimizer="default",
+        db=None,
+        max_variants: int = 8,
+        min_calls: int = 2,
+        background: bool = True,
+    ):
+        if max_variants < 0:
+            raise ValueError("max_variants must be non-negative")
+        if min_calls < 1:
+            raise ValueError("min_calls must be at least 1")
+        super().__init__(linker=linker, optimizer=optimizer, db=db)
+        self.max_variants = max_variants
+        self.min_calls = min_calls
+        self.background = background
+
+    def function_maker(self, i, o, m, *args, **kwargs):
+        assert m is self
+        return ShapeSpecializedFunctionMaker(i, o, self, *args, **kwargs)
+
+    def __getstate__(self):
+        lnk, opt = super().__getstate__()
+        return (lnk, opt, self.max_variants, self.min_calls, self.background)
+
+    def __setstate__(self, state):
+        lnk, opt, *options = state
+        self.max_variants, self.min_calls, self.background = options or (8, 2, True)
+        super().__setstate__((lnk, opt))
+
+    def __str__(self):
+        return (
+            f"{self.__class__.__name__}("
+            f"linker={self.provided_linker}, "
+            f"optimizer={self.provided_optimizer}, "
+            f"max_variants={self.max_variants}, "
+            f"min_calls={self.min_calls}, "
+            f"background={self.background})"
+        )
+
+    def clone(self, link_kwargs=None, optimizer="", **kwargs):
+        if link_kwargs is None:
+            link_kwargs = {}
+        if optimizer == "":
+            optimizer = self.provided_optimizer
+        return type(self)(
+            linker=self.linker.clone(**link_kwargs),
+            optimizer=optimizer,
+            max_variants=self.max_variants,
+            min_calls=self.min_calls,
+            background=self.background,
+        )
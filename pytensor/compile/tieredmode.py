@@ -0,0 +1,354 @@
+"""
+A `Mode` that returns functions before they are fully compiled.
+
+`TieredMode` compiles a graph in two tiers. The first tier uses a `Mode` that
+compiles quickly, by default the one of `FAST_COMPILE`, so that the returned
+`Function` can be called at once. The graph is then rewritten and compiled by
+the target `Mode`, e.g. ``FAST_RUN`` or ``NUMBA``, in a background thread, and
+the `Function` forwards its calls to the result as soon as it is ready.
+
+"""
+
+import copy
+import copyreg
+import logging
+import queue
+import threading
+import weakref
+from typing import Optional, Union
+
+from pytensor.compile.compilelock import compile_thread_lock
+from pytensor.compile.function.types import Function, FunctionMaker, _pickle_Function
+from pytensor.compile.mode import FAST_COMPILE, Mode, get_mode
+from pytensor.configdefaults import config
+from pytensor.graph.basic import clone_get_equiv
+from pytensor.graph.fg import FunctionGraph
+
+
+_logger = logging.getLogger("pytensor.compile.tieredmode")
+
+# The second tiers are compiled one at a time by a single daemon thread, so
+# that pending compilations do not delay the exit of the interpreter. They hold
+# `compile_thread_lock`, like the compilations of the other threads.
+_promotion_queue: queue.SimpleQueue = queue.SimpleQueue()
+_promotion_thread: Optional[threading.Thread] = None
+_promotion_thread_lock = threading.Lock()
+
+
+def _promotion_worker():
+    while True:
+        promote = _promotion_queue.get()
+        promote()
+
+
+def _schedule_promotion(promote):
+    global _promotion_thread
+    with _promotion_thread_lock:
+        # The thread does not survive a fork
+        if _promotion_thread is None or not _promotion_thread.is_alive():
+            _promotion_thread = threading.Thread(
+                target=_promotion_worker,
+                name="pytensor-tiered-compilation",
+                daemon=True,
+            )
+            _promotion_thread.start()
+    _promotion_queue.put(promote)
+
+
+def _clone_specs(inputs, outputs, fgraph):
+    """Clone the graph of the arguments of a `FunctionMaker`.
+
+    The inputs of the graph are kept, so that the `In` instances still refer
+    to them.
+
+    """
+    is_list = isinstance(outputs, (list, tuple))
+    in_specs = [
+        FunctionMaker.wrap_in(i)
+        for i in (inputs if isinstance(inputs, (list, tuple)) else [inputs])
+    ]
+    out_specs = [
+        FunctionMaker.wrap_out(o)
+        for o in (outputs if is_list else [] if outputs is None else [outputs])
+    ]
+
+    graphs = [spec.variable for spec in out_specs]
+    graphs += [spec.update for spec in in_specs if spec.update is not None]
+    if fgraph is None:
+        roots = [spec.variable for spec in in_specs]
+    else:
+        roots = fgraph.inputs
+        graphs += fgraph.outputs
+    equiv = clone_get_equiv(roots, graphs, copy_inputs=False, copy_orphans=False)
+
+    new_in_specs = []
+    for spec in in_specs:
+        spec = copy.copy(spec)
+        if spec.update is not None:
+            spec.update = equiv[spec.update]
+        new_in_specs.append(spec)
+    new_out_specs = []
+    for spec in out_specs:
+        spec = copy.copy(spec)
+        spec.variable = equiv[spec.variable]
+        new_out_specs.append(spec)
+    if not is_list:
+        new_out_specs = new_out_specs[0] if new_out_specs else None
+
+    if fgraph is not None:
+        fgraph = FunctionGraph(
+            fgraph.inputs,
+            [equiv[o] for o in fgraph.outputs],
+            clone=False,
+            update_mapping=fgraph.update_mapping,
+        )
+    return new_in_specs, new_out_specs, fgraph
+
+
+class TieredFunction(Function):
+    """A `Function` that is replaced by its second tier once it is compiled.
+
+    Until then, it evaluates the graph compiled by the first tier of its
+    `TieredMode`. The second-tier `Function` shares the storage of the shared
+    variables and of the inputs with updates, and `Function.value` refers to
+    the `Function` currently in use, so that the switch is invisible to the
+    caller.
+
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.promoted: Optional[Function] = None
+        self._promotion_done = threading.Event()
+
+    def _current(self) -> Function:
+        promoted = self.promoted
+        return self if promoted is None else promoted
+
+    value = property(
+        lambda self: self._current()._value,
+        None,
+        doc="dictionary-like access to the values associated with Variables",
+    )
+    container = property(
+        lambda self: self._current()._container,
+        None,
+        doc="dictionary-like access to the containers associated with Variables",
+    )
+
+    def __call__(self, *args, **kwargs):
+        promoted = self.promoted
+        if promoted is None:
+            return super().__call__(*args, **kwargs)
+        promoted.trust_input = self.trust_input
+        return promoted(*args, **kwargs)
+
+    def call_many(self, inputs, stack=False):
+        promoted = self.promoted
+        if promoted is None:
+            return super().call_many(inputs, stack)
+        promoted.trust_input = self.trust_input
+        return promoted.call_many(inputs, stack)
+
+    def _cancellable_call(self, cancel_event, args, kwargs):
+        promoted = self.promoted
+        if promoted is None:
+            return super()._cancellable_call(cancel_event, args, kwargs)
+        promoted.trust_input = self.trust_input
+        return promoted._cancellable_call(cancel_event, args, kwargs)
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Wait until the second tier has been compiled.
+
+        Returns ``True`` if the calls are now made to the second tier, and
+        ``False`` if the `timeout` expired or if the second tier could not be
+        compiled.
+
+        """
+        self._promotion_done.wait(timeout)
+        return self.promoted is not None
+
+    def free(self):
+        super().free()
+        if self.promoted is not None:
+            self.promoted.free()
+
+
+copyreg.pickle(TieredFunction, _pickle_Function)
+
+
+class TieredFunctionMaker(FunctionMaker):
+    r"""A `FunctionMaker` that creates `TieredFunction`\s.
+
+    The graph is compiled by the first tier like any other `FunctionMaker`
+    does, and `TieredFunctionMaker.create` schedules the compilation of the
+    second tier in the background.
+
+    """
+
+    def __init__(
+        self,
+        inputs,
+        outputs,
+        mode=None,
+        accept_inplace=False,
+        function_builder=TieredFunction,
+        profile=None,
+        on_unused_input=None,
+        fgraph=None,
+        output_keys=None,
+        name=None,
+        no_fgraph_prep=False,
+    ):
+        # The graph is rewritten in place for the first tier
+        self.target_graph = _clone_specs(inputs, outputs, fgraph)
+        self.target_kwargs = dict(
+            accept_inplace=accept_inplace,
+            profile=profile,
+            on_unused_input=on_unused_input,
+            output_keys=output_keys,
+            name=name,
+        )
+        super().__init__(
+            inputs,
+            outputs,
+            mode,
+            accept_inplace=accept_inplace,
+            function_builder=function_builder,
+            profile=profile,
+            on_unused_input=on_unused_input,
+            fgraph=fgraph,
+            output_keys=output_keys,
+            name=name,
+            no_fgraph_prep=no_fgraph_prep,
+        )
+        # Resolve the default target mode with the config of the caller
+        self.target_mode = get_mode(get_mode(self.mode).target)
+
+    def create(self, input_storage=None, storage_map=None):
+        fn = super().create(input_storage, storage_map)
+        flags = config.snapshot_flags()
+        fn_ref = weakref.ref(fn)
+        _schedule_promotion(lambda: self._promote(fn_ref, flags))
+        return fn
+
+    def _promote(self, fn_ref, flags):
+        fn = fn_ref()
+        if fn is None:
+            return
+        try:
+            with (
+                compile_thread_lock,
+                config.thread_flags(flags),
+                config.change_flags(compute_test_value="off"),
+            ):
+                inputs, outputs, fgraph = _clone_specs(*self.target_graph)
+                Maker = getattr(self.target_mode, "function_maker", FunctionMaker)
+                maker = Maker(
+                    inputs,
+                    outputs,
+                    self.target_mode,
+                    fgraph=fgraph,
+                    **self.target_kwargs,
+                )
+                # Share the storage of the inputs that keep a state between
+                # calls, and use separate storage for the other ones.
+                promoted = maker.create(
+                    [
+                        value if required or refeed else container
+                        for (required, refeed, value), container in zip(
+                            fn.defaults, fn.input_storage
+                        )
+                    ]
+                )
+            promoted.unpack_single = fn.unpack_single
+            promoted.trust_input = fn.trust_input
+        except Exception:
+            _logger.warning(
+                f"Could not compile {fn.name or 'a function'} with {self.target_mode}, "
+                "it will keep using the first tier",
+                exc_info=True,
+            )
+        else:
+            fn.promoted = promoted
+            _logger.debug(f"Promoted {fn.name or 'a function'} to {self.target_mode}")
+        finally:
+            fn._promotion_done.set()
+
+
+class TieredMode(Mode):
+    """A `Mode` that returns a `Function` before its graph is fully compiled.
+
+    The graph is first compiled with `linker` and `optimizer`, which default to
+    those of `FAST_COMPILE`, and the returned `TieredFunction` can be called
+    at once. Meanwhile, the graph is compiled with the `target` mode in a
+    background thread, and the `TieredFunction` forwards its calls to the
+    result once it is ready. Use `TieredFunction.wait` to wait for it.
+
+    Parameters
+    ----------
+    target
+        The `Mode`, or the name of a predefined mode, used to compile the
+        second tier. Defaults to the mode set in ``config.mode`` when the
+        function is compiled.
+    linker
+        The linker of the first tier.
+    optimizer
+        The rewrites of the first tier.
+
+    Notes
+    -----
+    `Mode.including`, `Mode.excluding` and `Mode.requiring` only change the
+    first tier.
+
+    """
+
+    def __init__(
+        self,
+        target: Optional[Union[str, Mode]] = None,
+        linker=None,
+        optimizer=None,
+        db=None,
+    ):
+        if isinstance(target, TieredMode):
+            raise ValueError("The target of a TieredMode cannot be a TieredMode")
+        if linker is None:
+            linker = FAST_COMPILE.provided_linker
+        if optimizer is None:
+            optimizer = FAST_COMPILE.provided_optimizer
+        self.target = target
+        super().__init__(linker=linker, optimizer=optimizer, db=db)
+
+    def function_maker(self, i, o, m, *args, **kwargs):
+        assert m is self
+        return TieredFunctionMaker(i, o, self, *args, **kwargs)
+
+    def __getstate__(self):
+        lnk, opt = super().__getstate__()
+        return (lnk, opt, self.target)
+
+    def __setstate__(self, state):
+        lnk, opt, *target = state
+        if target:
+            self.target = target[0]
+        super().__setstate__((lnk, opt))
+
+    def __str__(self):
+        return (
+            f"{self.__class__.__name__}("
+            f"target={self.target}, "
+            f"linker={self.provided_linker}, "
+            f"optimizer={self.provided_optimizer}, "
+            f"optdb={self.optdb})"
+        )
+
+    def clone(self, link_kwargs=None, optimizer="", **kwargs):
+        if link_kwargs is None:
+            link_kwargs = {}
+        if optimizer == "":
+            optimizer = self.provided_optimizer
+        return type(self)(
+            target=self.target,
+            linker=self.linker.clone(**link_kwargs),
+            optimizer=optimizer,
+        )
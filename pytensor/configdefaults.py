@@ -461,7 +461,17 @@ def add_compile_configvars():
             "linker",
             "Default linker used if the pytensor flags mode is Mode",
             EnumStr(
-                "cvm", ["c|py", "py", "c", "c|py_nogc", "vm", "vm_nogc", "cvm_nogc"]
+                "cvm",
+                [
+                    "c|py",
+                    "py",
+                    "c",
+                    "c|py_nogc",
+                    "vm",
+                    "vm_nogc",
+                    "cvm_nogc",
+                    "vm_parallel",
+                ],
             ),
             in_c_key=False,
         )
@@ -471,7 +481,7 @@ def add_compile_configvars():
         config.add(
             "linker",
             "Default linker used if the pytensor flags mode is Mode",
-            EnumStr("vm", ["py", "vm_nogc"]),
+            EnumStr("vm", ["py", "vm_nogc", "vm_parallel"]),
             in_c_key=False,
         )
         if type(config).cxx.is_default:
@@ -589,6 +599,33 @@ def add_compile_configvars():
         in_c_key=False,
     )
 
+    config.add(
+        "cmodule__max_size",
+        "In megabytes. When the C module cache grows above this size, the "
+        "least recently used modules are deleted when a process exits, or "
+        "with `pytensor-cache trim`. 0 means no limit.",
+        IntParam(0, _is_greater_or_equal_0),
+        in_c_key=False,
+    )
+
+    config.add(
+        "cmodule__release_gil",
+        "If True, the C code of the Ops that support it releases the GIL "
+        "during its computation, so that other Python threads can run "
+        "concurrently.",
+        BoolParam(True),
+        in_c_key=True,
+    )
+
+    config.add(
+        "cmodule__compilation_workers",
+        "Number of C modules that the VM linkers compile concurrently when "
+        "several nodes of a graph miss the cache. With 1, modules are "
+        "compiled one at a time; with 0, one compilation per CPU core is run.",
+        IntParam(1, _is_greater_or_equal_0),
+        in_c_key=False,
+    )
+
     config.add(
         "cmodule__debug",
         "If True, define a DEBUG macro (if not exists) for any compiled C code.",
@@ -1073,6 +1110,17 @@ def add_optimizer_configvars():
         in_c_key=False,
     )
 
+    config.add(
+        "rewrite_cache",
+        (
+            "If True, the graphs rewritten when compiling a function are "
+            "cached in the compiledir, and reused when the same graph is "
+            "compiled with the same mode and config."
+        ),
+        BoolParam(False),
+        in_c_key=False,
+    )
+
     config.add(
         "optdb__max_use_ratio",
         "A ratio that prevent infinite loop in EquilibriumGraphRewriter.",
@@ -1162,6 +1210,40 @@ def add_vm_configvars():
         in_c_key=False,
     )
 
+    config.add(
+        "vm__n_threads",
+        "Useful only for the VM Linkers. Number of worker threads used to "
+        "run independent nodes of non-lazy graphs concurrently. With 1, "
+        "nodes are run sequentially; with 0, one thread per CPU core is used. "
+        "This only helps for thunks that release the GIL (e.g. C thunks, "
+        "BLAS or LAPACK calls).",
+        IntParam(1, _is_greater_or_equal_0),
+        in_c_key=False,
+    )
+
+    config.add(
+        "vm__schedule",
+        "Useful only for the VM Linkers that are not given a schedule. The "
+        "order in which the nodes are run: 'toposort' uses the default "
+        "topological order, and 'memory' the order found by "
+        "pytensor.graph.schedule.memory_schedule, which reduces the peak "
+        "memory of the intermediate results.",
+        EnumStr("toposort", ["memory"]),
+        in_c_key=False,
+    )
+
+    config.add(
+        "vm__arena",
+        "Useful only for the VM Linkers. If True, the intermediate results of "
+        "the graphs evaluated sequentially and without lazy evaluation are "
+        "stored in a preallocated arena that persists across calls, planned "
+        "from their liveness and their shapes. This replaces the C VM by a "
+        "Python loop, whose overhead per node usually outweighs the saved "
+        "allocations, except for graphs with few nodes and large results.",
+        BoolParam(False),
+        in_c_key=False,
+    )
+
 
 def add_deprecated_configvars():
     # TODO: remove this? Agree
@@ -1363,6 +1445,17 @@ def add_caching_dir_configvars():
         in_c_key=False,
     )
 
+    config.add(
+        "compiledir_readonly_layers",
+        (
+            f"{os.pathsep}-separated list of read-only cache directories for "
+            "compiled modules, searched in order before compiledir. They are "
+            "never locked nor modified."
+        ),
+        StrParam("", mutable=False),
+        in_c_key=False,
+    )
+
 
 # Those are the options provided by PyTensor to choose algorithms at runtime.
 SUPPORTED_DNN_CONV_ALGO_RUNTIME = (
@@ -2,6 +2,7 @@ import logging
 import os
 import shlex
 import sys
+import threading
 import warnings
 from collections.abc import Sequence
 from configparser import (
@@ -11,6 +12,7 @@ from configparser import (
     NoSectionError,
     RawConfigParser,
 )
+from contextlib import contextmanager
 from functools import wraps
 from io import StringIO
 from typing import Callable, Optional, Union
@@ -31,6 +33,15 @@ class ConfigAccessViolation(AttributeError):
     """Raised when a config setting is accessed through the wrong config instance."""
 
 
+class _ThreadFlags(threading.local):
+    # The values of the config variables that are private to the current
+    # thread, see `PyTensorConfigParser.thread_flags`.
+    values: Optional[dict] = None
+
+
+_thread_flags = _ThreadFlags()
+
+
 class _ChangeFlagsDecorator:
     def __init__(self, *args, _root=None, **kwargs):
         # the old API supported passing a dict as the first argument:
@@ -89,7 +100,7 @@ class PyTensorConfigParser:
             print("    Value: ", cv.__get__(self, self.__class__), file=buf)
             print("", file=buf)
 
-    def get_config_hash(self):
+    def get_config_hash(self, in_c_key_only=True):
         """
         Return a string sha256 of the current config options. In the past,
         it was md5.
@@ -97,10 +108,15 @@ class PyTensorConfigParser:
         The string should be such that we can safely assume that two different
         config setups will lead to two different strings.
 
-        We only take into account config options for which `in_c_key` is True.
+        By default, we only take into account config options for which
+        `in_c_key` is True.
         """
         all_opts = sorted(
-            [c for c in self._config_var_dict.values() if c.in_c_key],
+            [
+                c
+                for c in self._config_var_dict.values()
+                if c.in_c_key or not in_c_key_only
+            ],
             key=lambda cv: cv.name,
         )
         return hash_from_code(
@@ -214,6 +230,36 @@ class PyTensorConfigParser:
         """
         return _ChangeFlagsDecorator(*args, _root=self, **kwargs)
 
+    def snapshot_flags(self) -> dict:
+        """Return the current values of the config variables that can change.
+
+        The result can be used by `thread_flags` to compile in another thread
+        with the config of the current one.
+
+        """
+        return {
+            name: cv.__get__(self, self.__class__)
+            for name, cv in self._config_var_dict.items()
+            if cv.mutable
+        }
+
+    @contextmanager
+    def thread_flags(self, values: dict):
+        """Make the current thread use its own copy of the config variables in `values`.
+
+        Until the context is left, the current thread reads these variables
+        from `values`, which would typically come from `snapshot_flags`, and
+        `change_flags` only changes them for this thread. Other threads, and
+        the other config variables, are left untouched.
+
+        """
+        old_values = _thread_flags.values
+        _thread_flags.values = dict(values)
+        try:
+            yield
+        finally:
+            _thread_flags.values = old_values
+
     def warn_unused_flags(self):
         for key in self._flags_dict.keys():
             warnings.warn(f"PyTensor does not recognise this flag: {key}")
@@ -323,6 +369,9 @@ class ConfigParam:
                 else:
                     val_str = self.default
             self.__set__(cls, val_str)
+        thread_values = _thread_flags.values
+        if thread_values is not None and self.name in thread_values:
+            return thread_values[self.name]
         return self.val
 
     def __set__(self, cls, val):
@@ -332,7 +381,11 @@ class ConfigParam:
             )
         applied = self.apply(val)
         self.validate(applied)
-        self.val = applied
+        thread_values = _thread_flags.values
+        if thread_values is not None and self.name in thread_values:
+            thread_values[self.name] = applied
+        else:
+            self.val = applied
 
 
 class EnumStr(ConfigParam):
@@ -625,6 +625,8 @@ class Variable(Node, Generic[_TypeType, OptionalApplyType]):
     def __getstate__(self):
         d = self.__dict__.copy()
         d.pop("_fn_cache", None)
+        # Hashes are not stable across processes
+        d.pop("_structural_hash", None)
         if (not config.pickle_test_value) and (hasattr(self.tag, "test_value")):
             if not type(config).pickle_test_value.is_default:
                 warnings.warn(
@@ -760,6 +762,32 @@ class Constant(AtomicVariable[_TypeType]):
     def signature(self):
         return (self.type, self.data)
 
+    def structural_hash(self) -> int:
+        """Return a hash of the type and data of this constant.
+
+        It is only computed once, as the data of a `Constant` does not change.
+        Signatures that provide a digest of the data, like those of tensor
+        constants, are hashed through it rather than through their own cheaper
+        hash.
+
+        """
+        try:
+            return self._structural_hash
+        except AttributeError:
+            pass
+        sig = self.merge_signature()
+        try:
+            if hasattr(sig, "pytensor_hash"):
+                self._structural_hash = hash(
+                    (type(sig), self.type, sig.pytensor_hash())
+                )
+            else:
+                self._structural_hash = hash(sig)
+        except TypeError:
+            # Unhashable data, e.g. a `slice`
+            self._structural_hash = hash((type(self), self.type))
+        return self._structural_hash
+
     def __str__(self):
         data_str = str(self.data).replace("\n", "")
         if len(data_str) > 20:
@@ -1972,6 +2000,67 @@ def equal_computations(
     return True
 
 
+def atomic_structural_hash(var: Variable) -> int:
+    r"""Return the structural hash of a `Variable` without owner.
+
+    `Constant`\s are hashed by value and `NominalVariable`\s by type and id,
+    while any other variable is only equal to itself.
+
+    """
+    if isinstance(var, Constant):
+        return var.structural_hash()
+    if isinstance(var, NominalVariable):
+        return hash(var)
+    return hash(("variable", id(var)))
+
+
+def apply_structural_hashes(node: Apply, input_hashes: Sequence[int]) -> list[int]:
+    """Return the structural hashes of the outputs of `node`.
+
+    `input_hashes` are the structural hashes of the inputs of `node`.
+
+    """
+    node_hash = (node.op, tuple(input_hashes))
+    return [hash((node_hash, i)) for i in range(len(node.outputs))]
+
+
+def structural_hash(
+    graphs: Sequence[Variable],
+    inputs: Optional[Sequence[Variable]] = None,
+    memo: Optional[dict[Variable, int]] = None,
+) -> list[int]:
+    r"""Return a hash of the computation of each variable in `graphs`.
+
+    The hash of a variable only depends on the `Op`\s that compute it and on
+    the hashes of their inputs, so that structurally identical graphs get the
+    same hash. The variables in `inputs` are hashed by position, constants by
+    value (see `atomic_structural_hash`), and `memo` can provide the hashes of
+    other variables. It is filled with the hashes of all the variables of the
+    graph, so that it can be reused for other graphs.
+
+    Equal hashes are a necessary condition for `equal_computations` to hold
+    (with `inputs` as ``in_xs`` and ``in_ys``, and ``strict_dtype=True``), and
+    a cheap way to rule out most unequal graphs.
+
+    """
+    if memo is None:
+        memo = {}
+    for i, inp in enumerate(inputs or ()):
+        memo.setdefault(inp, hash(("input", i)))
+
+    def get_hash(var):
+        if var not in memo:
+            memo[var] = atomic_structural_hash(var)
+        return memo[var]
+
+    for node in io_toposort(list(memo), graphs):
+        output_hashes = apply_structural_hashes(
+            node, [get_hash(inp) for inp in node.inputs]
+        )
+        memo.update(zip(node.outputs, output_hashes))
+    return [get_hash(var) for var in graphs]
+
+
 def get_var_by_name(
     graphs: Iterable[Variable], target_var_id: str, ids: str = "CHAR"
 ) -> tuple[Variable, ...]:
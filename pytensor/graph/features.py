@@ -10,7 +10,12 @@ import numpy as np
 
 import pytensor
 from pytensor.configdefaults import config
-from pytensor.graph.basic import Variable, io_toposort
+from pytensor.graph.basic import (
+    Variable,
+    apply_structural_hashes,
+    atomic_structural_hash,
+    io_toposort,
+)
 from pytensor.graph.utils import InconsistencyError
 
 
@@ -720,6 +725,98 @@ class NodeFinder(Bookkeeper):
         return all
 
 
+class StructuralHashFeature(Feature):
+    r"""Keep track of the structural hashes of the variables of a `FunctionGraph`.
+
+    The hashes are those computed by `structural_hash`, with the inputs of the
+    `FunctionGraph` hashed by position. They are invalidated when the graph
+    changes, and only recomputed for the variables that depend on the change
+    when they are requested again.
+
+    `StructuralHashFeature.graph_hash` can then be used to tell apart
+    `FunctionGraph`\s that do not compute the same thing, or as a key for
+    in-memory caches of compiled graphs.
+
+    """
+
+    def on_attach(self, fgraph):
+        if hasattr(fgraph, "structural_hash_feature"):
+            raise AlreadyThere("StructuralHashFeature is already present")
+
+        fgraph.structural_hash_feature = self
+        self.fgraph = fgraph
+        self.hashes = {}
+        self._graph_hash = None
+
+    def on_detach(self, fgraph):
+        del fgraph.structural_hash_feature
+        del self.fgraph
+        del self.hashes
+
+    def clone(self):
+        return type(self)()
+
+    def on_import(self, fgraph, node, reason):
+        # The new node is hashed when it is first requested
+        self._graph_hash = None
+
+    def on_prune(self, fgraph, node, reason):
+        for out in node.outputs:
+            self.hashes.pop(out, None)
+
+    def on_change_input(self, fgraph, node, i, r, new_r, reason=None):
+        self._graph_hash = None
+        if node == "output":
+            return
+        todo = [node]
+        while todo:
+            for out in todo.pop().outputs:
+                if self.hashes.pop(out, None) is not None:
+                    todo.extend(
+                        client
+                        for client, _ in fgraph.clients[out]
+                        if client != "output"
+                    )
+
+    def variable_hash(self, var: Variable) -> int:
+        """Return the structural hash of `var`."""
+        h = self.hashes.get(var)
+        if h is not None:
+            return h
+
+        todo = [var]
+        while todo:
+            v = todo[-1]
+            if v in self.hashes:
+                todo.pop()
+            elif v.owner is None:
+                todo.pop()
+                if v in self.fgraph.inputs:
+                    self.hashes[v] = hash(("input", self.fgraph.inputs.index(v)))
+                else:
+                    self.hashes[v] = atomic_structural_hash(v)
+            else:
+                node = v.owner
+                missing = [inp for inp in node.inputs if inp not in self.hashes]
+                if missing:
+                    todo.extend(missing)
+                else:
+                    todo.pop()
+                    output_hashes = apply_structural_hashes(
+                        node, [self.hashes[inp] for inp in node.inputs]
+                    )
+                    self.hashes.update(zip(node.outputs, output_hashes))
+        return self.hashes[var]
+
+    def graph_hash(self) -> int:
+        """Return a hash of the computation of all the outputs of the graph."""
+        if self._graph_hash is None:
+            self._graph_hash = hash(
+                tuple(self.variable_hash(out) for out in self.fgraph.outputs)
+            )
+        return self._graph_hash
+
+
 class PrintListener(Feature):
     def __init__(self, active=True):
         self.active = active
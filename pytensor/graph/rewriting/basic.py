@@ -528,6 +528,12 @@ class MergeFeature(Feature):
         self.nodes_seen = set()
         # Ordered set of distinct (not mergeable) nodes without any input
         self.noinput_nodes = OrderedSet()
+        # Hash-consing table of the distinct nodes: maps `(op, inputs)` to the
+        # nodes in `nodes_seen` with that `Op` and those inputs (there can be
+        # more than one when a merge failed), so that the merge candidates of
+        # a node are found without scanning the clients of its inputs.
+        self.node_table = {}
+        self.node_keys = {}
 
         # Each element of scheduled is a list of list of (out, new_out) pairs.
         # Each list of pairs represent the substitution needed to replace all
@@ -555,7 +561,7 @@ class MergeFeature(Feature):
         if node in self.nodes_seen:
             # If inputs to a node change, it's not guaranteed that the node is
             # distinct from the other nodes in `self.nodes_seen`.
-            self.nodes_seen.discard(node)
+            self.forget_node(node)
             self.process_node(fgraph, node)
 
         if isinstance(new_r, AtomicVariable):
@@ -569,7 +575,7 @@ class MergeFeature(Feature):
         self.process_node(fgraph, node)
 
     def on_prune(self, fgraph, node, reason):
-        self.nodes_seen.discard(node)
+        self.forget_node(node)
         if not node.inputs:
             self.noinput_nodes.discard(node)
         for c in node.inputs:
@@ -594,19 +600,42 @@ class MergeFeature(Feature):
             self.atomic_sig_inv[sig] = c
             self.seen_atomics.add(id(c))
 
+    @staticmethod
+    def node_key(node):
+        """Return the key of `node` in the hash-consing table, if it has one."""
+        key = (node.op, tuple(node.inputs))
+        try:
+            hash(key)
+        except TypeError:  # node.op is unhashable
+            return None
+        return key
+
+    def forget_node(self, node):
+        """Remove `node` from the distinct nodes."""
+        self.nodes_seen.discard(node)
+        key = self.node_keys.pop(node, None)
+        if key is not None:
+            nodes = self.node_table[key]
+            nodes.remove(node)
+            if not nodes:
+                del self.node_table[key]
+
     def process_node(self, fgraph, node):
         r"""Check if a `node` can be merged, and queue that replacement.
 
-        When `node` is changed we check for other nodes (via the clients map)
-        that depend on the same inputs.  If any of those other nodes have the
-        same inputs and `Op` as `node`, they are queued to be merged.
+        When `node` is changed we look up the other nodes with the same `Op`
+        and inputs in the hash-consing table (or, for unhashable `Op`\s, via
+        the clients map), and queue them to be merged.
 
         """
 
         if node in self.nodes_seen:
             return
 
-        if node.inputs:
+        key = self.node_key(node)
+        if key is not None:
+            merge_candidates = self.node_table.get(key, [])
+        elif node.inputs:
             # We use the smallest clients list.  Some `Op`s like `Elemwise`
             # have rewrites that put constants as the first inputs.  Since
             # constants generally have more clients than other types of nodes,
@@ -658,6 +687,9 @@ class MergeFeature(Feature):
             self.scheduled.append(replacement_candidates)
         else:
             self.nodes_seen.add(node)
+            if key is not None:
+                self.node_table.setdefault(key, []).append(node)
+                self.node_keys[node] = key
             if not node.inputs:
                 self.noinput_nodes.add(node)
 
@@ -0,0 +1,337 @@
+"""Orderings of the nodes of a `FunctionGraph` that reduce its memory usage.
+
+`FunctionGraph.toposort` returns a valid evaluation order, but it does not
+take the size of the intermediate results into account. When the linker frees
+the intermediate results as soon as they are no longer needed, another order
+can have a much lower peak memory. `memory_schedule` searches for such an order
+from the sizes estimated by `estimate_sizes`, and `MemoryScheduler` can be
+given as the ``schedule`` of a linker to use it.
+
+"""
+
+import heapq
+import math
+from collections import defaultdict
+from collections.abc import Sequence
+from typing import TYPE_CHECKING, Optional
+
+import numpy as np
+
+from pytensor.graph.basic import Apply, Constant, Variable
+from pytensor.graph.fg import FunctionGraph
+
+
+if TYPE_CHECKING:
+    from pytensor.compile.profiling import ProfileStats
+
+
+def estimate_sizes(
+    fgraph: FunctionGraph,
+    profile: Optional["ProfileStats"] = None,
+    default_dim: int = 100,
+) -> dict[Variable, int]:
+    """Estimate the number of bytes taken by the value of each variable of `fgraph`.
+
+    The shapes recorded by `profile`, the `ProfileStats` of previous calls of
+    a function compiled from the same graph, are used when they are available.
+    The graph of a new compilation is a copy of the profiled one, so its
+    variables are matched by the structure of the graphs, see
+    `_structural_ids`.
+    Otherwise the static shapes of the types are used, completed by the
+    constant shapes found by the ``ShapeFeature`` of `fgraph` if it has one,
+    and the unknown dimensions are assumed to have length `default_dim`.
+
+    The variables whose type has no ``shape`` and ``dtype`` are assumed to
+    take no memory.
+
+    """
+    shape_feature = getattr(fgraph, "shape_feature", None)
+    shape_of = shape_feature.shape_of if shape_feature is not None else {}
+    variable_shape = _profiled_shapes(fgraph, profile) if profile is not None else {}
+
+    sizes = {}
+    for var in fgraph.variables:
+        if var in variable_shape and hasattr(var.type, "get_size"):
+            try:
+                sizes[var] = int(var.type.get_size(variable_shape[var]))
+                continue
+            except Exception:
+                pass
+
+        static_shape = getattr(var.type, "shape", None)
+        dtype = getattr(var.type, "dtype", None)
+        try:
+            itemsize = np.dtype(dtype).itemsize
+        except TypeError:
+            itemsize = None
+        if static_shape is None or dtype is None or itemsize is None:
+            sizes[var] = 0
+            continue
+
+        inferred_shape = shape_of.get(var)
+        shape = []
+        for i, dim in enumerate(static_shape):
+            if (
+                dim is None
+                and inferred_shape is not None
+                and isinstance(inferred_shape[i], Constant)
+            ):
+                dim = int(inferred_shape[i].data)
+            shape.append(default_dim if dim is None else dim)
+        sizes[var] = math.prod(shape) * itemsize
+    return sizes
+
+
+def _structural_ids(
+    fgraph: FunctionGraph, ids: dict[tuple, int]
+) -> dict[Variable, int]:
+    """Number the variables of `fgraph` by the graph that computes them.
+
+    The inputs of `fgraph` are identified by their position and type, the
+    constants by their signature, and the outputs of a node by its `Op`, the
+    numbers of its inputs and their index. `ids` maps these keys to their
+    number and is shared by the graphs to compare, so that the variables of
+    different copies of a graph get the same numbers.
+
+    """
+
+    def number(key):
+        return ids.setdefault(key, len(ids))
+
+    var_ids = {
+        inp: number(("input", i, inp.type)) for i, inp in enumerate(fgraph.inputs)
+    }
+    for node in fgraph.toposort():
+        for inp in node.inputs:
+            if inp in var_ids:
+                continue
+            try:
+                key = ("constant", inp.signature())
+                hash(key)
+            except (AttributeError, TypeError):
+                key = ("orphan", inp)
+            var_ids[inp] = number(key)
+        input_ids = tuple(var_ids[inp] for inp in node.inputs)
+        for i, out in enumerate(node.outputs):
+            var_ids[out] = number((node.op, input_ids, i))
+    return var_ids
+
+
+def _profiled_shapes(fgraph: FunctionGraph, profile: "ProfileStats") -> dict:
+    """Map the variables of `fgraph` to the shapes recorded by `profile`.
+
+    The shapes recorded for the variables of the graphs profiled by `profile`
+    are used for the variables of `fgraph` with the same `_structural_ids`.
+
+    """
+    variable_shape = profile.variable_shape
+    profiled_fgraphs = {key[0] for key in profile.apply_time or ()}
+    profiled_fgraphs.discard(fgraph)
+
+    ids: dict[tuple, int] = {}
+    shape_of_id = {}
+    for profiled_fgraph in profiled_fgraphs:
+        for var, var_id in _structural_ids(profiled_fgraph, ids).items():
+            if var in variable_shape:
+                shape_of_id[var_id] = variable_shape[var]
+
+    shapes = {}
+    for var, var_id in _structural_ids(fgraph, ids).items():
+        if var in variable_shape:
+            shapes[var] = variable_shape[var]
+        elif var_id in shape_of_id:
+            shapes[var] = shape_of_id[var_id]
+    return shapes
+
+
+def _alias_roots(order: Sequence[Apply]) -> dict[Variable, Variable]:
+    """Map the outputs of the nodes in `order` to the variable owning their memory.
+
+    The outputs that are views of, or that destroy, an input share the memory
+    of that input, and the other outputs own their memory.
+
+    """
+    root_of: dict[Variable, Variable] = {}
+    for node in order:
+        view_map = node.op.view_map
+        destroy_map = node.op.destroy_map
+        for i, out in enumerate(node.outputs):
+            aliased = view_map.get(i) or destroy_map.get(i)
+            if aliased:
+                inp = node.inputs[aliased[0]]
+                root_of[out] = root_of.get(inp, inp)
+            else:
+                root_of[out] = out
+    return root_of
+
+
+def _freeable(fgraph: FunctionGraph, root_of: dict[Variable, Variable]) -> set:
+    """Return the variables whose memory the linker frees when they are no longer used."""
+    kept = {root_of.get(out, out) for out in fgraph.outputs}
+    return {
+        var
+        for var, root in root_of.items()
+        if var is root and var not in kept and not isinstance(var, Constant)
+    }
+
+
+def peak_memory(
+    fgraph: FunctionGraph, order: Sequence[Apply], sizes: dict[Variable, int]
+) -> int:
+    """Return the peak memory of the intermediate results when running `order`.
+
+    The memory is estimated from `sizes`, e.g. from `estimate_sizes`, for a
+    linker that frees the intermediate results as soon as all their clients
+    have been run. The inputs of `fgraph` are not counted.
+
+    """
+    root_of = _alias_roots(order)
+    node_roots = {
+        node: {root_of.get(inp, inp) for inp in node.inputs} for node in order
+    }
+    return _peak_memory(order, node_roots, root_of, _freeable(fgraph, root_of), sizes)
+
+
+def _peak_memory(order, node_roots, root_of, freeable, sizes):
+    uses: dict[Variable, int] = defaultdict(int)
+    for roots in node_roots.values():
+        for root in roots:
+            uses[root] += 1
+
+    current = peak = 0
+    for node in order:
+        new_roots = [out for out in node.outputs if root_of[out] is out]
+        for out in new_roots:
+            current += sizes.get(out, 0)
+        peak = max(peak, current)
+        for root in node_roots[node]:
+            uses[root] -= 1
+            if uses[root] == 0 and root in freeable:
+                current -= sizes.get(root, 0)
+        for out in new_roots:
+            if uses[out] == 0 and out in freeable:
+                current -= sizes.get(out, 0)
+    return peak
+
+
+def memory_schedule(
+    fgraph: FunctionGraph, sizes: Optional[dict[Variable, int]] = None
+) -> list[Apply]:
+    """Return an order of the nodes of `fgraph` with a low peak memory.
+
+    The nodes are scheduled greedily: among the nodes whose dependencies,
+    including the orderings of `FunctionGraph.orderings`, have been run, the
+    one that allocates the least memory minus the memory it allows to free is
+    run first, with ties broken by the order of `FunctionGraph.toposort`.
+    The result is only used if its peak memory, as computed by `peak_memory`
+    from `sizes`, is lower than the one of `FunctionGraph.toposort`.
+
+    `sizes` defaults to the estimation of `estimate_sizes`.
+
+    """
+    default_order = fgraph.toposort()
+    if len(default_order) < 3:
+        return default_order
+    if sizes is None:
+        sizes = estimate_sizes(fgraph)
+
+    position = {node: i for i, node in enumerate(default_order)}
+    root_of = _alias_roots(default_order)
+    freeable = _freeable(fgraph, root_of)
+    node_roots = {
+        node: {root_of.get(inp, inp) for inp in node.inputs} for node in default_order
+    }
+    # The nodes that use each variable and have not been run yet
+    users: dict[Variable, set[Apply]] = defaultdict(set)
+    for node, roots in node_roots.items():
+        for root in roots:
+            users[root].add(node)
+
+    orderings = fgraph.orderings()
+    n_dependencies = {}
+    dependents = defaultdict(list)
+    for node in default_order:
+        dependencies = {inp.owner for inp in node.inputs if inp.owner in position}
+        dependencies.update(orderings.get(node, ()))
+        n_dependencies[node] = len(dependencies)
+        for dependency in dependencies:
+            dependents[dependency].append(node)
+
+    def cost(node):
+        allocated = sum(
+            sizes.get(out, 0) for out in node.outputs if root_of[out] is out
+        )
+        freed = sum(
+            sizes.get(root, 0)
+            for root in node_roots[node]
+            if root in freeable and len(users[root]) == 1
+        )
+        return allocated - freed
+
+    # The cost of a node only decreases, when it becomes the last user of one
+    # of its inputs, in which case it is pushed again with its new cost.
+    ready = [
+        (cost(node), position[node], node)
+        for node in default_order
+        if n_dependencies[node] == 0
+    ]
+    heapq.heapify(ready)
+    order = []
+    done = set()
+    while ready:
+        node_cost, _, node = heapq.heappop(ready)
+        if node in done or node_cost != cost(node):
+            continue
+        done.add(node)
+        order.append(node)
+        for root in node_roots[node]:
+            root_users = users[root]
+            root_users.discard(node)
+            if len(root_users) == 1:
+                (last_user,) = root_users
+                if n_dependencies[last_user] == 0:
+                    heapq.heappush(
+                        ready, (cost(last_user), position[last_user], last_user)
+                    )
+        for dependent in dependents[node]:
+            n_dependencies[dependent] -= 1
+            if n_dependencies[dependent] == 0:
+                heapq.heappush(ready, (cost(dependent), position[dependent], dependent))
+
+    assert len(order) == len(default_order)
+    # The aliasing of the variables does not depend on the order
+    if _peak_memory(order, node_roots, root_of, freeable, sizes) < _peak_memory(
+        default_order, node_roots, root_of, freeable, sizes
+    ):
+        return order
+    return default_order
+
+
+class MemoryScheduler:
+    """A ``schedule`` for the linkers that runs the nodes in the order of `memory_schedule`.
+
+    For example, ``Mode(linker=VMLinker(use_cloop=True, schedule=MemoryScheduler()))``
+    compiles functions that run their nodes in that order.
+
+    Parameters
+    ----------
+    profile
+        The `ProfileStats` of previous calls of functions compiled from the
+        same graph, used by `estimate_sizes` to get the actual shapes of the
+        variables.
+    default_dim
+        The length assumed by `estimate_sizes` for the unknown dimensions.
+
+    """
+
+    def __init__(
+        self, profile: Optional["ProfileStats"] = None, default_dim: int = 100
+    ):
+        self.profile = profile
+        self.default_dim = default_dim
+
+    def __call__(self, fgraph: FunctionGraph) -> list[Apply]:
+        sizes = estimate_sizes(
+            fgraph, profile=self.profile, default_dim=self.default_dim
+        )
+        return memory_schedule(fgraph, sizes)
@@ -1,4 +1,5 @@
 from abc import abstractmethod
+from collections.abc import Sequence
 from typing import Any, Generic, Optional, TypeVar, Union
 
 from typing_extensions import TypeAlias
@@ -129,6 +130,23 @@ class Type(MetaObject, Generic[D]):
         """
         raise NotImplementedError()
 
+    def filter_many(
+        self,
+        values: Sequence[Any],
+        strict: bool = False,
+        allow_downcast: Optional[bool] = None,
+    ) -> list[D]:
+        """Return the result of `Type.filter` for each of the `values`.
+
+        Subclasses can override it to avoid checking several times values that
+        are accepted for the same reasons, e.g. arrays of the same dtype.
+
+        """
+        return [
+            self.filter(value, strict=strict, allow_downcast=allow_downcast)
+            for value in values
+        ]
+
     def filter_variable(
         self, other: Union[Variable, D], allow_convert: bool = True
     ) -> variable_type:
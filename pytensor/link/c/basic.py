@@ -12,7 +12,6 @@ from typing import TYPE_CHECKING, Any, Optional
 
 import numpy as np
 
-from pytensor.compile.compilelock import lock_ctx
 from pytensor.configdefaults import config
 from pytensor.graph.basic import (
     AtomicVariable,
@@ -148,6 +147,28 @@ def failure_code_init(sub):
     )
 
 
+def release_gil(code, sub):
+    """
+    Wrap `code` so that it runs without the GIL, when the `Op` allows it.
+
+    See `CLinkerOp.c_code_release_gil`.
+
+    Parameters:
+    ----------
+    code
+        C code that doesn't use the Python C-API.
+    sub
+        Dictionary passed to `CLinkerOp.c_code`. If it doesn't contain
+        the 'begin_nogil' and 'end_nogil' entries, `code` is returned
+        unchanged.
+    """
+    begin = sub.get("begin_nogil", "")
+    end = sub.get("end_nogil", "")
+    if not (begin or end):
+        return code
+    return f"{begin}\n{code}\n{end}"
+
+
 def code_gen(blocks):
     """
     From a list of L{CodeBlock} instances, returns a string
@@ -811,6 +832,12 @@ class CLinker(Linker):
             sub["fail"] = failure_code(sub)
             if params is not NoParams:
                 sub["params"] = params_var
+            if config.cmodule__release_gil and op.c_code_release_gil(node):
+                sub["begin_nogil"] = "Py_BEGIN_ALLOW_THREADS"
+                sub["end_nogil"] = "Py_END_ALLOW_THREADS"
+            else:
+                sub["begin_nogil"] = ""
+                sub["end_nogil"] = ""
 
             sub_struct = dict()
             sub_struct["id"] = id + 1
@@ -1513,11 +1540,16 @@ class CLinker(Linker):
         mod = self.get_dynamic_module()
         return mod.code()
 
-    def compile_cmodule(self, location=None):
+    def compile_cmodule(self, location=None, py_module=True):
         """
         This compiles the source code for this linker and returns a
         loaded module.
 
+        No lock is taken, as `location` is expected to be a directory that
+        belongs to this compilation only. If `py_module` is ``False``, the
+        shared library is only built and its path is returned instead (see
+        `ModuleCache.compile_many`).
+
         """
         if location is None:
             location = dlimport_workdir(config.compiledir)
@@ -1525,23 +1557,22 @@ class CLinker(Linker):
         c_compiler = self.c_compiler()
         libs = self.libraries()
         preargs = self.compile_args()
-        # We want to compute the code without the lock
         src_code = mod.code()
-        with lock_ctx():
-            try:
-                _logger.debug(f"LOCATION {location}")
-                module = c_compiler.compile_str(
-                    module_name=mod.code_hash,
-                    src_code=src_code,
-                    location=location,
-                    include_dirs=self.header_dirs(),
-                    lib_dirs=self.lib_dirs(),
-                    libs=libs,
-                    preargs=preargs,
-                )
-            except Exception as e:
-                e.args += (str(self.fgraph),)
-                raise
+        try:
+            _logger.debug(f"LOCATION {location}")
+            module = c_compiler.compile_str(
+                module_name=mod.code_hash,
+                src_code=src_code,
+                location=location,
+                include_dirs=self.header_dirs(),
+                lib_dirs=self.lib_dirs(),
+                libs=libs,
+                preargs=preargs,
+                py_module=py_module,
+            )
+        except Exception as e:
+            e.args += (str(self.fgraph),)
+            raise
         return module
 
     def get_dynamic_module(self):
@@ -106,6 +106,7 @@ typedef struct {
       PyObject *nodes;      // the python list of nodes
   PyObject *thunks;         // python list of thunks
   PyObject *pre_call_clear; // list of cells to clear on call.
+  PyObject *cancel_event;   // checked before each thunk, if not NULL.
   int allow_gc;
   Py_ssize_t n_applies;
   int n_vars;        // number of variables in the graph
@@ -194,6 +195,7 @@ static void CLazyLinker_dealloc(PyObject *_self) {
   Py_XDECREF(self->call_times);
   Py_XDECREF(self->call_counts);
   Py_XDECREF(self->pre_call_clear);
+  Py_XDECREF(self->cancel_event);
   Py_TYPE(self)->tp_free((PyObject *)self);
 }
 static PyObject *CLazyLinker_new(PyTypeObject *type, PyObject *args,
@@ -205,6 +207,7 @@ static PyObject *CLazyLinker_new(PyTypeObject *type, PyObject *args,
     self->nodes = NULL;
     self->thunks = NULL;
     self->pre_call_clear = NULL;
+    self->cancel_event = NULL;
 
     self->allow_gc = 1;
     self->n_applies = 0;
@@ -541,6 +544,16 @@ static int c_call(CLazyLinker *self, Py_ssize_t node_idx, int verbose) {
     set_position_of_error(self, node_idx);
   return err;
 }
+// Raise an exception if the evaluation was cancelled with `cancel_event`.
+static int check_cancelled(CLazyLinker *self) {
+  if (self->cancel_event == NULL || self->cancel_event == Py_None)
+    return 0;
+  PyObject *rval = PyObject_CallMethod(self->cancel_event, "check", NULL);
+  if (rval == NULL)
+    return 1;
+  Py_DECREF(rval);
+  return 0;
+}
 static int lazy_rec_eval(CLazyLinker *self, Py_ssize_t var_idx, PyObject *one,
                          PyObject *zero) {
   PyObject *rval = NULL;
@@ -583,6 +596,9 @@ static int lazy_rec_eval(CLazyLinker *self, Py_ssize_t var_idx, PyObject *one,
         goto fail;
     }
 
+    err = check_cancelled(self);
+    if (err)
+      goto fail;
     rval = pycall(self, owner_idx, verbose);
     // refcounting - rval is new ref
     // TODO: to prevent infinite loops
@@ -669,6 +685,9 @@ static int lazy_rec_eval(CLazyLinker *self, Py_ssize_t var_idx, PyObject *one,
       assert(self->var_computed[input_idx]);
     }
 
+    err = check_cancelled(self);
+    if (err)
+      goto fail;
     // call the thunk for this owner.
     if (self->thunk_cptr_fn[owner_idx]) {
       err = c_call(self, owner_idx, verbose);
@@ -753,13 +772,34 @@ static PyObject *CLazyLinker_call(PyObject *_self, PyObject *args,
                                   PyObject *kwds) {
   CLazyLinker *self = (CLazyLinker *)_self;
   static char *kwlist[] = {(char *)"time_thunks", (char *)"n_calls",
-                           (char *)"output_subset", NULL};
+                           (char *)"output_subset", (char *)"input_cells",
+                           (char *)"inputs", NULL};
   int n_calls = 1;
   PyObject *output_subset_ptr = NULL;
-  if (!PyArg_ParseTupleAndKeywords(args, kwds, "|iiO", kwlist, &self->do_timing,
-                                   &n_calls, &output_subset_ptr))
+  // When given, `inputs` is a list with one sequence of values per call, which
+  // are put in the storage cells of `input_cells` before the call, and the
+  // list of the outputs of each call is returned.
+  PyObject *input_cells = NULL;
+  PyObject *inputs = NULL;
+  if (!PyArg_ParseTupleAndKeywords(args, kwds, "|iiOOO", kwlist,
+                                   &self->do_timing, &n_calls,
+                                   &output_subset_ptr, &input_cells, &inputs))
     return NULL;
 
+  PyObject *all_rvals = NULL;
+  if (inputs != NULL) {
+    if (input_cells == NULL || !PyList_Check(input_cells) ||
+        !PyList_Check(inputs)) {
+      PyErr_SetString(PyExc_TypeError,
+                      "inputs and input_cells must both be lists");
+      return NULL;
+    }
+    n_calls = PyList_Size(inputs);
+    all_rvals = PyList_New(0);
+    if (all_rvals == NULL)
+      return NULL;
+  }
+
   int err = 0;
   // parse an output_subset list
   // it is stored as a bool list of length n_output_vars: calculate a var or not
@@ -794,6 +834,29 @@ static PyObject *CLazyLinker_call(PyObject *_self, PyObject *args,
   PyObject *rval = Py_None;
   // clear storage of pre_call_clear elements
   for (int call_i = 0; call_i < n_calls && (!err); ++call_i) {
+    if (inputs != NULL) {
+      PyObject *call_inputs = PySequence_Fast(PyList_GetItem(inputs, call_i),
+                                              "the inputs must be sequences");
+      if (call_inputs == NULL) {
+        err = 1;
+        break;
+      }
+      Py_ssize_t n_input_cells = PyList_Size(input_cells);
+      if (PySequence_Fast_GET_SIZE(call_inputs) != n_input_cells) {
+        PyErr_Format(PyExc_TypeError, "Expected %zd inputs in call %d, got %zd",
+                     n_input_cells, call_i,
+                     PySequence_Fast_GET_SIZE(call_inputs));
+        Py_DECREF(call_inputs);
+        err = 1;
+        break;
+      }
+      for (Py_ssize_t i = 0; i < n_input_cells; ++i) {
+        PyObject *value = PySequence_Fast_GET_ITEM(call_inputs, i);
+        Py_INCREF(value);
+        PyList_SetItem(PyList_GetItem(input_cells, i), 0, value);
+      }
+      Py_DECREF(call_inputs);
+    }
     Py_ssize_t n_pre_call_clear = PyList_Size(self->pre_call_clear);
     assert(PyList_Check(self->pre_call_clear));
     for (int i = 0; i < n_pre_call_clear; ++i) {
@@ -853,6 +916,10 @@ static PyObject *CLazyLinker_call(PyObject *_self, PyObject *args,
         PyList_SetItem(self->var_value_cells[in_idx], 0, tmp);
       }
     }
+
+    if (!err && all_rvals != NULL) {
+      err = PyList_Append(all_rvals, rval);
+    }
   }
 
   /*
@@ -884,8 +951,13 @@ static PyObject *CLazyLinker_call(PyObject *_self, PyObject *args,
   Py_DECREF(zero);
   if (err) {
     Py_DECREF(rval);
+    Py_XDECREF(all_rvals);
     return NULL;
   }
+  if (all_rvals != NULL) {
+    Py_DECREF(rval);
+    return all_rvals;
+  }
   return rval;
 }
 
@@ -938,6 +1010,8 @@ static PyMemberDef CLazyLinker_members[] = {
      offsetof(CLazyLinker, need_update_inputs), 0,
      (char *)"bool: nonzero means Function.__call__ must implement update "
              "mechanism"},
+    {(char *)"cancel_event", T_OBJECT, offsetof(CLazyLinker, cancel_event), 0,
+     (char *)"object whose check method is called before each thunk"},
     {NULL} /* Sentinel */
 };
 
@@ -987,7 +1061,7 @@ static PyTypeObject lazylinker_ext_CLazyLinkerType = {
 };
 
 static PyObject *get_version(PyObject *dummy, PyObject *args) {
-  PyObject *result = PyFloat_FromDouble(0.212);
+  PyObject *result = PyFloat_FromDouble(0.214);
   return result;
 }
 
@@ -20,6 +20,8 @@ import tempfile
 import textwrap
 import time
 import warnings
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from io import BytesIO, StringIO
 from typing import TYPE_CHECKING, Callable, Optional, Protocol, cast
 
@@ -32,7 +34,7 @@ from setuptools._distutils.sysconfig import (
 )
 
 # we will abuse the lockfile mechanism when reading and writing the registry
-from pytensor.compile.compilelock import lock_ctx
+from pytensor.compile.compilelock import lock_ctx, module_lock_ctx, remove_module_lock
 from pytensor.configdefaults import config, gcc_version_str
 from pytensor.configparser import BoolParam, StrParam
 from pytensor.graph.op import Op
@@ -318,6 +320,17 @@ def dlimport(fullpath, suffix=None):
     _logger.debug(f"WORKDIR {workdir}")
     _logger.debug(f"module_name {module_name}")
 
+    # Cache directories named after the module hash (see
+    # `ModuleCache._module_dir`) may already have been imported from another
+    # compilation directory, in which case that import must not be reused.
+    package_name = module_name.split(".")[0]
+    package = sys.modules.get(package_name)
+    if package is not None and list(getattr(package, "__path__", [])) != [
+        os.path.join(workdir, package_name)
+    ]:
+        del sys.modules[package_name]
+        sys.modules.pop(module_name, None)
+
     sys.path[0:0] = [workdir]  # insert workdir at beginning (temporarily)
     # Explicitly add gcc dll directory on Python 3.8+ on Windows
     if (sys.platform == "win32") & (hasattr(os, "add_dll_directory")):
@@ -348,8 +361,16 @@ def dlimport_workdir(basedir):
     to be able to load it, given a basedir which should normally be
     config.compiledir.
 
+    The directory is created with an empty ``__init__.py`` file while holding
+    the compilation lock, so that `ModuleCache.refresh` does not remove it as
+    an empty directory before the module is compiled in it.
+
     """
-    return tempfile.mkdtemp(dir=basedir)
+    with lock_ctx(basedir):
+        location = tempfile.mkdtemp(dir=basedir)
+        with open(os.path.join(location, "__init__.py"), "w"):
+            pass
+    return location
 
 
 def last_access_time(path):
@@ -505,6 +526,32 @@ def get_safe_part(key):
     return key[0] + (hash,)
 
 
+@dataclass
+class IndexEntry:
+    """A module listed in the index of a `ModuleCache`."""
+
+    entry: str
+    """Path to the module file."""
+
+    size: Optional[int] = None
+    """Size of the module directory in bytes, if known."""
+
+    last_access: Optional[float] = None
+    """Time at which a process last loaded or compiled the module, if known."""
+
+
+def get_dir_size(path):
+    """Return the total size in bytes of the files in a directory."""
+    size = 0
+    for root, _, files in os.walk(path):
+        for file in files:
+            try:
+                size += os.path.getsize(os.path.join(root, file))
+            except OSError:
+                pass
+    return size
+
+
 class KeyData:
     """
     Used to store the key information in the cache.
@@ -555,14 +602,18 @@ class KeyData:
         pickle time (in which case a warning is also displayed).
 
         """
+        # The file is replaced atomically, as other processes read it
+        # without taking any lock (see `ModuleCache._get_from_disk`).
         # Note that writing in binary mode is important under Windows.
+        tmp_pkl = f"{self.key_pkl}.{os.getpid()}.tmp"
         try:
-            with open(self.key_pkl, "wb") as f:
+            with open(tmp_pkl, "wb") as f:
                 pickle.dump(self, f, protocol=pickle.HIGHEST_PROTOCOL)
         except pickle.PicklingError:
             warnings.warn(f"Cache leak due to unpickle-able key data: {self.keys}")
-            os.remove(self.key_pkl)
+            os.remove(tmp_pkl)
             raise
+        os.replace(tmp_pkl, self.key_pkl)
 
     def get_entry(self):
         """
@@ -657,6 +708,18 @@ class ModuleCache:
     These three elements uniquely identify a module, and are summarized
     in a single "module hash".
 
+    The shared modules are also listed in an index file (``index.log``) at
+    the root of the cache, which maps module hashes to module files, along
+    with their size and last access time. When it exists, the constructor
+    reads it instead of walking the whole cache, and the ``key.pkl`` file of
+    a module is only unpickled when that module is first needed. The index is
+    extended by `ModuleCache._add_to_cache` and each time a process loads a
+    module, and rewritten by `ModuleCache.refresh`, `ModuleCache.clear_old`
+    and `ModuleCache.trim`. The constructor still walks the whole cache when
+    the last `ModuleCache.refresh` is older than
+    `ModuleCache.refresh_interval`, so that the directories of failed
+    compilations are eventually cleaned up.
+
     Parameters
     ----------
     check_for_broken_eq
@@ -665,8 +728,17 @@ class ModuleCache:
         time a new key is added to the cache.
 
     do_refresh : bool
-        If ``True``, then the `ModuleCache.refresh` method will be called
-        in the constructor.
+        If ``True``, then the cache index is loaded in the constructor, or
+        the `ModuleCache.refresh` method is called if there is no index yet
+        or if the last refresh is too old.
+
+    readonly_layers : list of str, optional
+        Cache directories that are searched, in order, before ``dirname``
+        when looking for a versioned module on disk. They are never locked
+        nor modified, so they can be baked into read-only images. Only the
+        modules listed in their index, or compiled into their
+        `ModuleCache._module_dir`, are found there. Defaults to
+        ``config.compiledir_readonly_layers``.
 
     """
 
@@ -706,8 +778,30 @@ class ModuleCache:
     Set of all ``key.pkl`` files that have been loaded.
 
     """
+    module_hash_to_entry: dict = {}
+    """
+    Maps a module hash to the path of its ``.so/.pyd``, as read from the
+    cache index. The corresponding ``key.pkl`` may not have been loaded yet.
 
-    def __init__(self, dirname, check_for_broken_eq=True, do_refresh=True):
+    """
+    readonly_layers: list = []
+    """
+    List of ``(dirname, module_hash_to_entry)`` pairs, one for each read-only
+    cache directory searched before `ModuleCache.dirname`.
+
+    """
+    index_filename = "index.log"
+    refresh_stamp_filename = "refresh.stamp"
+    refresh_interval = 60 * 60 * 24  # 1 day
+    """
+    Maximum age (in seconds) of the last `ModuleCache.refresh` before the
+    constructor walks the whole cache again instead of only reading the index.
+
+    """
+
+    def __init__(
+        self, dirname, check_for_broken_eq=True, do_refresh=True, readonly_layers=None
+    ):
         self.dirname = dirname
         self.module_from_name = dict(self.module_from_name)
         self.entry_from_key = dict(self.entry_from_key)
@@ -716,10 +810,40 @@ class ModuleCache:
         self.stats = [0, 0, 0]
         self.check_for_broken_eq = check_for_broken_eq
         self.loaded_key_pkl = set()
+        self.module_hash_to_entry = dict(self.module_hash_to_entry)
         self.time_spent_in_check_key = 0
+        self.time_spent_compiling = 0
 
         if do_refresh:
-            self.refresh()
+            index = self._read_index()
+            if index is None or self._refresh_is_due():
+                self.refresh()
+            else:
+                self.module_hash_to_entry = {
+                    module_hash: index_entry.entry
+                    for module_hash, index_entry in index.items()
+                }
+
+        if readonly_layers is None:
+            readonly_layers = [
+                os.path.realpath(os.path.expanduser(layer))
+                for layer in config.compiledir_readonly_layers.split(os.pathsep)
+                if layer
+            ]
+        self.readonly_layers = []
+        for layer in readonly_layers:
+            if os.path.realpath(layer) == os.path.realpath(self.dirname):
+                continue
+            index = self._read_index(layer) or {}
+            self.readonly_layers.append(
+                (
+                    layer,
+                    {
+                        module_hash: index_entry.entry
+                        for module_hash, index_entry in index.items()
+                    },
+                )
+            )
 
     age_thresh_use = config.cmodule__age_thresh_use  # default 24 days
     """
@@ -738,6 +862,12 @@ class ModuleCache:
             _logger.debug(f"loading name {name}")
             self.module_from_name[name] = dlimport(name)
             self.stats[1] += 1
+            if not self._is_readonly(name):
+                # Losing this line only makes the LRU order used by `trim`
+                # slightly stale, so loading a module does not take the lock.
+                self._append_to_index(
+                    "use", os.path.relpath(name, self.dirname), str(time.time())
+                )
         else:
             _logger.debug(f"returning compiled module from cache {name}")
             self.stats[0] += 1
@@ -1064,12 +1194,132 @@ class ModuleCache:
                     if not files:
                         _rmtree(*a, **kw)
 
+            self._write_index()
+            with open(os.path.join(self.dirname, self.refresh_stamp_filename), "w"):
+                pass
+
             _logger.debug(
                 f"Time needed to refresh cache: {time.perf_counter() - start_time}"
             )
 
         return too_old_to_use
 
+    def _refresh_is_due(self):
+        """
+        Return whether the last `ModuleCache.refresh` of the cache directory
+        is older than `ModuleCache.refresh_interval`.
+
+        """
+        try:
+            last_refresh = os.path.getmtime(
+                os.path.join(self.dirname, self.refresh_stamp_filename)
+            )
+        except OSError:
+            return True
+        return time.time() - last_refresh > self.refresh_interval
+
+    def _index_path(self, dirname=None):
+        return os.path.join(dirname or self.dirname, self.index_filename)
+
+    def _read_index(self, dirname=None):
+        """
+        Return the map from module hashes to `IndexEntry` stored in the
+        index of `dirname` (by default, ``self.dirname``), or None if there
+        is no index.
+
+        """
+        dirname = dirname or self.dirname
+        try:
+            with open(self._index_path(dirname)) as f:
+                lines = f.readlines()
+        except FileNotFoundError:
+            return None
+        index = {}
+        hash_from_entry = {}
+        for line in lines:
+            fields = line.rstrip("\n").split("\t")
+            try:
+                if fields[0] == "add" and len(fields) in (3, 5):
+                    module_hash, entry = fields[1], fields[2]
+                    index_entry = IndexEntry(os.path.join(dirname, entry))
+                    if len(fields) == 5:
+                        index_entry.size = int(fields[3])
+                        index_entry.last_access = float(fields[4])
+                    index[module_hash] = index_entry
+                    hash_from_entry[entry] = module_hash
+                elif fields[0] == "use" and len(fields) == 3:
+                    module_hash = hash_from_entry.get(fields[1])
+                    if module_hash in index:
+                        index[module_hash].last_access = float(fields[2])
+                elif fields[0] == "del" and len(fields) == 2:
+                    index.pop(fields[1], None)
+            except ValueError:
+                pass
+            # Other lines can only come from a process that crashed while
+            # writing them, and are ignored.
+        return index
+
+    def _append_to_index(self, *fields):
+        """
+        Append a line to the index, if it exists.
+
+        Each line is appended with a single write, so that concurrent
+        appends do not need a lock. However, `_write_index` replaces the
+        index file and would lose the lines appended to the old one in the
+        meantime, so the callers must hold the compile lock for the lines
+        that cannot be lost.
+
+        """
+        try:
+            fd = os.open(self._index_path(), os.O_WRONLY | os.O_APPEND)
+        except FileNotFoundError:
+            # The first refresh will index the whole cache.
+            return
+        with open(fd, "w") as f:
+            f.write("\t".join(fields) + "\n")
+
+    def _write_index(self, index=None):
+        """
+        Rewrite the index from its current content and the modules that are
+        known to this cache, dropping the modules that no longer exist.
+
+        This function expects the compile lock to be held.
+
+        """
+        if index is None:
+            index = self._read_index() or {}
+        entries = dict(self.module_hash_to_entry)
+        for module_hash, key_data in self.module_hash_to_key_data.items():
+            if not self._is_readonly(key_data.key_pkl) and os.path.exists(
+                key_data.key_pkl
+            ):
+                entries[module_hash] = key_data.get_entry()
+        for module_hash, entry in entries.items():
+            if module_hash not in index or index[module_hash].entry != entry:
+                index[module_hash] = IndexEntry(entry)
+
+        index_path = self._index_path()
+        tmp_path = f"{index_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            for module_hash, index_entry in sorted(index.items()):
+                entry = index_entry.entry
+                if not os.path.exists(entry):
+                    # The callers use `index` afterwards, e.g. to sum the sizes
+                    del index[module_hash]
+                    continue
+                if index_entry.size is None:
+                    index_entry.size = get_dir_size(os.path.dirname(entry))
+                if index_entry.last_access is None:
+                    index_entry.last_access = last_access_time(entry)
+                f.write(
+                    f"add\t{module_hash}\t{os.path.relpath(entry, self.dirname)}"
+                    f"\t{index_entry.size}\t{index_entry.last_access}\n"
+                )
+        os.replace(tmp_path, index_path)
+        self.module_hash_to_entry = {
+            module_hash: index_entry.entry for module_hash, index_entry in index.items()
+        }
+
     def _get_from_key(self, key, key_data=None):
         """
         Returns a module if the passed-in key is found in the cache
@@ -1098,7 +1348,14 @@ class ModuleCache:
         if module_hash in self.module_hash_to_key_data:
             key_data = self.module_hash_to_key_data[module_hash]
             module = self._get_from_key(None, key_data)
-            with lock_ctx():
+            if self._is_readonly(key_data.key_pkl):
+                # The new key is only kept in memory.
+                key_data.add_key(key, save_pkl=False)
+                self._update_mappings(
+                    key, key_data, module.__file__, check_in_keys=True
+                )
+                return module
+            with module_lock_ctx(module_hash, self.dirname):
                 try:
                     key_data.add_key(key, save_pkl=bool(key[0]))
                     key_broken = False
@@ -1117,6 +1374,115 @@ class ModuleCache:
         else:
             return None
 
+    def _module_dir(self, module_hash):
+        """
+        Return the directory in which a versioned module is compiled.
+
+        It only depends on the module hash, so that other processes can find
+        the module there without refreshing the whole cache.
+
+        """
+        return os.path.join(self.dirname, module_hash)
+
+    def _is_readonly(self, path):
+        """
+        Return True if `path` is in one of the read-only layers.
+
+        """
+        return any(
+            path.startswith(os.path.join(layer, ""))
+            for layer, _ in self.readonly_layers
+        )
+
+    def _load_key_data(self, location, module_hash):
+        """
+        Load the `KeyData` of the module with hash `module_hash` compiled in
+        `location`, or return None if it is not there.
+
+        """
+        key_pkl = os.path.join(location, "key.pkl")
+        if key_pkl in self.loaded_key_pkl:
+            return None
+        try:
+            with open(key_pkl, "rb") as f:
+                key_data = pickle.load(f)
+            entry = module_name_from_dir(location)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            # The key data may reference classes that cannot be unpickled
+            # yet, or the directory may be in an unexpected state. Let the
+            # caller compile the module elsewhere instead.
+            _logger.debug(f"Could not load cache entry {location}", exc_info=True)
+            return None
+        if not isinstance(key_data, KeyData) or key_data.module_hash != module_hash:
+            return None
+        key_data.entry = entry
+        key_data.key_pkl = key_pkl
+        return key_data
+
+    def _get_from_disk(self, module_hash, key):
+        """
+        Returns the module with hash `module_hash` if it is in one of the
+        read-only layers or in the index, or if another process has compiled
+        it into `ModuleCache._module_dir` since then, and None otherwise.
+
+        This is where the ``key.pkl`` files of the modules listed in the index
+        are lazily loaded. No lock is taken: the ``key.pkl`` file is only
+        written once the module is compiled, and it is replaced atomically.
+
+        """
+        if not key[0]:
+            # Unversioned modules are not shared between processes.
+            return None
+        locations = []
+        for layer, module_hash_to_entry in self.readonly_layers:
+            if module_hash in module_hash_to_entry:
+                locations.append(os.path.dirname(module_hash_to_entry[module_hash]))
+            else:
+                locations.append(os.path.join(layer, module_hash))
+        if module_hash in self.module_hash_to_entry:
+            locations.append(os.path.dirname(self.module_hash_to_entry[module_hash]))
+        else:
+            locations.append(self._module_dir(module_hash))
+        for location in locations:
+            key_data = self._load_key_data(location, module_hash)
+            if key_data is not None:
+                break
+        else:
+            return None
+
+        self.module_hash_to_key_data[module_hash] = key_data
+        self.loaded_key_pkl.add(key_data.key_pkl)
+        entry = key_data.entry
+        if key in key_data.keys:
+            self._update_mappings(key, key_data, entry, check_in_keys=True)
+            return self._get_from_key(key)
+        return self._get_from_hash(module_hash, key)
+
+    def _new_module_dir(self, module_hash, key):
+        """
+        Create and return the directory in which to compile a new module.
+
+        This is `ModuleCache._module_dir` for versioned modules, unless it
+        already exists (e.g. after a failed compilation in another process),
+        and a fresh temporary directory otherwise.
+
+        """
+        if key[0]:
+            location = self._module_dir(module_hash)
+            # As in `dlimport_workdir`, `refresh` must not see it empty.
+            with lock_ctx(self.dirname):
+                try:
+                    os.mkdir(location)
+                except FileExistsError:
+                    pass
+                else:
+                    with open(os.path.join(location, "__init__.py"), "w"):
+                        pass
+                    return location
+        return dlimport_workdir(self.dirname)
+
     def _update_mappings(self, key, key_data, name, check_in_keys):
         all_keys = key_data.keys
         if not all_keys:
@@ -1133,7 +1499,7 @@ class ModuleCache:
 
     def _add_to_cache(self, module, key, module_hash):
         """
-        This function expects the compile lock to be held.
+        This function expects the lock of the module to be held.
 
         """
         name = module.__file__
@@ -1161,6 +1527,15 @@ class ModuleCache:
             if not key_broken and self.check_for_broken_eq:
                 self.check_key(key, key_pkl)
             self.loaded_key_pkl.add(key_pkl)
+            self.module_hash_to_entry[module_hash] = name
+            with lock_ctx():
+                self._append_to_index(
+                    "add",
+                    module_hash,
+                    os.path.relpath(name, self.dirname),
+                    str(get_dir_size(location)),
+                    str(time.time()),
+                )
         elif config.cmodule__warn_no_version:
             key_flat = flatten(key)
             ops = [k for k in key_flat if isinstance(k, Op)]
@@ -1199,36 +1574,25 @@ class ModuleCache:
         if module is not None:
             return module
 
-        with lock_ctx():
-            # 1) Maybe somebody else compiled it for us while we
-            #    where waiting for the lock. Try to load it again.
-            # 2) If other repo that import PyTensor have PyTensor ops defined,
-            #    we need to refresh the cache here. Otherwise, there are import
-            #    order problems.
-            #    (Outdated) When device=gpu, we compile during PyTensor
-            #    import. This triggers the loading of the cache. But
-            #    unpickling the cache asks that the external Ops are
-            #    completely loaded, which isn't always the case!
-            #    If a module isn't completely loaded and its unpickling
-            #    fails, it means it is safe for this function
-            #    compilation to skip them, but not for future
-            #    compilations. So reloading the cache here
-            #    compilation fixes this problem. (we could do that only once)
-            self.refresh(cleanup=False)
-
-            module = self._get_from_key(key)
-            if module is not None:
-                return module
+        # Has another process compiled it since our last refresh?
+        module = self._get_from_disk(module_hash, key)
+        if module is not None:
+            return module
 
-            module = self._get_from_hash(module_hash, key)
+        # Only the processes compiling this very module wait for each other.
+        with module_lock_ctx(module_hash, self.dirname):
+            # Maybe somebody else compiled it for us while we where waiting
+            # for the lock. Try to load it again.
+            module = self._get_from_disk(module_hash, key)
             if module is not None:
                 return module
 
             hash_key = hash(key)
 
             nocleanup = False
+            location = self._new_module_dir(module_hash, key)
+            start_time = time.perf_counter()
             try:
-                location = dlimport_workdir(self.dirname)
                 module = lnk.compile_cmodule(location)
                 name = module.__file__
                 assert name.startswith(location)
@@ -1243,6 +1607,7 @@ class ModuleCache:
                     )
                 raise
             finally:
+                self.time_spent_compiling += time.perf_counter() - start_time
                 if not nocleanup:
                     _rmtree(
                         location,
@@ -1260,6 +1625,92 @@ class ModuleCache:
         self.stats[2] += 1
         return module
 
+    def compile_many(self, keys_and_linkers, n_workers):
+        """
+        Compile the modules of several linkers concurrently.
+
+        Keys that are already in the cache are skipped. The compiler
+        subprocesses for the other ones run on up to `n_workers` threads, each
+        in its own working directory. The resulting modules are then loaded
+        and added to the cache one at a time, as `ModuleCache.module_from_key`
+        would do, so later calls to it for those keys are cache hits.
+
+        Compilation failures are not raised here: the module is simply not
+        added, and the error is raised again, with more context, when
+        `ModuleCache.module_from_key` is called for that key.
+
+        Parameters
+        ----------
+        keys_and_linkers
+            Iterable of ``(key, lnk)`` pairs, as they would be passed to
+            `ModuleCache.module_from_key`. ``lnk`` must be a `CLinker`.
+        n_workers : int
+            Maximum number of compilations run at the same time.
+
+        """
+        pending = {}
+        for key, lnk in keys_and_linkers:
+            if self._get_from_key(key) is not None:
+                continue
+            module_hash = get_module_hash(lnk.get_src_code(), key)
+            if (
+                module_hash in pending
+                or self._get_from_hash(module_hash, key) is not None
+                or self._get_from_disk(module_hash, key) is not None
+            ):
+                continue
+            pending[module_hash] = (key, lnk)
+
+        if n_workers < 2 or len(pending) < 2:
+            # Nothing to gain, `module_from_key` will compile it when needed.
+            return
+
+        locations = {
+            module_hash: self._new_module_dir(module_hash, key)
+            for module_hash, (key, lnk) in pending.items()
+        }
+
+        start_time = time.perf_counter()
+        with ThreadPoolExecutor(
+            max_workers=min(n_workers, len(pending)),
+            thread_name_prefix="pytensor-compile",
+        ) as executor:
+            futures = {
+                module_hash: executor.submit(
+                    lnk.compile_cmodule, locations[module_hash], py_module=False
+                )
+                for module_hash, (key, lnk) in pending.items()
+            }
+        self.time_spent_compiling += time.perf_counter() - start_time
+
+        for module_hash, (key, lnk) in pending.items():
+            location = locations[module_hash]
+            try:
+                lib_filename = futures[module_hash].result()
+            except Exception as e:
+                _logger.debug(f"Failed to precompile module {key}: {e}")
+                lib_filename = None
+            with module_lock_ctx(module_hash, self.dirname):
+                # Somebody else may have compiled this module while we were
+                # compiling it.
+                if (
+                    lib_filename is None
+                    or self._get_from_disk(module_hash, key) is not None
+                ):
+                    _rmtree(
+                        location,
+                        ignore_if_missing=True,
+                        msg="unused concurrent compilation",
+                    )
+                    continue
+
+                module = dlimport(lib_filename)
+                assert module.__file__ not in self.module_from_name
+                self.module_from_name[module.__file__] = module
+                key_data = self._add_to_cache(module, key, module_hash)
+                self.module_hash_to_key_data[module_hash] = key_data
+                self.stats[2] += 1
+
     def check_key(self, key, key_pkl):
         """
         Perform checks to detect broken __eq__ / __hash__ implementations.
@@ -1350,6 +1801,12 @@ class ModuleCache:
         if age_thresh_del is None:
             age_thresh_del = self.age_thresh_del
 
+        if age_thresh_del > 0 and os.path.exists(self._index_path()):
+            # All the modules that may be too old are in the index, there is
+            # no need to walk the whole cache.
+            self._clear_old_from_index(age_thresh_del)
+            return
+
         # Ensure that the too_old_to_use list return by refresh() will
         # contain all modules older than age_thresh_del.
         if age_thresh_del < self.age_thresh_use:
@@ -1371,8 +1828,6 @@ class ModuleCache:
             # The clean up is done at init, no need to trigger it again
             cleanup=False,
         )
-        if not too_old_to_use:
-            return
         with lock_ctx():
             # Update the age of modules that have been accessed by other
             # processes and get all module that are too old to use
@@ -1385,7 +1840,7 @@ class ModuleCache:
                 # long-running jobs, or if age_thresh_del < 0.
                 assert entry not in self.module_from_name
                 parent = os.path.dirname(entry)
-                assert parent.startswith(os.path.join(self.dirname, "tmp"))
+                assert os.path.dirname(parent) == self.dirname
                 _rmtree(
                     parent,
                     msg="old cache directory",
@@ -1393,6 +1848,124 @@ class ModuleCache:
                     ignore_nocleanup=True,
                 )
 
+            if too_old_to_use:
+                self._write_index()
+            self._clear_stale_module_locks()
+
+    def _clear_old_from_index(self, age_thresh_del):
+        """
+        Delete the modules of the index that were not accessed in the last
+        `age_thresh_del` seconds.
+
+        """
+        time_now = time.time()
+        with lock_ctx():
+            index = self._read_index() or {}
+            for module_hash, index_entry in list(index.items()):
+                if index_entry.entry in self.module_from_name:
+                    continue
+                try:
+                    last_access = max(
+                        last_access_time(index_entry.entry),
+                        index_entry.last_access or 0,
+                    )
+                except OSError:
+                    # Already deleted, it is dropped from the index below.
+                    continue
+                if time_now - last_access > age_thresh_del:
+                    self._delete_indexed_module(module_hash, index, "old")
+
+            self._write_index(index)
+            self._clear_stale_module_locks()
+
+    def _delete_indexed_module(self, module_hash, index, reason):
+        """
+        Delete a module listed in the index from the disk, `index` and this
+        cache.
+
+        This function expects the compile lock to be held.
+
+        """
+        index_entry = index.pop(module_hash)
+        key_data = self.module_hash_to_key_data.pop(module_hash, None)
+        if key_data is not None:
+            key_data.delete_keys_from(self.entry_from_key)
+            self.loaded_key_pkl.discard(key_data.key_pkl)
+        self.module_hash_to_entry.pop(module_hash, None)
+        _rmtree(
+            os.path.dirname(index_entry.entry),
+            msg=f"{reason} cache directory",
+            level=logging.INFO,
+            ignore_nocleanup=True,
+        )
+
+    def _clear_stale_module_locks(self):
+        """
+        Delete the lock files of the modules that are no longer in the cache,
+        as created by `module_lock_ctx`.
+
+        This function expects the compile lock to be held.
+
+        """
+        try:
+            lock_files = os.listdir(os.path.join(self.dirname, "lock_dir"))
+        except FileNotFoundError:
+            return
+        for lock_file in lock_files:
+            module_hash, ext = os.path.splitext(lock_file)
+            if ext == ".lock" and not os.path.exists(self._module_dir(module_hash)):
+                remove_module_lock(module_hash, self.dirname)
+
+    def trim(self, max_size=None):
+        """
+        Delete the least recently used modules until the cache fits in
+        `max_size` bytes.
+
+        Only the shared modules listed in the index are considered, and the
+        modules loaded by this process are never deleted.
+
+        Parameters
+        ----------
+        max_size
+            Maximum size of the cache, in bytes. Defaults to the
+            ``cmodule__max_size`` flag (which is in megabytes). No module is
+            deleted if this is 0.
+
+        Returns
+        -------
+        int
+            The number of bytes that were reclaimed.
+
+        """
+        if max_size is None:
+            max_size = config.cmodule__max_size * 2**20
+        if max_size <= 0:
+            return 0
+
+        with lock_ctx():
+            index = self._read_index()
+            if index is None:
+                self.refresh()
+                index = self._read_index() or {}
+            # Drop the modules that are gone and fill in missing sizes.
+            self._write_index(index)
+
+            total_size = sum(index_entry.size for index_entry in index.values())
+            reclaimed = 0
+            lru_first = sorted(index.items(), key=lambda item: item[1].last_access or 0)
+            for module_hash, index_entry in lru_first:
+                if total_size - reclaimed <= max_size:
+                    break
+                if index_entry.entry in self.module_from_name:
+                    continue
+                reclaimed += index_entry.size
+                self._delete_indexed_module(module_hash, index, "least recently used")
+
+            if reclaimed:
+                self._write_index(index)
+            self._clear_stale_module_locks()
+        return reclaimed
+
     def clear(
         self, unversioned_min_age=None, clear_base_files=False, delete_if_problem=False
     ):
@@ -1421,8 +1994,8 @@ class ModuleCache:
 
     def clear_base_files(self):
         """
-        Remove base directories 'cutils_ext', 'lazylinker_ext' and
-        'scan_perform' if present.
+        Remove base directories 'cutils_ext', 'lazylinker_ext',
+        'scan_perform' and 'rewrite_cache' if present.
 
         Note that we do not delete them outright because it may not work on
         some systems due to these modules being currently in use. Instead we
@@ -1431,7 +2004,12 @@ class ModuleCache:
 
         """
         with lock_ctx():
-            for base_dir in ("cutils_ext", "lazylinker_ext", "scan_perform"):
+            for base_dir in (
+                "cutils_ext",
+                "lazylinker_ext",
+                "scan_perform",
+                "rewrite_cache",
+            ):
                 to_delete = os.path.join(self.dirname, base_dir + ".delete.me")
                 if os.path.isdir(to_delete):
                     try:
@@ -1511,7 +2089,7 @@ class ModuleCache:
         to_del = []
         time_now = time.perf_counter()
         for filename in os.listdir(self.dirname):
-            if filename.startswith("tmp"):
+            if filename.startswith("tmp") or re.fullmatch("m[0-9a-f]{64}", filename):
                 try:
                     fname = os.path.join(self.dirname, filename, "key.pkl")
                     with open(fname):
@@ -1568,6 +2146,8 @@ class ModuleCache:
         # take the lock when it happen.
         self.clear_old()
         self.clear_unversioned()
+        if config.cmodule__max_size:
+            self.trim()
         _logger.debug(f"Time spent checking keys: {self.time_spent_in_check_key}")
 
 
@@ -2499,7 +3079,8 @@ class GCC_compiler(Compiler):
         -------
         object
             Dynamically-imported python module of the compiled code (unless
-            py_module is False, in that case returns None).
+            py_module is False, in that case returns the path of the shared
+            library).
 
         """
         # TODO: Do not do the dlimport in this function
@@ -2643,6 +3224,7 @@ class GCC_compiler(Compiler):
                 pass
             assert os.path.isfile(lib_filename)
             return dlimport(lib_filename)
+        return lib_filename
 
 
 def icc_module_compile_str(*args):
@@ -13,10 +13,12 @@ try:
     from pytensor.link.c.lazylinker_c import CLazyLinker
 
     class CVM(CLazyLinker, VM):
-        def __init__(self, fgraph, *args, **kwargs):
+        def __init__(self, fgraph, nodes, thunks, pre_call_clear, *args, **kwargs):
             self.fgraph = fgraph
+            # The C code empties the cells of this same list at each call
+            self.pre_call_clear = pre_call_clear
             # skip VM.__init__
-            CLazyLinker.__init__(self, *args, **kwargs)
+            CLazyLinker.__init__(self, nodes, thunks, pre_call_clear, *args, **kwargs)
 
 except ImportError:
     pass
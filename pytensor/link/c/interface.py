@@ -244,6 +244,24 @@ class CLinkerOp(CLinkerObject):
         """
         return self.c_code_cache_version()
 
+    def c_code_release_gil(self, node: Apply) -> bool:
+        """Return ``True`` if the `Op` can release the GIL during its computation.
+
+        When this returns ``True`` and the PyTensor flag
+        ``cmodule__release_gil`` is enabled, the ``sub`` dictionary passed to
+        :meth:`CLinkerOp.c_code` maps ``"begin_nogil"`` and ``"end_nogil"`` to
+        ``Py_BEGIN_ALLOW_THREADS`` and ``Py_END_ALLOW_THREADS``.  Otherwise,
+        both entries are empty strings.
+
+        The `Op` can then wrap the compute section of its C code between
+        these two entries, so that other Python threads can run meanwhile.
+        The code in between must not use the Python C-API (including
+        ``sub["fail"]``), and it must not declare variables that are used
+        after it.
+
+        """
+        return False
+
     def c_code_cleanup(
         self,
         node: Apply,
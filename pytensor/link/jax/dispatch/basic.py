@@ -53,6 +53,8 @@ def jax_funcify_FunctionGraph(
         jax_funcify,
         type_conversion_fn=jax_typify,
         fgraph_name=fgraph_name,
+        lazy_ifelse=True,
+        cond_fn=jax.lax.cond,
         **kwargs,
     )
 
@@ -4,8 +4,8 @@ import warnings
 from contextlib import contextmanager
 from copy import copy
 from functools import singledispatch
-from textwrap import dedent
-from typing import Union
+from textwrap import dedent, indent
+from typing import Optional, Union
 
 import numba
 import numba.np.unsafe.ndarray as numba_ndarray
@@ -36,6 +36,7 @@ from pytensor.scalar.math import Softplus
 from pytensor.sparse import SparseTensorType
 from pytensor.tensor.blas import BatchedDot
 from pytensor.tensor.math import Dot
+from pytensor.tensor.random.type import RandomGeneratorType
 from pytensor.tensor.shape import Reshape, Shape, Shape_i, SpecifyShape
 from pytensor.tensor.slinalg import Solve
 from pytensor.tensor.subtensor import (
@@ -47,7 +48,7 @@ from pytensor.tensor.subtensor import (
     Subtensor,
 )
 from pytensor.tensor.type import TensorType
-from pytensor.tensor.type_other import MakeSlice, NoneConst
+from pytensor.tensor.type_other import MakeSlice, NoneConst, SliceType
 
 
 def global_numba_func(func):
@@ -115,6 +116,8 @@ def get_numba_type(
             return CSCMatrixType(numba_dtype)
 
         raise NotImplementedError()
+    elif isinstance(pytensor_type, RandomGeneratorType):
+        return numba.types.NumPyRandomGeneratorType("NumPyRandomGeneratorType")
     else:
         raise NotImplementedError(f"Numba type not implemented for {pytensor_type}")
 
@@ -450,6 +453,7 @@ def numba_funcify_FunctionGraph(
         numba_funcify,
         type_conversion_fn=numba_typify,
         fgraph_name=fgraph_name,
+        lazy_ifelse=True,
         **kwargs,
     )
 
@@ -631,6 +635,176 @@ def numba_funcify_AdvancedIncSubtensor1(op, node, **kwargs):
         return advancedincsubtensor1
 
 
+def create_advanced_index_func(node) -> Optional[str]:
+    """Create the source of a function that implements NumPy's advanced indexing with loops.
+
+    The slices are applied first, which gives a view of the indexed array with
+    the same dimensions. The integer index arrays, and the integer arrays of
+    the non-zero entries of the boolean ones, are broadcast together, and each
+    entry of their broadcast shape selects one entry, or sub-array, of the
+    view. Increments are accumulated in order, so duplicate indices are
+    added like `numpy.add.at`.
+
+    ``None`` is returned for the indices that are not supported, i.e. new
+    axes and boolean scalars.
+    """
+    set_or_inc = isinstance(node.op, AdvancedIncSubtensor)
+    x = node.inputs[0]
+    indices = node.inputs[2 if set_or_inc else 1 :]
+
+    # The indices of the view are `:` for the dimensions of the advanced indices
+    view_idx = []
+    # The advanced index arrays, with the dimension of the view they index
+    adv_arrays: list[tuple[str, int, int]] = []
+    checks = ""
+    for i, idx in enumerate(indices):
+        name = f"i{i}"
+        dim = len(view_idx)
+        if isinstance(idx.type, SliceType):
+            view_idx.append(name)
+        elif isinstance(idx.type, TensorType) and idx.type.dtype == "bool":
+            if idx.type.ndim == 0:
+                return None
+            checks += f"nz{i} = np.nonzero({name})\n"
+            for d in range(idx.type.ndim):
+                checks += f"""
+if {name}.shape[{d}] != v.shape[{dim + d}]:
+    raise IndexError("boolean index did not match indexed array")
+"""
+                adv_arrays.append((f"nz{i}[{d}]", 1, dim + d))
+                view_idx.append(":")
+        elif isinstance(idx.type, TensorType):
+            adv_arrays.append((f"np.asarray({name})", idx.type.ndim, dim))
+            view_idx.append(":")
+        else:
+            return None
+    if not adv_arrays or len(view_idx) > x.type.ndim:
+        return None
+    view_idx += [":"] * (x.type.ndim - len(view_idx))
+
+    # The dimensions of the broadcast index arrays are placed where the
+    # advanced indices are if they are adjacent, or first otherwise
+    adv_dims = [dim for _, _, dim in adv_arrays]
+    other_dims = [d for d in range(x.type.ndim) if d not in adv_dims]
+    bcast_ndim = max(ndim for _, ndim, _ in adv_arrays)
+    bcast_dims = [f"b{d}" for d in range(bcast_ndim)]
+    if adv_dims == list(range(adv_dims[0], adv_dims[-1] + 1)):
+        first = adv_dims[0]
+        out_shape = [
+            *(f"v.shape[{d}]" for d in other_dims[:first]),
+            *bcast_dims,
+            *(f"v.shape[{d}]" for d in other_dims[first:]),
+        ]
+        out_idx = [":"] * first + [f"j{d}" for d in range(bcast_ndim)]
+    else:
+        out_shape = [*bcast_dims, *(f"v.shape[{d}]" for d in other_dims)]
+        out_idx = [f"j{d}" for d in range(bcast_ndim)]
+    out_idx += [":"] * (len(out_shape) - len(out_idx))
+
+    def as_tuple(entries):
+        return f"({', '.join(entries)}{',' if len(entries) == 1 else ''})"
+
+    src = ""
+    if set_or_inc:
+        src += "z = x\n" if node.op.inplace else "z = np.copy(x)\n"
+    else:
+        src += "z = x\n"
+    if any(entry != ":" for entry in view_idx):
+        src += f"v = z[{', '.join(view_idx)}]\n"
+    else:
+        src += "v = z\n"
+    # Without accumulation, the increments are added to the original values
+    # and the last write of a duplicated index wins, like `x[idx] += y`
+    ignore_duplicates = (
+        set_or_inc and not node.op.set_instead_of_inc and node.op.ignore_duplicates
+    )
+    if ignore_duplicates:
+        if node.op.inplace:
+            src += "w = v.copy()\n"
+        elif any(entry != ":" for entry in view_idx):
+            src += f"w = x[{', '.join(view_idx)}]\n"
+        else:
+            src += "w = x\n"
+    src += checks
+
+    for i, (array, _, _) in enumerate(adv_arrays):
+        src += f"a{i} = {array}\n"
+    for d in range(bcast_ndim):
+        src += f"b{d} = 1\n"
+        for i, (_, ndim, _) in enumerate(adv_arrays):
+            if d < bcast_ndim - ndim:
+                continue
+            length = f"a{i}.shape[{d - (bcast_ndim - ndim)}]"
+            src += f"""
+if {length} != 1:
+    if b{d} != 1 and b{d} != {length}:
+        raise IndexError(
+            "shape mismatch: indexing arrays could not be broadcast together"
+        )
+    b{d} = {length}
+"""
+    for i in range(len(adv_arrays)):
+        src += f"a{i} = np.broadcast_to(a{i}, {as_tuple(bcast_dims)}).ravel()\n"
+
+    if set_or_inc:
+        src += f"y = np.broadcast_to(np.asarray(y), {as_tuple(out_shape)})\n"
+    else:
+        src += f"out = np.empty({as_tuple(out_shape)}, dtype=x.dtype)\n"
+
+    loop = "rem = k\n"
+    for d in reversed(range(bcast_ndim)):
+        loop += f"j{d} = rem % b{d}\nrem = rem // b{d}\n"
+    for i, (_, _, dim) in enumerate(adv_arrays):
+        loop += f"""
+p{i} = a{i}[k]
+if p{i} < 0:
+    p{i} += v.shape[{dim}]
+if p{i} < 0 or p{i} >= v.shape[{dim}]:
+    raise IndexError("index out of bounds")
+"""
+    # The slices have already been applied to the view
+    loop_view_idx = [":"] * x.type.ndim
+    for i, (_, _, dim) in enumerate(adv_arrays):
+        loop_view_idx[dim] = f"p{i}"
+    v_entry = f"v[{', '.join(loop_view_idx)}]"
+    out_entry = f"[{', '.join(out_idx)}]" if out_idx else "[()]"
+    if not set_or_inc:
+        loop += f"out{out_entry} = {v_entry}\n"
+    elif node.op.set_instead_of_inc:
+        loop += f"{v_entry} = y{out_entry}\n"
+    elif ignore_duplicates:
+        loop += f"{v_entry} = w{v_entry[1:]} + y{out_entry}\n"
+    else:
+        loop += f"{v_entry} += y{out_entry}\n"
+
+    src += f"for k in range(a0.shape[0]):\n{indent(loop, ' ' * 4)}"
+    src += "return z\n" if set_or_inc else "return out\n"
+
+    input_names = ["x", "y"] if set_or_inc else ["x"]
+    input_names += [f"i{i}" for i in range(len(indices))]
+    fn_name = "advancedincsubtensor" if set_or_inc else "advancedsubtensor"
+    return f"def {fn_name}({', '.join(input_names)}):\n{indent(src, ' ' * 4)}"
+
+
+@numba_funcify.register(AdvancedSubtensor)
+@numba_funcify.register(AdvancedIncSubtensor)
+def numba_funcify_AdvancedSubtensor(op, node, **kwargs):
+    advanced_index_src = create_advanced_index_func(node)
+    if advanced_index_src is None:
+        return generate_fallback_impl(op, node, **kwargs)
+
+    fn_name = (
+        "advancedincsubtensor"
+        if isinstance(op, AdvancedIncSubtensor)
+        else "advancedsubtensor"
+    )
+    advanced_index_fn = compile_function_src(
+        advanced_index_src, fn_name, {**globals(), "np": np}
+    )
+
+    return numba_njit(advanced_index_fn)
+
+
 def deepcopyop(x):
     return copy(x)
 
@@ -654,8 +828,24 @@ def makeslice(*x):
 
 
 @numba_funcify.register(MakeSlice)
-def numba_funcify_MakeSlice(op, **kwargs):
-    return global_numba_func(makeslice)
+def numba_funcify_MakeSlice(op, node=None, **kwargs):
+    if node is None or not any(isinstance(inp.type, TensorType) for inp in node.inputs):
+        return global_numba_func(makeslice)
+
+    # The 0-d arrays of the slice bounds must be converted to scalars
+    args = [f"x{i}" for i in range(len(node.inputs))]
+    slice_args = [
+        f"to_scalar({arg})" if isinstance(inp.type, TensorType) else arg
+        for arg, inp in zip(args, node.inputs)
+    ]
+    makeslice_src = f"""
+def makeslice({", ".join(args)}):
+    return slice({", ".join(slice_args)})
+"""
+    makeslice_fn = compile_function_src(
+        makeslice_src, "makeslice", {"to_scalar": to_scalar}
+    )
+    return numba_njit(makeslice_fn)
 
 
 @numba_njit
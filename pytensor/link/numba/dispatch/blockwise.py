@@ -0,0 +1,143 @@
+from textwrap import indent
+
+import numba
+import numpy as np
+
+from pytensor import config
+from pytensor.link.numba.dispatch import basic as numba_basic
+from pytensor.link.numba.dispatch.basic import numba_funcify
+from pytensor.link.utils import compile_function_src
+from pytensor.tensor.blockwise import Blockwise
+
+
+def _core_output_shape(op, node, core_node, out_idx):
+    """Return the source of the core shape of an output, or ``None`` if it depends on the values.
+
+    The lengths of the core dimensions are either static or the ones of the
+    dimensions of an input with the same name in the signature.
+    """
+    batch_ndim = op.batch_ndim(node)
+    core_shape = []
+    for d, dim in enumerate(op.outputs_sig[out_idx]):
+        static_length = core_node.outputs[out_idx].type.shape[d]
+        if static_length is not None:
+            core_shape.append(str(static_length))
+            continue
+        for i, inp_sig in enumerate(op.inputs_sig):
+            if dim in inp_sig:
+                core_shape.append(f"i{i}.shape[{batch_ndim + inp_sig.index(dim)}]")
+                break
+        else:
+            return None
+    return f"({', '.join(core_shape)}{',' if len(core_shape) == 1 else ''})"
+
+
+@numba_funcify.register(Blockwise)
+def numba_funcify_Blockwise(op: Blockwise, node, **kwargs):
+    """Loop over the batch dimensions and call the Numba function of the core `Op`.
+
+    The iterations of the loop are distributed over threads with
+    `numba.prange` when the Numba vectorize target is ``"parallel"``.
+    """
+    batch_ndim = op.batch_ndim(node)
+    nin = len(node.inputs)
+    nout = len(node.outputs)
+
+    core_node = op._create_dummy_core_node(node.inputs)
+    core_op_fn = numba_funcify(op.core_op, node=core_node, parent_node=node, **kwargs)
+
+    input_names = [f"i{i}" for i in range(nin)]
+    output_names = [f"o{i}" for i in range(nout)]
+    result_names = [f"r{i}" for i in range(nout)]
+
+    # The length of each batch dimension is the one of the inputs that are not
+    # broadcastable in it, which must all be equal
+    src = ""
+    for d in range(batch_ndim):
+        non_bcast = [
+            name
+            for name, inp in zip(input_names, node.inputs)
+            if not inp.type.broadcastable[d]
+        ]
+        if not non_bcast:
+            src += f"n{d} = 1\n"
+            continue
+        src += f"n{d} = {non_bcast[0]}.shape[{d}]\n"
+        for name in non_bcast[1:]:
+            src += f"""
+if {name}.shape[{d}] != n{d}:
+    raise ValueError("Blockwise inputs have incompatible batch dimensions")
+"""
+    batch_shape = "".join(f"n{d}, " for d in range(batch_ndim))
+    src += f"size = 1{''.join(f' * n{d}' for d in range(batch_ndim))}\n"
+
+    def core_call(batch_idx):
+        core_inputs = []
+        for name, inp in zip(input_names, node.inputs):
+            idx = [
+                "0" if bcast else j
+                for bcast, j in zip(inp.type.broadcastable, batch_idx)
+            ]
+            # Numba does not index arrays with a single Ellipsis
+            core_inputs.append(f"{name}[{', '.join([*idx, '...'])}]" if idx else name)
+        return f"{', '.join(result_names)} = core_op_fn({', '.join(core_inputs)})\n"
+
+    def store_results(batch_idx):
+        idx = ", ".join([*batch_idx, "..."])
+        return "".join(
+            f"{out}[{idx}] = {res}\n" for out, res in zip(output_names, result_names)
+        )
+
+    core_shapes = [_core_output_shape(op, node, core_node, i) for i in range(nout)]
+    if all(core_shape is not None for core_shape in core_shapes):
+        for out, core_shape in zip(output_names, core_shapes):
+            src += (
+                f"{out} = np.empty(({batch_shape}) + {core_shape}, dtype={out}_dtype)\n"
+            )
+        src += "start = 0\n"
+    else:
+        # The shapes of the outputs are given by the first evaluation of the core Op
+        first_idx = ["0"] * batch_ndim
+        src += """
+if size == 0:
+    raise ValueError("The core output shapes are unknown for empty batch dimensions")
+"""
+        src += core_call(first_idx)
+        for out, res, core_out in zip(output_names, result_names, core_node.outputs):
+            core_shape = f"{res}.shape" if core_out.type.ndim else "()"
+            src += (
+                f"{out} = np.empty(({batch_shape}) + {core_shape}, dtype={out}_dtype)\n"
+            )
+        src += store_results(first_idx)
+        src += "start = 1\n"
+
+    batch_idx = [f"j{d}" for d in range(batch_ndim)]
+    loop_src = "rem = k\n"
+    for d in reversed(range(batch_ndim)):
+        loop_src += f"j{d} = rem % n{d}\nrem = rem // n{d}\n"
+    loop_src += core_call(batch_idx)
+    loop_src += store_results(batch_idx)
+    src += f"for k in prange(start, size):\n{indent(loop_src, ' ' * 4)}"
+    if nout == 1:
+        src += f"return {output_names[0]}\n"
+    else:
+        src += f"return ({', '.join(output_names)})\n"
+
+    blockwise_src = f"def blockwise({', '.join(input_names)}):\n{indent(src, ' ' * 4)}"
+
+    global_env = {
+        "np": np,
+        "prange": numba.prange,
+        "core_op_fn": core_op_fn,
+        **{
+            f"{out}_dtype": core_out.type.numpy_dtype
+            for out, core_out in zip(output_names, node.outputs)
+        },
+    }
+    blockwise_fn = compile_function_src(blockwise_src, "blockwise", global_env)
+
+    target = (
+        getattr(node.tag, "numba__vectorize_target", None)
+        or config.numba__vectorize_target
+    )
+    return numba_basic.numba_njit(blockwise_fn, parallel=target == "parallel")
@@ -1,25 +1,33 @@
+from copy import deepcopy
+from functools import singledispatch
 from textwrap import dedent, indent
 from typing import Any, Callable, Optional
 
+import numba
 import numba.np.unsafe.ndarray as numba_ndarray
 import numpy as np
 from numba import _helperlib, types
 from numba.core import cgutils
 from numba.extending import NativeValue, box, models, register_model, typeof_impl, unbox
-from numpy.random import RandomState
+from numpy.random import Generator, RandomState
 
 import pytensor.tensor.random.basic as ptr
 from pytensor.graph.basic import Apply
 from pytensor.graph.op import Op
 from pytensor.link.numba.dispatch import basic as numba_basic
-from pytensor.link.numba.dispatch.basic import numba_funcify, numba_typify
+from pytensor.link.numba.dispatch.basic import (
+    generate_fallback_impl,
+    get_numba_type,
+    numba_funcify,
+    numba_typify,
+)
 from pytensor.link.utils import (
     compile_function_src,
     get_name_for_object,
     unique_name_generator,
 )
 from pytensor.tensor.basic import get_vector_length
-from pytensor.tensor.random.type import RandomStateType
+from pytensor.tensor.random.type import RandomGeneratorType
 
 
 class RandomStateNumbaType(types.Type):
@@ -89,14 +97,148 @@ def numba_typify_RandomState(state, **kwargs):
     return state
 
 
+@numba_typify.register(Generator)
+def numba_typify_Generator(rng, **kwargs):
+    # Numba draws from the bit generator of the `Generator` object itself, so
+    # the state of the `Generator` in the storage is updated in place
+    return rng
+
+
+@singledispatch
+def numba_generator_sample(op, rng: str, *params: str) -> str:
+    """Return the source of an expression that draws one sample of `op`.
+
+    The expression uses the methods of the NumPy `Generator` named `rng`
+    supported by Numba, and the scalar parameters named `params`.
+    """
+    raise NotImplementedError(
+        f"No Numba implementation for {op.name} with NumPy `Generator`s"
+    )
+
+
+@numba_generator_sample.register(ptr.UniformRV)
+@numba_generator_sample.register(ptr.TriangularRV)
+@numba_generator_sample.register(ptr.BetaRV)
+@numba_generator_sample.register(ptr.NormalRV)
+@numba_generator_sample.register(ptr.LogNormalRV)
+@numba_generator_sample.register(ptr.GammaRV)
+@numba_generator_sample.register(ptr.ExponentialRV)
+@numba_generator_sample.register(ptr.WeibullRV)
+@numba_generator_sample.register(ptr.LogisticRV)
+@numba_generator_sample.register(ptr.PoissonRV)
+@numba_generator_sample.register(ptr.GeometricRV)
+@numba_generator_sample.register(ptr.WaldRV)
+@numba_generator_sample.register(ptr.LaplaceRV)
+@numba_generator_sample.register(ptr.BinomialRV)
+@numba_generator_sample.register(ptr.IntegersRV)
+def numba_generator_sample_aligned(op, rng, *params):
+    return f"{rng}.{op.name}({', '.join(params)})"
+
+
+@numba_generator_sample.register(ptr.NegBinomialRV)
+def numba_generator_sample_NegBinomialRV(op, rng, n, p):
+    return f"{rng}.negative_binomial({n}, {p})"
+
+
+@numba_generator_sample.register(ptr.BernoulliRV)
+def numba_generator_sample_BernoulliRV(op, rng, p):
+    return f"{rng}.binomial(1, {p})"
+
+
+@numba_generator_sample.register(ptr.CauchyRV)
+def numba_generator_sample_CauchyRV(op, rng, loc, scale):
+    return f"{loc} + {scale} * {rng}.standard_cauchy()"
+
+
+@numba_generator_sample.register(ptr.HalfCauchyRV)
+def numba_generator_sample_HalfCauchyRV(op, rng, loc, scale):
+    return f"{loc} + {scale} * abs({rng}.standard_cauchy())"
+
+
+@numba_generator_sample.register(ptr.HalfNormalRV)
+def numba_generator_sample_HalfNormalRV(op, rng, loc, scale):
+    return f"{loc} + {scale} * abs({rng}.standard_normal())"
+
+
+@numba_generator_sample.register(ptr.StudentTRV)
+def numba_generator_sample_StudentTRV(op, rng, df, loc, scale):
+    return f"{loc} + {scale} * {rng}.standard_t({df})"
+
+
+generator_numba_type = get_numba_type(RandomGeneratorType())
+
+
+@numba_basic.numba_njit
+def copy_generator(rng):
+    with numba.objmode(new_rng=generator_numba_type):
+        new_rng = deepcopy(rng)
+    return new_rng
+
+
+def make_numba_generator_fn(op, node):
+    """Create a Numba implementation of a `RandomVariable` for NumPy `Generator`s.
+
+    The samples are drawn one at a time by the expressions returned by
+    `numba_generator_sample`, which advance the state of the `Generator`
+    in place. The `Generator` is copied first when `op` is not in-place.
+    The distributions without such an expression, or that are not scalar,
+    are sampled by `Op.perform` in object mode.
+    """
+    if op.ndim_supp > 0:
+        return generate_fallback_impl(op, node)
+
+    param_names = [f"p{i}" for i in range(len(node.inputs) - 3)]
+    try:
+        sample_src = numba_generator_sample(
+            op, "rng", *(f"{p}[idx]" for p in param_names)
+        )
+    except NotImplementedError:
+        return generate_fallback_impl(op, node)
+
+    tuple_size = int(get_vector_length(node.inputs[1]))
+    if tuple_size > 0:
+        shape_src = "shape = to_fixed_tuple(size, tuple_size)"
+    elif param_names:
+        param_shapes = ", ".join(f"np.shape({p})" for p in param_names)
+        shape_src = f"shape = np.broadcast_shapes({param_shapes})"
+    else:
+        shape_src = "shape = ()"
+
+    body_src = shape_src + "\n"
+    body_src += "".join(f"{p} = np.broadcast_to({p}, shape)\n" for p in param_names)
+    if not op.inplace:
+        body_src = "rng = copy_generator(rng)\n" + body_src
+
+    generator_fn_src = f"""
+def generator_random_variable(rng, size, dtype, {", ".join(param_names)}):
+{indent(body_src, " " * 4)}
+    data = np.empty(shape, dtype=out_dtype)
+    for idx in np.ndindex(shape):
+        data[idx] = {sample_src}
+    return (rng, data)
+    """
+    generator_fn = compile_function_src(
+        generator_fn_src,
+        "generator_random_variable",
+        {
+            "np": np,
+            "to_fixed_tuple": numba_ndarray.to_fixed_tuple,
+            "tuple_size": tuple_size,
+            "copy_generator": copy_generator,
+            "out_dtype": node.outputs[1].type.numpy_dtype,
+        },
+    )
+    return numba_basic.numba_njit(generator_fn)
+
+
 def make_numba_random_fn(node, np_random_func):
     """Create Numba implementations for existing Numba-supported ``np.random`` functions.
 
     The functions generated here add parameter broadcasting and the ``size``
     argument to the Numba-supported scalar ``np.random`` functions.
     """
-    if not isinstance(node.inputs[0].type, RandomStateType):
-        raise TypeError("Numba does not support NumPy `Generator`s")
+    if isinstance(node.inputs[0].type, RandomGeneratorType):
+        return make_numba_generator_fn(node.op, node)
 
     tuple_size = int(get_vector_length(node.inputs[1]))
     size_dims = tuple_size - max(i.ndim for i in node.inputs[3:])
@@ -218,6 +360,16 @@ def numba_funcify_RandomVariable(op, node, **kwargs):
     return make_numba_random_fn(node, np_random_func)
 
 
+@numba_funcify.register(ptr.HalfCauchyRV)
+@numba_funcify.register(ptr.StudentTRV)
+@numba_funcify.register(ptr.IntegersRV)
+def numba_funcify_GeneratorRandomVariable(op, node, **kwargs):
+    """Sample the distributions that Numba only supports with NumPy `Generator`s."""
+    if isinstance(node.inputs[0].type, RandomGeneratorType):
+        return make_numba_generator_fn(op, node)
+    return generate_fallback_impl(op, node, **kwargs)
+
+
 def create_numba_random_fn(
     op: Op,
     node: Apply,
@@ -301,6 +453,9 @@ def numba_funcify_BernoulliRV(op, node, **kwargs):
 
 @numba_funcify.register(ptr.CategoricalRV)
 def numba_funcify_CategoricalRV(op, node, **kwargs):
+    if isinstance(node.inputs[0].type, RandomGeneratorType):
+        return make_numba_generator_fn(op, node)
+
     out_dtype = node.outputs[1].type.numpy_dtype
     size_len = int(get_vector_length(node.inputs[1]))
     p_ndim = node.inputs[-1].ndim
@@ -330,6 +485,9 @@ def numba_funcify_CategoricalRV(op, node, **kwargs):
 
 @numba_funcify.register(ptr.DirichletRV)
 def numba_funcify_DirichletRV(op, node, **kwargs):
+    if isinstance(node.inputs[0].type, RandomGeneratorType):
+        return make_numba_generator_fn(op, node)
+
     out_dtype = node.outputs[1].type.numpy_dtype
     alphas_ndim = node.inputs[3].type.ndim
     neg_ind_shape_len = -alphas_ndim + 1
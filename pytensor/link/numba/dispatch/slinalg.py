@@ -310,9 +310,13 @@ def numba_funcify_SolveTriangular(op, node, **kwargs):
 
 
 def _cholesky(a, lower=False, overwrite_a=False, check_finite=True):
-    return linalg.cholesky(
-        a, lower=lower, overwrite_a=overwrite_a, check_finite=check_finite
-    )
+    try:
+        res = linalg.cholesky(
+            a, lower=lower, overwrite_a=overwrite_a, check_finite=check_finite
+        )
+    except linalg.LinAlgError:
+        return np.full_like(a, np.nan), 1
+    return res, 0
 
 
 @overload(_cholesky)
@@ -378,6 +382,11 @@ def numba_funcify_Cholesky(op, node, **kwargs):
                     "Non-numeric values (nan or inf) found in input to cholesky"
                 )
         res, info = _cholesky(a, lower, overwrite_a, check_finite)
+        # POTRF does not set the other triangle to zero
+        if lower:
+            res = np.tril(res)
+        else:
+            res = np.triu(res)
 
         if on_error == "raise":
             if info > 0:
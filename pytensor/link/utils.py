@@ -662,6 +662,83 @@ def unique_name_generator(
     return unique_name
 
 
+def ifelse_branch_contexts(
+    fgraph: FunctionGraph, order: list[Apply]
+) -> dict[Apply, Optional[tuple[Apply, bool]]]:
+    """Find the nodes that only need to be computed by one branch of an `IfElse`.
+
+    The context of a node is either ``None``, when it must always be computed,
+    or a tuple with an `IfElse` node and ``True`` or ``False`` for the branch
+    of that node in which it is computed. The context of a node is the
+    innermost context that contains all the uses of its outputs.
+
+    The nodes that read the memory of a variable destroyed by another node,
+    directly or through a view, and the nodes that destroy memory read by
+    other nodes, are always computed, because moving them in a branch could
+    change the order of these operations.
+    """
+    from pytensor.ifelse import IfElse
+
+    # Map each view to the variable that owns its memory. The outputs of the
+    # nodes that destroy a variable only exist after the destruction, so their
+    # memory is considered new.
+    memory_owner: dict[Variable, Variable] = {}
+    destroyed = set()
+    for node in order:
+        for out_idx, idxs in getattr(node.op, "view_map", {}).items():
+            inp = node.inputs[idxs[0]]
+            memory_owner[node.outputs[out_idx]] = memory_owner.get(inp, inp)
+        for idxs in getattr(node.op, "destroy_map", {}).values():
+            destroyed.update(
+                memory_owner.get(node.inputs[i], node.inputs[i]) for i in idxs
+            )
+
+    readers: dict[Variable, set[Apply]] = defaultdict(set)
+    for node in order:
+        for inp in node.inputs:
+            owner = memory_owner.get(inp, inp)
+            if owner in destroyed:
+                readers[owner].add(node)
+    always_computed = set()
+    for nodes in readers.values():
+        if len(nodes) > 1:
+            always_computed.update(nodes)
+
+    contexts: dict[Apply, Optional[tuple[Apply, bool]]] = {}
+
+    def ancestry(context):
+        chain = [context]
+        while context is not None:
+            context = contexts[context[0]]
+            chain.append(context)
+        return chain
+
+    for node in reversed(order):
+        if node in always_computed:
+            contexts[node] = None
+            continue
+
+        common = None
+        first = True
+        for out in node.outputs:
+            for client, idx in fgraph.clients[out]:
+                if client == "output":
+                    context = None
+                elif isinstance(client.op, IfElse) and idx > 0:
+                    context = (client, idx <= client.op.n_outs)
+                else:
+                    context = contexts[client]
+                if first:
+                    common = ancestry(context)
+                    first = False
+                else:
+                    chain = ancestry(context)
+                    common = [c for c in common if c in chain]
+        contexts[node] = common[0] if common else None
+
+    return contexts
+
+
 def fgraph_to_python(
     fgraph: FunctionGraph,
     op_conversion_fn: Callable,
@@ -674,6 +751,8 @@ def fgraph_to_python(
     local_env: Optional[dict[Any, Any]] = None,
     get_name_for_object: Callable[[Any], str] = get_name_for_object,
     squeeze_output: bool = False,
+    lazy_ifelse: bool = False,
+    cond_fn: Optional[Callable] = None,
     **kwargs,
 ) -> Callable:
     """Convert a `FunctionGraph` into a regular Python function.
@@ -708,6 +787,16 @@ def fgraph_to_python(
     squeeze_output
         If the `FunctionGraph` has only one output and this option is
         ``True``, return the single output instead of a tuple with the output.
+    lazy_ifelse
+        If ``True``, the nodes that are only needed by one branch of an
+        `IfElse` are only computed when that branch is taken. The `IfElse`
+        nodes are converted to ``if`` statements instead of calls of the
+        functions returned by `op_conversion_fn`.
+    cond_fn
+        A function used instead of an ``if`` statement for the `IfElse` nodes
+        when `lazy_ifelse` is ``True``, e.g. ``jax.lax.cond``. It is called
+        with the condition and two functions without arguments that compute
+        the branches and return a tuple with their outputs.
     **kwargs
         The remaining keywords are passed to `python_conversion_fn`
     """
@@ -723,16 +812,20 @@ def fgraph_to_python(
     if global_env is None:
         global_env = {}
 
-    body_assigns = []
-    for node in order:
-        compiled_func = op_conversion_fn(
-            node.op, node=node, storage_map=storage_map, **kwargs
-        )
+    if lazy_ifelse:
+        from pytensor.ifelse import IfElse
 
-        # Create a local alias with a unique name
-        local_compiled_func_name = unique_name(compiled_func)
-        global_env[local_compiled_func_name] = compiled_func
+        contexts = ifelse_branch_contexts(fgraph, order)
+    else:
+        contexts = {}
+    # The source of the nodes computed in each context
+    context_assigns: dict[Optional[tuple[Apply, bool]], list[str]] = defaultdict(list)
+    cond_fn_name = None
+    if cond_fn is not None:
+        cond_fn_name = unique_name(cond_fn)
+        global_env[cond_fn_name] = cond_fn
 
+    for node in order:
         node_input_names = []
         for i in node.inputs:
             local_input_name = unique_name(i)
@@ -749,11 +842,33 @@ def fgraph_to_python(
             node_input_names.append(local_input_name)
 
         node_output_names = [unique_name(v) for v in node.outputs]
-
-        assign_str = f"{', '.join(node_output_names)} = {local_compiled_func_name}({', '.join(node_input_names)})"
         assign_comment_str = f"{indent(str(node), '# ')}"
+
+        if lazy_ifelse and isinstance(node.op, IfElse):
+            assign_str = _lazy_ifelse_src(
+                node,
+                node_input_names,
+                node_output_names,
+                context_assigns.pop((node, True), []),
+                context_assigns.pop((node, False), []),
+                unique_name,
+                cond_fn_name,
+            )
+        else:
+            compiled_func = op_conversion_fn(
+                node.op, node=node, storage_map=storage_map, **kwargs
+            )
+
+            # Create a local alias with a unique name
+            local_compiled_func_name = unique_name(compiled_func)
+            global_env[local_compiled_func_name] = compiled_func
+
+            assign_str = f"{', '.join(node_output_names)} = {local_compiled_func_name}({', '.join(node_input_names)})"
+
         assign_block_str = f"{assign_comment_str}\n{assign_str}"
-        body_assigns.append(assign_block_str)
+        context_assigns[contexts.get(node)].append(assign_block_str)
+
+    body_assigns = context_assigns[None]
 
     # Handle `Constant`-only outputs (these don't have associated `Apply`
     # nodes, so the above isn't applicable)
@@ -800,6 +915,43 @@ def fgraph_to_python(
     return fgraph_def
 
 
+def _lazy_ifelse_src(
+    node: Apply,
+    input_names: list[str],
+    output_names: list[str],
+    true_assigns: list[str],
+    false_assigns: list[str],
+    unique_name: Callable,
+    cond_fn_name: Optional[str],
+) -> str:
+    """Create the source that evaluates an `IfElse` node and only one of its branches."""
+    n_outs = len(output_names)
+    cond_name = input_names[0]
+    outputs_src = f"{', '.join(output_names)},"
+
+    branches_src = []
+    for assigns, branch_outputs in (
+        (true_assigns, input_names[1 : n_outs + 1]),
+        (false_assigns, input_names[n_outs + 1 :]),
+    ):
+        branch_src = "\n".join(assigns)
+        if cond_fn_name is not None:
+            branch_src += f"\nreturn ({', '.join(branch_outputs)},)"
+        else:
+            branch_src += f"\n{outputs_src} = {', '.join(branch_outputs)},"
+        branches_src.append(indent(branch_src.strip(), " " * 4))
+
+    if cond_fn_name is not None:
+        true_name = unique_name(node.op, force_unique=True)
+        false_name = unique_name(node.op, force_unique=True)
+        return (
+            f"def {true_name}():\n{branches_src[0]}\n"
+            f"def {false_name}():\n{branches_src[1]}\n"
+            f"{outputs_src} = {cond_fn_name}({cond_name}, {true_name}, {false_name})"
+        )
+    return f"if {cond_name}:\n{branches_src[0]}\nelse:\n{branches_src[1]}"
+
+
 def get_destroy_dependencies(fgraph: FunctionGraph) -> dict[Apply, list[Variable]]:
     """Construct a ``dict`` of nodes to variables that are implicit dependencies induced by `Op.destroy_map` and `Op.view_map`
 
@@ -6,20 +6,30 @@ VM was a better name at some point.
 
 """
 
+import math
+import os
 import platform
 import sys
+import threading
 import time
 import warnings
 from abc import ABC, abstractmethod
 from collections import defaultdict
 from collections.abc import Sequence
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from itertools import zip_longest
 from typing import TYPE_CHECKING, Any, Optional
 
+import numpy as np
+
 from pytensor.configdefaults import config
 from pytensor.graph.basic import Apply, Constant, Variable
+from pytensor.graph.fg import FunctionGraph
+from pytensor.graph.schedule import MemoryScheduler, _alias_roots, memory_schedule
 from pytensor.link.basic import Container, LocalLinker
+from pytensor.link.c.basic import CLinker, get_module_cache
 from pytensor.link.c.exceptions import MissingGXX
+from pytensor.link.c.op import COp
 from pytensor.link.utils import (
     gc_helper,
     get_destroy_dependencies,
@@ -29,7 +39,6 @@ from pytensor.link.utils import (
 
 
 if TYPE_CHECKING:
-    from pytensor.graph.fg import FunctionGraph
     from pytensor.graph.op import (
         BasicThunkType,
         ComputeMapType,
@@ -159,6 +168,134 @@ def calculate_reallocate_info(
     return reallocated_info
 
 
+def calculate_arena_intervals(
+    order: Sequence[Apply], fgraph: "FunctionGraph"
+) -> dict[Variable, tuple[int, int]]:
+    """Compute the liveness intervals of the results that can be stored in an arena.
+
+    Only the `TensorType` outputs of the nodes that own their memory (i.e. that
+    are not views of, and do not destroy, an input) are considered, except the
+    ones whose memory is returned in the outputs of `fgraph`.
+
+    Returns
+    -------
+    A map from each such variable to the indices in `order` of the node that
+    computes it and of the last node that uses its memory, through the
+    variable itself or through the views and destroyers of its memory.
+
+    """
+    from pytensor.tensor.type import TensorType
+
+    root_of = _alias_roots(order)
+    kept = {root_of.get(out, out) for out in fgraph.outputs}
+    # The roots of the outputs that view or destroy several inputs are
+    # not tracked by `root_of`.
+    for node in order:
+        for aliased in (*node.op.view_map.values(), *node.op.destroy_map.values()):
+            if len(aliased) > 1:
+                kept.update(
+                    root_of.get(node.inputs[i], node.inputs[i]) for i in aliased
+                )
+
+    intervals = {}
+    for idx, node in enumerate(order):
+        for out in node.outputs:
+            if (
+                root_of[out] is out
+                and out not in kept
+                and isinstance(out.type, TensorType)
+            ):
+                intervals[out] = (idx, idx)
+        for inp in node.inputs:
+            root = root_of.get(inp, inp)
+            if root in intervals:
+                intervals[root] = (intervals[root][0], idx)
+    return intervals
+
+
+def plan_arena(
+    intervals: dict[Variable, tuple[int, int]],
+    nbytes: dict[Variable, int],
+    alignment: int = 64,
+) -> tuple[dict[Variable, int], int]:
+    """Assign an offset in an arena to the variables of `nbytes`.
+
+    The variables are allocated in the order of the start of their liveness
+    interval in `intervals`, at the first offset where there is enough free
+    space, and their space is released after the end of their interval, so
+    that variables that are not alive at the same time share the same memory.
+
+    Returns
+    -------
+    The offset of each variable, which is a multiple of `alignment`, and the
+    size of the arena.
+
+    """
+    starting = defaultdict(list)
+    ending = defaultdict(list)
+    for var in nbytes:
+        start, end = intervals[var]
+        starting[start].append(var)
+        ending[end].append(var)
+
+    offsets = {}
+    size = 0
+    # The sorted and coalesced ``[offset, length]`` blocks that are free
+    free: list[list[int]] = []
+    for step in sorted(starting.keys() | ending.keys()):
+        # The variables computed at `step` cannot share the memory of the ones
+        # used at `step`, so they are allocated before the latter are released.
+        for var in sorted(starting[step], key=lambda v: -nbytes[v]):
+            length = -(-nbytes[var] // alignment) * alignment
+            for i, block in enumerate(free):
+                if block[1] >= length:
+                    offsets[var] = block[0]
+                    block[0] += length
+                    block[1] -= length
+                    if block[1] == 0:
+                        del free[i]
+                    break
+            else:
+                if free and sum(free[-1]) == size:
+                    # Extend the free block at the end of the arena
+                    offsets[var] = free.pop()[0]
+                else:
+                    offsets[var] = size
+                size = offsets[var] + length
+        for var in ending[step]:
+            offset = offsets[var]
+            length = -(-nbytes[var] // alignment) * alignment
+            i = 0
+            while i < len(free) and free[i][0] < offset:
+                i += 1
+            free.insert(i, [offset, length])
+            if i + 1 < len(free) and offset + length == free[i + 1][0]:
+                free[i][1] += free.pop(i + 1)[1]
+            if i > 0 and sum(free[i - 1]) == offset:
+                free[i - 1][1] += free.pop(i)[1]
+    return offsets, size
+
+
+class EvaluationCancelled(Exception):
+    """Raised by a `VM` whose evaluation was cancelled with a `CancellationEvent`."""
+
+
+class CancellationEvent(threading.Event):
+    """An event that cancels the evaluation of a `VM` when it is set.
+
+    When it is the `VM.cancel_event` of a `VM`, `CancellationEvent.check` is
+    called before each thunk is run, so that the evaluation stops with an
+    `EvaluationCancelled` exception once the event is set, e.g. by another
+    thread. A thunk that is already running is not interrupted.
+
+    """
+
+    def check(self):
+        """Raise `EvaluationCancelled` if the event is set."""
+        if self.is_set():
+            raise EvaluationCancelled("The evaluation of the graph was cancelled")
+
+
 class VM(ABC):
     r"""An abstract class for evaluating PyTensor programs.
 
@@ -183,6 +320,8 @@ class VM(ABC):
         List of floats, one for each thunk. ``call_times[i]`` is the amount of
         runtime spent on ``thunks[i]`` in the course of computations performed
         by `call_with_timers`.
+    cancel_event
+        A `CancellationEvent` checked before each thunk is run, or ``None``.
 
     need_update_inputs : bool
         ``True`` indicates that `Function.__call__` must implement the feedback
@@ -192,6 +331,7 @@ class VM(ABC):
     """
 
     need_update_inputs = True
+    cancel_event: Optional[CancellationEvent] = None
 
     def __init__(
         self,
@@ -379,6 +519,7 @@ class Loop(UpdatingVM):
             self.post_thunk_clear = []
 
     def __call__(self):
+        cancel_event = self.cancel_event
         if self.time_thunks:
             for cont in self.pre_call_clear:
                 cont[0] = None
@@ -387,6 +528,8 @@ class Loop(UpdatingVM):
                 for thunk, node, old_storage in zip_longest(
                     self.thunks, self.nodes, self.post_thunk_clear, fillvalue=()
                 ):
+                    if cancel_event is not None:
+                        cancel_event.check()
                     t0 = time.perf_counter()
                     thunk()
                     t1 = time.perf_counter()
@@ -404,6 +547,8 @@ class Loop(UpdatingVM):
                 for thunk, node, old_storage in zip_longest(
                     self.thunks, self.nodes, self.post_thunk_clear, fillvalue=()
                 ):
+                    if cancel_event is not None:
+                        cancel_event.check()
                     thunk()
                     for old_s in old_storage:
                         old_s[0] = None
@@ -413,6 +558,149 @@ class Loop(UpdatingVM):
         return self.perform_updates()
 
 
+class ArenaLoop(Loop):
+    """A `Loop` that stores the intermediate results in a persistent arena.
+
+    Each intermediate result planned by `calculate_arena_intervals` is given
+    an offset in a single buffer by `plan_arena`, from its static shape or
+    from its shape in the previous call, and its storage cell is filled with a
+    view of the buffer at that offset before its node is run. The thunks that
+    reuse the arrays found in their output storage, like most C thunks, then
+    write their results in the arena, so that calls with the same shapes do
+    not allocate any array. When a node returns an array of another shape,
+    the arena is planned again at the end of the call.
+    """
+
+    def __init__(
+        self,
+        fgraph,
+        nodes,
+        thunks,
+        pre_call_clear,
+        storage_map,
+        input_storage,
+        output_storage,
+        update_vars,
+        post_thunk_clear: Optional[list["StorageCellType"]] = None,
+        alignment: int = 64,
+    ):
+        r"""
+        Parameters
+        ----------
+        alignment
+            The alignment, in bytes, of the arrays in the arena.
+        """
+        super().__init__(
+            fgraph,
+            nodes,
+            thunks,
+            pre_call_clear,
+            storage_map,
+            input_storage,
+            output_storage,
+            update_vars,
+            post_thunk_clear,
+        )
+        self.alignment = alignment
+        self.intervals = calculate_arena_intervals(nodes, fgraph)
+        self.shapes: dict[Variable, Optional[tuple[int, ...]]] = {}
+        for var in self.intervals:
+            if all(isinstance(dim, int) for dim in var.type.shape):
+                self.shapes[var] = var.type.shape
+        self.arena: Optional[np.ndarray] = None
+        # The `[variable, storage cell, view of the arena]` of the planned
+        # outputs of each node
+        self.node_arena_outputs: list[list[list[Any]]] = [
+            [
+                [out, storage_map[out], None]
+                for out in node.outputs
+                if out in self.intervals
+            ]
+            for node in nodes
+        ]
+        self.replan = True
+
+    def plan(self):
+        """Assign the planned outputs to the arena from their current shapes."""
+        nbytes = {}
+        for var, shape in self.shapes.items():
+            if shape is not None:
+                size = math.prod(shape) * np.dtype(var.type.dtype).itemsize
+                if size > 0:
+                    nbytes[var] = size
+        offsets, size = plan_arena(self.intervals, nbytes, self.alignment)
+        # Keep the arena when it is large enough
+        if self.arena is None or self.arena.nbytes < size + self.alignment:
+            self.arena = np.empty(size + self.alignment, dtype=np.uint8)
+        base = -self.arena.ctypes.data % self.alignment
+        for arena_outputs in self.node_arena_outputs:
+            for entry in arena_outputs:
+                var = entry[0]
+                if var in offsets:
+                    start = base + offsets[var]
+                    entry[2] = (
+                        self.arena[start : start + nbytes[var]]
+                        .view(var.type.dtype)
+                        .reshape(self.shapes[var])
+                    )
+                else:
+                    entry[2] = None
+        self.replan = False
+
+    def observe(self, var: Variable, value: Any):
+        """Record the shape of the value computed for `var`."""
+        if type(value) is np.ndarray and value.dtype == var.type.dtype:
+            shape = value.shape
+        else:
+            shape = None
+        if self.shapes.get(var) != shape:
+            self.shapes[var] = shape
+            self.replan = True
+
+    def clear_storage(self):
+        self.arena = None
+        self.replan = True
+
+    def __call__(self):
+        if self.replan:
+            self.plan()
+        cancel_event = self.cancel_event
+        for cont in self.pre_call_clear:
+            cont[0] = None
+        try:
+            for i, (thunk, node, old_storage, arena_outputs) in enumerate(
+                zip_longest(
+                    self.thunks,
+                    self.nodes,
+                    self.post_thunk_clear,
+                    self.node_arena_outputs,
+                    fillvalue=(),
+                )
+            ):
+                if cancel_event is not None:
+                    cancel_event.check()
+                for _, cell, view in arena_outputs:
+                    if view is not None:
+                        cell[0] = view
+                if self.time_thunks:
+                    t0 = time.perf_counter()
+                    thunk()
+                    t1 = time.perf_counter()
+                    self.call_counts[i] += 1
+                    self.call_times[i] += t1 - t0
+                else:
+                    thunk()
+                for var, cell, view in arena_outputs:
+                    if cell[0] is not view:
+                        self.observe(var, cell[0])
+                for old_s in old_storage:
+                    old_s[0] = None
+        except Exception:
+            raise_with_op(self.fgraph, node, thunk)
+
+        return self.perform_updates()
+
+
 class Stack(UpdatingVM):
     """Finish-to-start evaluation order of thunks.
 
@@ -508,6 +796,8 @@ class Stack(UpdatingVM):
 
         """
         idx = self.node_idx[node]
+        if self.cancel_event is not None:
+            self.cancel_event.check()
         t0 = time.perf_counter()
         rval = self.thunks[idx]()
         self.node_executed_order.append(node)
@@ -778,6 +1068,162 @@ class Stack(UpdatingVM):
         return self.perform_updates()
 
 
+class ParallelLoop(UpdatingVM):
+    """Dependency-driven program execution on a pool of threads.
+
+    Each node is submitted to a thread pool as soon as all the nodes it
+    depends on (through its inputs or through the implicit dependencies
+    induced by `Op.destroy_map` and `Op.view_map`) have been evaluated, so
+    independent branches of the graph can run concurrently.  The scheduling
+    itself is done by the calling thread, so the bookkeeping needs no locks.
+
+    This only speeds up graphs whose thunks release the GIL (e.g. C thunks,
+    BLAS or LAPACK calls), and it doesn't support lazy evaluation.
+
+    Garbage collection of intermediate results is performed when
+    `allow_gc` is ``True``, using the `dependencies` computed by
+    `VMLinker.compute_gc_dependencies`.
+    """
+
+    def __init__(
+        self,
+        fgraph,
+        nodes,
+        thunks,
+        pre_call_clear,
+        storage_map,
+        input_storage,
+        output_storage,
+        update_vars,
+        allow_gc: bool,
+        dependencies: dict[Variable, list[Variable]],
+        n_threads: int,
+    ):
+        r"""
+        Parameters
+        ----------
+        allow_gc
+            Determines whether or not garbage collection is performed.
+        dependencies
+            A map from variables to the variables that depend on them, as
+            returned by `VMLinker.compute_gc_dependencies`.
+        n_threads
+            The number of worker threads.
+        """
+        super().__init__(
+            fgraph,
+            nodes,
+            thunks,
+            pre_call_clear,
+            storage_map,
+            input_storage,
+            output_storage,
+            update_vars,
+        )
+
+        if any(th.lazy for th in thunks):
+            raise ValueError("ParallelLoop does not support lazy thunks")
+
+        self.allow_gc = allow_gc
+        self.dependencies = dependencies
+        self.n_threads = n_threads
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+        node_idx = {node: i for i, node in enumerate(nodes)}
+        destroy_dependencies = get_destroy_dependencies(fgraph)
+
+        # The indices of the nodes that must wait for each node, and the
+        # number of nodes each node must wait for
+        self.node_successors: list[list[int]] = [[] for _ in nodes]
+        self.node_n_prereqs: list[int] = [0] * len(nodes)
+        for i, node in enumerate(nodes):
+            prereqs = {
+                node_idx[v.owner]
+                for v in node.inputs + destroy_dependencies[node]
+                if v.owner is not None
+            }
+            self.node_n_prereqs[i] = len(prereqs)
+            for j in prereqs:
+                self.node_successors[j].append(i)
+        self.initial_ready = [i for i, n in enumerate(self.node_n_prereqs) if n == 0]
+
+        # For each node, the storage cells of its inputs that can be freed
+        # once the node has run, along with the number of nodes that use them
+        outputs = set(fgraph.outputs)
+        self.node_gc_inputs: list[list[Variable]] = [[] for _ in nodes]
+        self.var_n_users: dict[Variable, int] = {}
+        if allow_gc:
+            for var, deps in dependencies.items():
+                if not deps or var.owner is None or var in outputs:
+                    continue
+                users = {node_idx[d.owner] for d in deps}
+                self.var_n_users[var] = len(users)
+                for i in users:
+                    self.node_gc_inputs[i].append(var)
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.n_threads, thread_name_prefix="pytensor-vm"
+            )
+        return self._executor
+
+    def _run_thunk(self, idx):
+        if self.cancel_event is not None:
+            self.cancel_event.check()
+        if self.time_thunks:
+            t0 = time.perf_counter()
+            self.thunks[idx]()
+            self.call_times[idx] += time.perf_counter() - t0
+            self.call_counts[idx] += 1
+        else:
+            self.thunks[idx]()
+
+    def __call__(self):
+        storage_map = self.storage_map
+        node_successors = self.node_successors
+        node_gc_inputs = self.node_gc_inputs
+        n_prereqs = list(self.node_n_prereqs)
+        n_users = dict(self.var_n_users)
+        executor = self.executor
+
+        for cont in self.pre_call_clear:
+            cont[0] = None
+
+        running = {executor.submit(self._run_thunk, i): i for i in self.initial_ready}
+        while running:
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                idx = running.pop(future)
+                if future.exception() is not None:
+                    # Let the other nodes finish before reporting the error
+                    wait(running)
+                    try:
+                        future.result()
+                    except Exception:
+                        raise_with_op(
+                            self.fgraph,
+                            self.nodes[idx],
+                            self.thunks[idx],
+                            storage_map=storage_map,
+                        )
+                for var in node_gc_inputs[idx]:
+                    n_users[var] -= 1
+                    if n_users[var] == 0:
+                        storage_map[var][0] = None
+                for succ in node_successors[idx]:
+                    n_prereqs[succ] -= 1
+                    if n_prereqs[succ] == 0:
+                        running[executor.submit(self._run_thunk, succ)] = succ
+
+        return self.perform_updates()
+
+    def __del__(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+
+
 class VMLinker(LocalLinker):
     """Class that satisfies the `Linker` interface by acting as a `VM` factory.
 
@@ -810,6 +1256,25 @@ class VMLinker(LocalLinker):
     allow_partial_eval
         If ``True``, enforces usage of `Stack` or `CVM`, to allow for partial
         evaluation of functions (calculating a subset of outputs).
+    n_threads
+        The number of worker threads used to evaluate independent nodes
+        concurrently with the `ParallelLoop` VM.  When ``None``, use the
+        PyTensor flag ``vm__n_threads`` value.  ``0`` means one thread per CPU
+        core, and ``1`` disables concurrent evaluation.  Graphs that need lazy
+        evaluation, partial evaluation or callbacks are still evaluated
+        sequentially.
+    schedule
+        A callable that returns the order in which the nodes of a
+        `FunctionGraph` are run, e.g. a
+        `pytensor.graph.schedule.MemoryScheduler`. When ``None``, use the order
+        selected by the PyTensor flag ``vm__schedule``.
+    arena
+        If ``True``, store the intermediate results of graphs that are
+        evaluated sequentially and without lazy evaluation in an arena that
+        persists across calls, with the `ArenaLoop` VM. It replaces the CVM,
+        whose lower overhead per node usually matters more than the saved
+        allocations, unless the graph has few nodes with large results. When
+        ``None``, use the PyTensor flag ``vm__arena`` value.
 
     """
 
@@ -823,6 +1288,8 @@ class VMLinker(LocalLinker):
         schedule=None,
         c_thunks=None,
         allow_partial_eval=None,
+        n_threads=None,
+        arena=None,
     ):
         # Note: if more parameters are added to __init__, make sure to forward
         # them in the "type(self)(...)" call in the "accept" method below.
@@ -837,6 +1304,8 @@ class VMLinker(LocalLinker):
             c_thunks = bool(config.cxx)
         self.c_thunks = c_thunks
         self.allow_partial_eval = allow_partial_eval
+        self.n_threads = n_threads
+        self.arena = arena
         self.updated_vars = {}
         super().__init__(allow_gc=allow_gc, scheduler=schedule)
 
@@ -896,9 +1365,11 @@ class VMLinker(LocalLinker):
                 callback=self.callback,
                 callback_input=self.callback_input,
                 lazy=self.lazy,
-                schedule=self.schedule,
+                schedule=self._scheduler,
                 c_thunks=self.c_thunks,
                 allow_partial_eval=self.allow_partial_eval,
+                n_threads=self.n_threads,
+                arena=self.arena,
             ).accept(fgraph, no_recycling, profile)
         self.fgraph = fgraph
         self.no_recycling = no_recycling
@@ -918,6 +1389,11 @@ class VMLinker(LocalLinker):
         """
         self.updated_vars = updated_vars
 
+    def schedule(self, fgraph: FunctionGraph) -> list[Apply]:
+        if self._scheduler is None and config.vm__schedule == "memory":
+            return memory_schedule(fgraph)
+        return super().schedule(fgraph)
+
     def compute_gc_dependencies(self, variables):
         """
         Returns dict: variable K -> list of variables [v1, v2, v3, ...]
@@ -995,6 +1471,130 @@ class VMLinker(LocalLinker):
 
         return tuple(reallocated_info.keys())
 
+    def get_n_threads(self) -> int:
+        """Return the number of worker threads to use to evaluate nodes."""
+        n_threads = self.n_threads
+        if n_threads is None:
+            n_threads = config.vm__n_threads
+        if n_threads == 0:
+            n_threads = os.cpu_count() or 1
+        return n_threads
+
+    def _use_parallel_loop(self, thunks) -> bool:
+        if self.get_n_threads() <= 1 or self._use_arena(thunks):
+            return False
+        lazy = self.lazy
+        if lazy is None:
+            lazy = config.vm__lazy
+        if lazy is None:
+            lazy = any(th.lazy for th in thunks)
+        return not (
+            lazy
+            or self.allow_partial_eval
+            or self.callback
+            or self.callback_input
+            or ((config.profile or config.print_global_stats) and config.profile_memory)
+        )
+
+    def _use_arena(self, thunks) -> bool:
+        arena = self.arena
+        if arena is None:
+            arena = config.vm__arena
+        if not arena:
+            return False
+        lazy = self.lazy
+        if lazy is None:
+            lazy = config.vm__lazy
+        if lazy is None:
+            lazy = any(th.lazy for th in thunks)
+        return not (
+            lazy
+            or self.allow_partial_eval
+            or self.callback
+            or self.callback_input
+            or ((config.profile or config.print_global_stats) and config.profile_memory)
+        )
+
+    def _follow_memory_schedule(self, thunks) -> bool:
+        """Whether the `Loop` VM is used instead of the `CVM` to follow a memory schedule.
+
+        The CVM evaluates the nodes recursively from the outputs instead of
+        following the order of the schedule, which would lose the peak memory
+        reduction of `MemoryScheduler` and of ``vm__schedule="memory"``.
+        """
+        if not (
+            isinstance(self._scheduler, MemoryScheduler)
+            or (self._scheduler is None and config.vm__schedule == "memory")
+        ):
+            return False
+        if self.allow_partial_eval or any(th.lazy for th in thunks):
+            return False
+        warnings.warn("CVM does not follow the memory schedule, using Loop VM.")
+        return True
+
+    def _replace_cvm_with_arena(self, thunks) -> bool:
+        """Whether the `ArenaLoop` VM is used instead of the `CVM`.
+
+        The arena saves the allocation of the intermediate results, but the
+        Python loop of `ArenaLoop` has a much higher overhead per node than the
+        CVM, so this is only worth it for graphs of few large nodes.
+        """
+        if not self._use_arena(thunks):
+            return False
+        warnings.warn(
+            "CVM does not support the arena, using ArenaLoop VM, which has a "
+            "higher overhead per node."
+        )
+        return True
+
+    def precompile_c_thunks(self, order, storage_map, compute_map):
+        """Compile the C modules of the nodes in `order` concurrently.
+
+        The C code of each node is generated as `COp.make_c_thunk` would do
+        it, and the modules missing from the cache are compiled by
+        `ModuleCache.compile_many` using ``cmodule__compilation_workers``
+        compiler processes, so that the thunks built afterwards hit the cache.
+
+        """
+        n_workers = config.cmodule__compilation_workers
+        if n_workers == 0:
+            n_workers = os.cpu_count() or 1
+        if n_workers <= 1 or not config.cxx:
+            return
+
+        module_cache = get_module_cache()
+        keys_and_linkers = []
+        for node in order:
+            op = node.op
+            if not isinstance(op, COp):
+                continue
+            if not getattr(op, "_f16_ok", False) and any(
+                getattr(v.type, "dtype", "") == "float16"
+                for v in node.inputs + node.outputs
+            ):
+                continue
+            try:
+                op.prepare_node(
+                    node, storage_map=storage_map, compute_map=compute_map, impl="c"
+                )
+                cl = CLinker().accept(FunctionGraph(node.inputs, node.outputs))
+                key = cl.cmodule_key()
+                # Generating the C code is much more expensive than building
+                # the key, so it is only done for the modules not loaded yet.
+                if module_cache._get_from_key(key) is not None:
+                    continue
+                for cl_node in cl.node_order:
+                    cl_node.op.prepare_node(cl_node, None, None, "c")
+                cl.get_src_code()
+            except Exception:
+                # Nodes without C code (or whose code cannot be generated) are
+                # left to `Op.make_thunk`, which falls back or reports the error.
+                continue
+            keys_and_linkers.append((key, cl))
+
+        if len(keys_and_linkers) > 1:
+            module_cache.compile_many(keys_and_linkers, n_workers)
+
     def make_vm(
         self,
         nodes,
@@ -1047,7 +1647,27 @@ class VMLinker(LocalLinker):
                 callback=self.callback,
                 callback_input=self.callback_input,
             )
-        elif self.use_cloop and CVM is not None:
+        elif self._use_parallel_loop(thunks):
+            deps = self.compute_gc_dependencies(storage_map)
+            vm = ParallelLoop(
+                self.fgraph,
+                nodes,
+                thunks,
+                pre_call_clear,
+                storage_map,
+                input_storage,
+                output_storage,
+                updated_vars,
+                self.allow_gc,
+                dependencies=deps,
+                n_threads=self.get_n_threads(),
+            )
+        elif (
+            self.use_cloop
+            and CVM is not None
+            and not self._follow_memory_schedule(thunks)
+            and not self._replace_cvm_with_arena(thunks)
+        ):
             # create a map from nodes to ints and vars to ints
             nodes_idx = {}
             vars_idx = {}
@@ -1171,7 +1791,19 @@ class VMLinker(LocalLinker):
                 lazy = config.vm__lazy
             if lazy is None:
                 lazy = any(th.lazy for th in thunks)
-            if not lazy:
+            if self._use_arena(thunks):
+                vm = ArenaLoop(
+                    self.fgraph,
+                    nodes,
+                    thunks,
+                    pre_call_clear,
+                    storage_map,
+                    input_storage,
+                    output_storage,
+                    updated_vars,
+                    post_thunk_clear if self.allow_gc else None,
+                )
+            elif not lazy:
                 # there is no conditional in the graph
                 vm = Loop(
                     self.fgraph,
@@ -1226,6 +1858,8 @@ class VMLinker(LocalLinker):
         impl = None
         if self.c_thunks is False:
             impl = "py"
+        else:
+            self.precompile_c_thunks(order, storage_map, compute_map)
         for node in order:
             try:
                 thunk_start = time.perf_counter()
@@ -1265,6 +1899,8 @@ class VMLinker(LocalLinker):
             or self.use_cloop
             or self.callback
             or self.callback_input
+            or self._use_parallel_loop(thunks)
+            or self._use_arena(thunks)
         ):
             reallocated_vars = self.reduce_storage_allocations(storage_map, order)
         else:
@@ -1324,6 +1960,8 @@ class VMLinker(LocalLinker):
             self.allow_partial_eval = None
         if not hasattr(self, "callback_input"):
             self.callback_input = None
+        if not hasattr(self, "arena"):
+            self.arena = None
 
     def __repr__(self):
         args_str = ", ".join(
@@ -491,6 +491,11 @@ class GemmRelated(COp):
     # code_cache_version is built by subclasses from
     # build_gemm_version
 
+    def c_code_release_gil(self, node):
+        # Without BLAS flags, the BLAS functions are implemented with the
+        # NumPy C-API (see `blas_header_text`), which needs the GIL
+        return bool(config.blas__ldflags)
+
     def c_compile_args(self, **kwargs):
         return ldflags(libs=False, flags=True)
 
@@ -694,6 +699,8 @@ class GemmRelated(COp):
                 int Nz0 = Nz[0], Nz1 = Nz[1], Nx1 = Nx[1];
                 //std::cerr << (unit/256) MOD 16 << (unit / 16) MOD 16 << unit MOD 16<< '\\n';
                 //double t0 = time_time();
+                bool unit_ok = true;
+                %(begin_nogil)s
                 switch(unit)
                 {
                     case 0x000: sgemm_(&N, &N, &Nz1, &Nz0, &Nx1, &a, y, &sy_0, x, &sx_0, &b, z, &sz_0); break;
@@ -704,8 +711,10 @@ class GemmRelated(COp):
                     case 0x101: sgemm_(&N, &T, &Nz0, &Nz1, &Nx1, &a, x, &sx_1, y, &sy_0, &b, z, &sz_1); break;
                     case 0x011: sgemm_(&T, &N, &Nz0, &Nz1, &Nx1, &a, x, &sx_0, y, &sy_1, &b, z, &sz_1); break;
                     case 0x111: sgemm_(&N, &N, &Nz0, &Nz1, &Nx1, &a, x, &sx_1, y, &sy_1, &b, z, &sz_1); break;
-                    default: PyErr_SetString(PyExc_ValueError, "some matrix has no unit stride"); %(fail)s;
+                    default: unit_ok = false;
                 };
+                %(end_nogil)s
+                if (!unit_ok) {PyErr_SetString(PyExc_ValueError, "some matrix has no unit stride"); %(fail)s;}
                 //fprintf(stderr, "Calling sgemm %%i %%i %%i %%i took %%f\\n", unit, Nz1, Nz0, Nx1, time_time() - t0);
         """
 
@@ -733,6 +742,8 @@ class GemmRelated(COp):
                 //sx_0, sx_1,
                 //sz_0, sz_1
                 //);
+                bool unit_ok = true;
+                %(begin_nogil)s
                 switch(unit)
                 {
                     case 0x000: dgemm_(&N, &N, &Nz1, &Nz0, &Nx1, &a, y,
@@ -751,10 +762,15 @@ class GemmRelated(COp):
                                        &sx_0, y, &sy_1, &b, z, &sz_1); break;
                     case 0x111: dgemm_(&N, &N, &Nz0, &Nz1, &Nx1, &a, x,
                                        &sx_1, y, &sy_1, &b, z, &sz_1); break;
-                    default: PyErr_SetString(PyExc_ValueError,
-                                             "some matrix has no unit stride");
-                             %(fail)s;
+                    default: unit_ok = false;
                 };
+                %(end_nogil)s
+                if (!unit_ok)
+                {
+                    PyErr_SetString(PyExc_ValueError,
+                                    "some matrix has no unit stride");
+                    %(fail)s;
+                }
                 //fprintf(stderr, "Calling dgemm %%i %%i %%i %%i took %%f\\n",
                 //        unit, Nz1, Nz0, Nx1, time_time()- t0);
         """
@@ -795,7 +811,7 @@ class GemmRelated(COp):
         )
 
     def build_gemm_version(self):
-        return (13, blas_header_version())
+        return (14, blas_header_version())
 
 
 class Gemm(GemmRelated):
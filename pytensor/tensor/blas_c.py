@@ -1,3 +1,4 @@
+from pytensor.configdefaults import config
 from pytensor.link.c.op import COp
 from pytensor.link.c.params_type import ParamsType
 from pytensor.scalar import bool as bool_t
@@ -32,7 +33,7 @@ class BaseBLAS(COp):
 # ##### ####### #######
 
 
-def ger_c_code(A, a, x, y, Z, fail, params):
+def ger_c_code(A, a, x, y, Z, fail, params, begin_nogil="", end_nogil=""):
     return """
 
     int elemsize ;
@@ -120,6 +121,7 @@ def ger_c_code(A, a, x, y, Z, fail, params):
             int Zj = PyArray_STRIDES({Z})[1]/sizeof(float);
             int xi = PyArray_STRIDES({x})[0]/sizeof(float);
             int yj = PyArray_STRIDES({y})[0]/sizeof(float);
+            {begin_nogil}
             for (int i = 0; i < dims[0]; ++i)
             {{
                 xx = alpha * xdata[xi * i];
@@ -130,6 +132,7 @@ def ger_c_code(A, a, x, y, Z, fail, params):
                     zoutdata[Zi*i+Zj*j] = tmp;
                 }}
             }}
+            {end_nogil}
         }}
         else if (PyArray_DESCR({Z})->type_num == NPY_DOUBLE)
         {{
@@ -147,6 +150,7 @@ def ger_c_code(A, a, x, y, Z, fail, params):
             int Zj = PyArray_STRIDES({Z})[1]/sizeof(double);
             int xi = PyArray_STRIDES({x})[0]/sizeof(double);
             int yj = PyArray_STRIDES({y})[0]/sizeof(double);
+            {begin_nogil}
             for (int i = 0; i < dims[0]; ++i)
             {{
                 xx = alpha * xdata[xi * i];
@@ -157,6 +161,7 @@ def ger_c_code(A, a, x, y, Z, fail, params):
                     zoutdata[Zi*i+Zj*j] = tmp;
                 }}
             }}
+            {end_nogil}
         }}
         else
         {{
@@ -190,6 +195,7 @@ def ger_c_code(A, a, x, y, Z, fail, params):
                 int Zj = PyArray_STRIDES({Z})[1]/sizeof(float);
                 int xi = PyArray_STRIDES({x})[0]/sizeof(float);
                 int yj = PyArray_STRIDES({y})[0]/sizeof(float);
+                {begin_nogil}
                 for (int i = 0; i < dims[0]; ++i)
                 {{
                     axi = alpha * xdata[xi * i];
@@ -198,6 +204,7 @@ def ger_c_code(A, a, x, y, Z, fail, params):
                         zoutdata[Zi*i+Zj*j] += axi * ydata[yj * j];
                     }}
                 }}
+                {end_nogil}
             }}
             else if (PyArray_DESCR({Z})->type_num == NPY_DOUBLE)
             {{
@@ -212,6 +219,7 @@ def ger_c_code(A, a, x, y, Z, fail, params):
                 int Zj = PyArray_STRIDES({Z})[1]/sizeof(double);
                 int xi = PyArray_STRIDES({x})[0]/sizeof(double);
                 int yj = PyArray_STRIDES({y})[0]/sizeof(double);
+                {begin_nogil}
                 for (int i = 0; i < dims[0]; ++i)
                 {{
                     axi = alpha * xdata[xi * i];
@@ -220,6 +228,7 @@ def ger_c_code(A, a, x, y, Z, fail, params):
                         zoutdata[Zi*i+Zj*j] += axi * ydata[yj * j];
                     }}
                 }}
+                {end_nogil}
             }}
         }}
         else
@@ -253,18 +262,22 @@ def ger_c_code(A, a, x, y, Z, fail, params):
                 if (PyArray_DESCR({Z})->type_num == NPY_FLOAT)
                 {{
                     float alpha = ((dtype_{a}*)PyArray_DATA({a}))[0];
+                    {begin_nogil}
                     sger_(&Nz0, &Nz1, &alpha,
                         (float*)x_data, &Sx,
                         (float*)y_data, &Sy,
                         (float*)(PyArray_DATA({Z})), &Sz1);
+                    {end_nogil}
                 }}
                 else if (PyArray_DESCR({Z})->type_num == NPY_DOUBLE)
                 {{
                     double alpha = ((dtype_{a}*)PyArray_DATA({a}))[0];
+                    {begin_nogil}
                     dger_(&Nz0, &Nz1, &alpha,
                         (double*)x_data, &Sx,
                         (double*)y_data, &Sy,
                         (double*)(PyArray_DATA({Z})), &Sz1);
+                    {end_nogil}
 
 
                 }}
@@ -279,18 +292,22 @@ def ger_c_code(A, a, x, y, Z, fail, params):
                 if (PyArray_DESCR({Z})->type_num == NPY_FLOAT)
                 {{
                     float alpha = ((dtype_{a}*)(PyArray_DATA({a})))[0];
+                    {begin_nogil}
                     sger_(&Nz1, &Nz0, &alpha,
                         (float*)y_data, &Sy,
                         (float*)x_data, &Sx,
                         (float*)(PyArray_DATA({Z})), &Sz0);
+                    {end_nogil}
                 }}
                 else if (PyArray_DESCR({Z})->type_num == NPY_DOUBLE)
                 {{
                     double alpha = ((dtype_{a}*)PyArray_DATA({a}))[0];
+                    {begin_nogil}
                     dger_(&Nz1, &Nz0, &alpha,
                         (double*)y_data, &Sy,
                         (double*)x_data, &Sx,
                         (double*)(PyArray_DATA({Z})), &Sz0);
+                    {end_nogil}
                 }}
                 else
                 {{
@@ -320,11 +337,26 @@ class CGer(BaseBLAS, Ger):
     def c_code(self, node, name, inp, out, sub):
         A, a, x, y = inp
         (Z,) = out
-        code = ger_c_code(A, a, x, y, Z, fail=sub["fail"], params=sub["params"])
+        code = ger_c_code(
+            A,
+            a,
+            x,
+            y,
+            Z,
+            fail=sub["fail"],
+            params=sub["params"],
+            begin_nogil=sub.get("begin_nogil", ""),
+            end_nogil=sub.get("end_nogil", ""),
+        )
         return code
 
+    def c_code_release_gil(self, node):
+        # Without BLAS flags, the BLAS functions are implemented with the
+        # NumPy C-API (see `blas_header_text`), which needs the GIL
+        return bool(config.blas__ldflags)
+
     def c_code_cache_version(self):
-        return (11, blas_header_version())
+        return (12, blas_header_version())
 
 
 cger_inplace = CGer(True)
@@ -336,7 +368,19 @@ cger_no_inplace = CGer(False)
 # ##### ####### #######
 
 
-def gemv_c_code(y, A, x, z, alpha, beta, fail, force_init_beta=False, params=None):
+def gemv_c_code(
+    y,
+    A,
+    x,
+    z,
+    alpha,
+    beta,
+    fail,
+    force_init_beta=False,
+    params=None,
+    begin_nogil="",
+    end_nogil="",
+):
     """
     z <- beta * y + alpha * dot(A, x)
 
@@ -465,22 +509,26 @@ def gemv_c_code(y, A, x, z, alpha, beta, fail, force_init_beta=False, params=Non
                 if (PyArray_DESCR(%(A)s)->type_num == NPY_FLOAT)
                 {
                     float alpha = ((dtype_%(alpha)s*)PyArray_DATA(%(alpha)s))[0];
+                    %(begin_nogil)s
                     sgemv_(&NOTRANS, &NA0, &NA1,
                         &alpha,
                         (float*)(PyArray_DATA(%(A)s)), &SA1,
                         (float*)x_data, &Sx,
                         &fbeta,
                         (float*)z_data, &Sz);
+                    %(end_nogil)s
                 }
                 else if (PyArray_DESCR(%(A)s)->type_num == NPY_DOUBLE)
                 {
                     double alpha = ((dtype_%(alpha)s*)PyArray_DATA(%(alpha)s))[0];
+                    %(begin_nogil)s
                     dgemv_(&NOTRANS, &NA0, &NA1,
                         &alpha,
                         (double*)(PyArray_DATA(%(A)s)), &SA1,
                         (double*)x_data, &Sx,
                         &dbeta,
                         (double*)z_data, &Sz);
+                    %(end_nogil)s
                 }
                 else
                 {
@@ -505,18 +553,22 @@ def gemv_c_code(y, A, x, z, alpha, beta, fail, force_init_beta=False, params=Non
                         } else {
                           z_data[0] = 0.f;
                         }
+                        %(begin_nogil)s
                         z_data[0] += alpha*sdot_(&NA1,
                               (float*)(PyArray_DATA(%(A)s)), &SA1,
                               (float*)x_data, &Sx);
+                        %(end_nogil)s
                     }
                     else
                     {
+                        %(begin_nogil)s
                         sgemv_(&TRANS, &NA1, &NA0,
                             &alpha,
                             (float*)(PyArray_DATA(%(A)s)), &SA0,
                             (float*)x_data, &Sx,
                             &fbeta,
                             (float*)z_data, &Sz);
+                        %(end_nogil)s
                     }
                 }
                 else if (PyArray_DESCR(%(A)s)->type_num == NPY_DOUBLE)
@@ -533,18 +585,22 @@ def gemv_c_code(y, A, x, z, alpha, beta, fail, force_init_beta=False, params=Non
                         } else {
                           z_data[0] = 0.;
                         }
+                        %(begin_nogil)s
                         z_data[0] += alpha*ddot_(&NA1,
                               (double*)(PyArray_DATA(%(A)s)), &SA1,
                               (double*)x_data, &Sx);
+                        %(end_nogil)s
                     }
                     else
                     {
+                        %(begin_nogil)s
                         dgemv_(&TRANS, &NA1, &NA0,
                             &alpha,
                             (double*)(PyArray_DATA(%(A)s)), &SA0,
                             (double*)x_data, &Sx,
                             &dbeta,
                             (double*)z_data, &Sz);
+                        %(end_nogil)s
                     }
                 }
                 else
@@ -599,11 +655,18 @@ class CGemv(BaseBLAS, Gemv):
             fail=sub["fail"],
             force_init_beta=check_force_gemv_init(),
             params=sub["params"],
+            begin_nogil=sub.get("begin_nogil", ""),
+            end_nogil=sub.get("end_nogil", ""),
         )
         return code
 
+    def c_code_release_gil(self, node):
+        # Without BLAS flags, the BLAS functions are implemented with the
+        # NumPy C-API (see `blas_header_text`), which needs the GIL
+        return bool(config.blas__ldflags)
+
     def c_code_cache_version(self):
-        return (14, blas_header_version(), check_force_gemv_init())
+        return (15, blas_header_version(), check_force_gemv_init())
 
 
 cgemv_inplace = CGemv(inplace=True)
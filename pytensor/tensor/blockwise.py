@@ -46,8 +46,16 @@ def safe_signature(
 class Blockwise(Op):
     """Generalizes a core `Op` to work with batched dimensions.
 
+    The batched inputs are evaluated with, in order of preference:
+
+    1. The function of `gufunc_spec`, or of the ``gufunc_spec`` of the core
+       `Op`, e.g. ``numpy.linalg.inv``, that implements the batched operation.
+    2. The ``batched_perform(node, inputs, output_storage)`` method of the
+       core `Op`, called like `Op.perform` with this `Blockwise` node and the
+       batched inputs.
+    3. `numpy.vectorize` around the `Op.perform` method of the core `Op`.
+
     TODO: Dispatch JAX (should be easy with the vectorize macro)
-    TODO: Dispatch Numba
     TODO: C implementation?
     TODO: Fuse Blockwise?
     """
@@ -347,17 +355,25 @@ class Blockwise(Op):
                     "If broadcasting was intended, use `specify_broadcastable` on the relevant input."
                 )
 
-    def perform(self, node, inputs, output_storage):
-        gufunc = self._gufunc
-
-        if gufunc is None:
-            gufunc = self._create_gufunc(node)
+    def _core_batched_perform(self):
+        if self.gufunc_spec is not None:
+            return None
+        return getattr(self.core_op, "batched_perform", None)
 
+    def perform(self, node, inputs, output_storage):
         self._check_runtime_broadcast(node, inputs)
 
-        res = gufunc(*inputs)
-        if not isinstance(res, tuple):
-            res = (res,)
+        batched_perform = self._core_batched_perform()
+        if batched_perform is not None:
+            batched_perform(node, inputs, output_storage)
+            res = tuple(out_storage[0] for out_storage in output_storage)
+        else:
+            gufunc = self._gufunc
+            if gufunc is None:
+                gufunc = self._create_gufunc(node)
+            res = gufunc(*inputs)
+            if not isinstance(res, tuple):
+                res = (res,)
 
         for node_out, out_storage, r in zip(node.outputs, output_storage, res):
             out_dtype = getattr(node_out, "dtype", None)
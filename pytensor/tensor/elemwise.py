@@ -1,3 +1,4 @@
+import re
 from copy import copy
 from typing import Union
 
@@ -11,7 +12,7 @@ from pytensor.graph.basic import Apply
 from pytensor.graph.null_type import NullType
 from pytensor.graph.replace import _vectorize_node, _vectorize_not_needed
 from pytensor.graph.utils import MethodNotDefined
-from pytensor.link.c.basic import failure_code
+from pytensor.link.c.basic import failure_code, release_gil
 from pytensor.link.c.op import COp, ExternalCOp, OpenMPOp
 from pytensor.link.c.params_type import ParamsType
 from pytensor.misc.frozendict import frozendict
@@ -38,6 +39,16 @@ from pytensor.utils import uniq
 
 _numpy_ver = [int(n) for n in np.__version__.split(".")[:2]]
 
+# Matches the uses of the Python C-API, except for the `PyArray_*` accessors,
+# which only read fields of the array struct and don't need the GIL
+_python_c_api_re = re.compile(
+    r"\bPy(?!Array_(DATA|DIMS?|STRIDES?|NDIM|SIZE|ISCONTIGUOUS|ISFORTRAN)\b)"
+)
+
+
+def _uses_python_c_api(code: str) -> bool:
+    return _python_c_api_re.search(code) is not None
+
 
 class DimShuffle(ExternalCOp):
     """
@@ -964,6 +975,9 @@ class Elemwise(OpenMPOp):
             {undefs}
         }}
         """.format(**locals())
+        # The loops can only run without the GIL if the scalar code doesn't
+        # need it (e.g. to raise an error)
+        nogil = not _uses_python_c_api(task_code)
 
         loop_orders = orders + [list(range(nnested))] * len(real_onames)
         dtypes = idtypes + list(real_odtypes)
@@ -1048,6 +1062,7 @@ class Elemwise(OpenMPOp):
                 contig = self.scalar_op.c_code_contiguous(
                     node, nodename + "_scalar_contig_", _inames, onames, sub
                 )
+                nogil = nogil and not _uses_python_c_api(contig)
             except MethodNotDefined:
                 # Try to make one generic version, this will help the
                 # compiler to vectorize the code as their won't be as
@@ -1118,6 +1133,8 @@ class Elemwise(OpenMPOp):
                 {loop}
             }}
             """.format(**locals())
+        if nogil:
+            loop = release_gil(loop, sub)
         return decl, checks, alloc, loop, ""
 
     def c_code(self, node, nodename, inames, onames, sub):
@@ -1133,6 +1150,9 @@ class Elemwise(OpenMPOp):
         code = "\n".join(self._c_all(node, nodename, inames, onames, sub))
         return code
 
+    def c_code_release_gil(self, node):
+        return True
+
     def c_headers(self, **kwargs):
         return ["<vector>", "<algorithm>"]
 
@@ -1147,7 +1167,7 @@ class Elemwise(OpenMPOp):
         return support_code
 
     def c_code_cache_version_apply(self, node):
-        version = [15]  # the version corresponding to the c code in this Op
+        version = [16]  # the version corresponding to the c code in this Op
 
         # now we insert versions for the ops on which we depend...
         scalar_node = Apply(
@@ -1620,6 +1640,8 @@ class CAReduce(COp):
             all_code,
             sub,
         )
+        if not _uses_python_c_api(task1_code):
+            loop = release_gil(loop, sub)
 
         end = ""
         if adtype != odtype:
@@ -1634,13 +1656,16 @@ class CAReduce(COp):
         code = "\n".join(self._c_all(node, name, inames, onames, sub))
         return code
 
+    def c_code_release_gil(self, node):
+        return True
+
     def c_headers(self, **kwargs):
         # Sometimes, Elemwise's c_code is returned, so we need its headers
         return ["<vector>", "<algorithm>"]
 
     def c_code_cache_version_apply(self, node):
         # the version corresponding to the c code in this Op
-        version = [9]
+        version = [10]
 
         # now we insert versions for the ops on which we depend...
         scalar_node = Apply(
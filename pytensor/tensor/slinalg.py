@@ -27,6 +27,30 @@ if TYPE_CHECKING:
 logger = logging.getLogger(__name__)
 
 
+def _supported_by_numpy_linalg(*arrays) -> bool:
+    """Whether the batched routines of `numpy.linalg` accept the dtypes of `arrays`."""
+    return all(a.dtype.kind in "biu" or a.dtype.char in "fdFD" for a in arrays)
+
+
+def _check_finite(*arrays):
+    for a in arrays:
+        if not np.isfinite(a).all():
+            raise ValueError("array must not contain infs or NaNs")
+
+
+def _perform_batch_loop(op, inputs, batch_ndim, out):
+    """Fill `out` by calling ``op.perform`` for each entry of the batch dimensions."""
+    batch_shape = out.shape[:batch_ndim]
+    inputs = [
+        np.broadcast_to(inp, batch_shape + inp.shape[batch_ndim:]) for inp in inputs
+    ]
+    for idx in np.ndindex(*batch_shape):
+        core_out = [None]
+        op.perform(None, [inp[idx] for inp in inputs], [core_out])
+        out[idx] = core_out[0]
+    return out
+
+
 class Cholesky(Op):
     """
     Return a triangular matrix square root of positive semi-definite `x`.
@@ -80,6 +104,30 @@ class Cholesky(Op):
             else:
                 z[0] = (np.zeros(x.shape) * np.nan).astype(x.dtype)
 
+    def batched_perform(self, node, inputs, outputs):
+        [x] = inputs
+        out = np.empty(x.shape, dtype=node.outputs[0].dtype)
+        if not _supported_by_numpy_linalg(x):
+            outputs[0][0] = _perform_batch_loop(self, [x], x.ndim - 2, out)
+            return
+
+        if self.check_finite:
+            _check_finite(x)
+        try:
+            # numpy.linalg.cholesky only reads the lower triangle
+            if self.lower:
+                out[...] = np.linalg.cholesky(x)
+            else:
+                out[...] = np.swapaxes(
+                    np.linalg.cholesky(np.swapaxes(x, -1, -2)), -1, -2
+                )
+        except np.linalg.LinAlgError:
+            if self.on_error == "raise":
+                raise
+            # Only the matrices that are not positive definite are set to nan
+            _perform_batch_loop(self, [x], x.ndim - 2, out)
+        outputs[0][0] = out
+
     def L_op(self, inputs, outputs, gradients):
         """
         Cholesky decomposition reverse-mode gradient update.
@@ -392,6 +440,24 @@ class Solve(SolveBase):
             assume_a=self.assume_a,
         )
 
+    def batched_perform(self, node, inputs, outputs):
+        a, b = inputs
+        batch_ndim = a.ndim - 2
+        batch_shape = np.broadcast_shapes(a.shape[:batch_ndim], b.shape[:batch_ndim])
+        out = np.empty(batch_shape + b.shape[batch_ndim:], dtype=node.outputs[0].dtype)
+        # numpy.linalg.solve only implements the LU solver of the general case
+        if self.assume_a != "gen" or not _supported_by_numpy_linalg(a, b):
+            outputs[0][0] = _perform_batch_loop(self, [a, b], batch_ndim, out)
+            return
+
+        if self.check_finite:
+            _check_finite(a, b)
+        if self.b_ndim == 1:
+            out[...] = np.linalg.solve(a, b[..., None])[..., 0]
+        else:
+            out[...] = np.linalg.solve(a, b)
+        outputs[0][0] = out
+
 
 def solve(
     a,
@@ -55,6 +55,10 @@ dtype_specs_map = {
 }
 
 
+# The dtypes in which the Python scalars of each type are represented exactly
+_python_scalar_dtypes = {bool: "bool", int: "int64", float: "float64"}
+
+
 class TensorType(CType[np.ndarray], HasDataType, HasShape):
     r"""Symbolic `Type` representing `numpy.ndarray`\s."""
 
@@ -261,6 +265,38 @@ class TensorType(CType[np.ndarray], HasDataType, HasShape):
             raise ValueError("Non-finite elements not allowed")
         return data
 
+    def filter_many(self, values, strict=False, allow_downcast=None):
+        if self.filter_checks_isfinite:
+            return super().filter_many(values, strict, allow_downcast)
+        if not strict and self.ndim == 0 and values:
+            # Python scalars are converted together when it is lossless
+            py_type = type(values[0])
+            if _python_scalar_dtypes.get(py_type) == self.dtype and all(
+                type(value) is py_type for value in values
+            ):
+                try:
+                    data = np.array(values, dtype=self.dtype)
+                except OverflowError:
+                    pass
+                else:
+                    return [data[i, ...] for i in range(len(values))]
+        # `filter` accepts an `ndarray` as is depending only on its dtype,
+        # shape and alignment, so those are only checked once.
+        accepted = set()
+        filtered = []
+        for value in values:
+            if type(value) is np.ndarray:
+                key = (value.dtype, value.shape, value.flags.aligned)
+                if key not in accepted:
+                    new_value = self.filter(value, strict, allow_downcast)
+                    if new_value is value:
+                        accepted.add(key)
+                    value = new_value
+            else:
+                value = self.filter(value, strict, allow_downcast)
+            filtered.append(value)
+        return filtered
+
     def filter_variable(self, other, allow_convert=True):
         if not isinstance(other, Variable):
             # The value is not a Variable: we cast it into
@@ -0,0 +1,65 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+import pytensor.tensor as pt
+from pytensor.compile.function import function
+from pytensor.compile.function.pool import FunctionPool
+from pytensor.compile.io import In
+from pytensor.compile.mode import Mode
+from pytensor.compile.sharedvalue import shared
+from pytensor.tensor.type import dvector
+
+
+@pytest.mark.parametrize("linker", ["cvm", "vm", "py"])
+def test_function_pool(linker):
+    x = dvector("x")
+    y = pt.dscalar("y")
+    s = shared(np.ones(3), name="s")
+    f = function(
+        [x, In(y, value=2.0)],
+        pt.exp(x) * y + s,
+        mode=Mode(linker=linker, optimizer="fast_run"),
+    )
+    pool = FunctionPool(f)
+
+    barrier = threading.Barrier(4)
+
+    def work(i):
+        barrier.wait()
+        fns = set()
+        for j in range(20):
+            x_val = np.full(3, float(i + j))
+            fns.add(id(pool.get()))
+            np.testing.assert_allclose(pool(x_val), np.exp(x_val) * 2 + 1)
+            np.testing.assert_allclose(pool(x_val, y=3.0), np.exp(x_val) * 3 + 1)
+        assert len(fns) == 1
+        return pool.get()
+
+    with ThreadPoolExecutor(4) as executor:
+        thread_fns = list(executor.map(work, range(4)))
+    assert len({id(fn) for fn in thread_fns}) == 4
+    assert all(fn is not f for fn in thread_fns)
+
+    # The shared variables are shared with the original function
+    s.set_value(np.zeros(3))
+    with ThreadPoolExecutor(1) as executor:
+        np.testing.assert_allclose(
+            executor.submit(pool, np.zeros(3)).result(), np.full(3, 2.0)
+        )
+
+
+def test_function_pool_updates():
+    x = pt.dscalar("x")
+    s = shared(0.0, name="s")
+    pool = FunctionPool(function([x], s, updates={s: s + x}))
+    with ThreadPoolExecutor(1) as executor:
+        executor.submit(pool, 1.0).result()
+    pool(2.0)
+    assert s.get_value() == 3.0
+    assert pool.call_many([(1.0,), (1.0,)]) == [3.0, 4.0]
+
+    with pytest.raises(TypeError):
+        FunctionPool(lambda x: x)
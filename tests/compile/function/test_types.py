@@ -1,18 +1,22 @@
+import asyncio
 import copy
 import pickle
+import threading
+from unittest.mock import patch
 
 import numpy as np
 import pytest
 
 import pytensor.tensor as pt
-from pytensor.compile import shared
+from pytensor.compile import rewritecache, shared
 from pytensor.compile.debugmode import DebugMode, InvalidValueError
 from pytensor.compile.function import function
 from pytensor.compile.function.types import UnusedInputError
 from pytensor.compile.io import In, Out
 from pytensor.compile.mode import Mode, get_default_mode
 from pytensor.configdefaults import config
-from pytensor.graph.basic import Constant
+from pytensor.graph.basic import Apply, Constant
+from pytensor.graph.op import Op
 from pytensor.graph.rewriting.basic import OpKeyGraphRewriter, PatternNodeRewriter
 from pytensor.graph.utils import MissingInputError
 from pytensor.link.vm import VMLinker
@@ -1263,3 +1267,235 @@ def test_empty_givens_updates():
     y = x * 2
     function([In(x)], y, givens={})
     function([In(x)], y, updates={})
+
+
+def test_rewrite_cache(tmp_path):
+    load_rewritten_fgraph = rewritecache.load_rewritten_fgraph
+    hits = []
+
+    def load_mock(fgraph, key):
+        hits.append(load_rewritten_fgraph(fgraph, key))
+        return hits[-1]
+
+    def compile_fn():
+        x = matrix("x")
+        w = shared(np.ones((3, 3), dtype=config.floatX), name="w")
+        y = pt.exp(dot(x, w)).sum(axis=1) + pt.log1p(x).mean()
+        return function([x], [y, y * 2], updates={w: w + 1}), w
+
+    with (
+        config.change_flags(rewrite_cache=True),
+        patch.object(rewritecache, "_cache_dir", return_value=str(tmp_path)),
+        patch.object(rewritecache, "load_rewritten_fgraph", side_effect=load_mock),
+    ):
+        f, _ = compile_fn()
+        g, w = compile_fn()
+    assert hits == [False, True]
+    assert len(list(tmp_path.iterdir())) == 1
+
+    assert [str(node.op) for node in f.maker.fgraph.toposort()] == [
+        str(node.op) for node in g.maker.fgraph.toposort()
+    ]
+    x_val = np.eye(3, dtype=config.floatX)
+    for res, expected in zip(g(x_val), f(x_val)):
+        np.testing.assert_allclose(res, expected)
+    np.testing.assert_allclose(w.get_value(), 2)
+
+
+def test_call_into():
+    x = dvector("x")
+    s = shared(np.zeros(3), name="s")
+    f = function([x], [pt.exp(x), x, x.sum()], updates={s: s + x})
+
+    x_val = np.arange(3.0)
+    out = [np.empty(3), np.empty(3), np.empty(())]
+    pre_call_clear = list(f.vm.pre_call_clear)
+    res = f.call_into(out, x_val)
+    assert f.vm.pre_call_clear == pre_call_clear
+    assert all(r is o for r, o in zip(res, out))
+    np.testing.assert_allclose(out[0], np.exp(x_val))
+    np.testing.assert_allclose(out[1], x_val)
+    np.testing.assert_allclose(out[2], 3.0)
+    np.testing.assert_allclose(s.get_value(), x_val)
+
+    # The next calls do not write into the arrays of the caller
+    res = f(x_val + 1)
+    assert not any(np.shares_memory(r, o) for r, o in zip(res, out))
+    np.testing.assert_allclose(out[0], np.exp(x_val))
+
+    res = f.call_into([None, out[1], None], x_val)
+    assert res[1] is out[1]
+    np.testing.assert_allclose(res[0], np.exp(x_val))
+
+    # The arrays are checked before the evaluation when possible
+    s.set_value(np.zeros(3))
+    with pytest.raises(TypeError, match="Bad output array at index 0"):
+        f.call_into([np.empty(3, dtype="float32"), None, None], x_val)
+    with pytest.raises(TypeError, match="Bad output array at index 2"):
+        f.call_into([None, None, np.empty(1)], x_val)
+    np.testing.assert_allclose(s.get_value(), np.zeros(3))
+    # Otherwise the updates are applied before the error is raised
+    buffer = np.empty(4)
+    with pytest.raises(ValueError, match="Output 0 has shape"):
+        f.call_into([buffer, None, None], x_val)
+    assert buffer.shape == (4,)
+    np.testing.assert_allclose(s.get_value(), x_val)
+    with pytest.raises(ValueError, match="Expected 3 output arrays"):
+        f.call_into([None], x_val)
+
+    g = function([x], 2 * x)
+    buffer = np.empty(3)
+    assert g.call_into(buffer, x_val) is buffer
+    np.testing.assert_allclose(buffer, 2 * x_val)
+
+
+def test_call_into_output_storage():
+    """The output arrays are given to the thunks that compute the outputs."""
+    preset = []
+
+    class ReuseOutputOp(Op):
+        def make_node(self, x):
+            return Apply(self, [x], [x.type()])
+
+        def perform(self, node, inputs, output_storage):
+            (x,) = inputs
+            out = output_storage[0][0]
+            preset.append(out)
+            if out is None or out.shape != x.shape:
+                out = np.empty_like(x)
+            np.multiply(x, 2, out=out)
+            output_storage[0][0] = out
+
+    x = dvector("x")
+    f = function([x], ReuseOutputOp()(x), mode=Mode(linker="vm", optimizer=None))
+    x_val = np.arange(3.0)
+    buffer = np.empty(3)
+    assert f.call_into(buffer, x_val) is buffer
+    assert preset[-1].base is buffer
+    np.testing.assert_allclose(buffer, 2 * x_val)
+
+    assert f(x_val) is not buffer
+    assert preset[-1] is None
+
+
+@pytest.mark.parametrize("linker", ["cvm", "vm"])
+def test_call_many(linker):
+    x = dscalar("x")
+    y = dvector("y")
+    s = shared(0.0, name="s")
+    f = function(
+        [x, In(y, value=np.ones(2))],
+        [x * y, x + 1],
+        updates={s: s + x},
+        mode=Mode(linker=linker),
+    )
+    args = [(float(i), np.arange(2.0) + i) for i in range(5)]
+    res = f.call_many(args)
+    assert len(res) == 5
+    for (x_val, y_val), (xy, x1) in zip(args, res):
+        np.testing.assert_allclose(xy, x_val * y_val)
+        np.testing.assert_allclose(x1, x_val + 1)
+    # The updates are applied after each call
+    np.testing.assert_allclose(s.get_value(), 10.0)
+
+    xy, x1 = f.call_many(args, stack=True)
+    assert xy.shape == (5, 2) and x1.shape == (5,)
+
+    # The default value of `y` is used
+    res = f.call_many([(2.0,), (3.0,)])
+    np.testing.assert_allclose(res[1][0], [3.0, 3.0])
+
+    with pytest.raises(TypeError, match="Bad input argument at index 1"):
+        f.call_many([(1.0, np.ones(2)), (1.0, np.ones((2, 2)))])
+    with pytest.raises(TypeError, match="same number of arguments"):
+        f.call_many([(1.0, np.ones(2)), (1.0,)])
+
+    g = function([y], (y**2).sum(), mode=Mode(linker=linker))
+    res = g.call_many([(np.ones(2),), (np.arange(2.0),)])
+    np.testing.assert_allclose(res, [2.0, 1.0])
+    np.testing.assert_allclose(g.call_many([(np.ones(3),)], stack=True), [3.0])
+    assert g.call_many([]) == []
+
+
+@pytest.mark.parametrize("linker", ["cvm", "vm", "vm_nogc", "py"])
+def test_acall(linker):
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    class BlockingOp(Op):
+        def make_node(self, x):
+            return Apply(self, [x], [x.type()])
+
+        def perform(self, node, inputs, output_storage):
+            calls.append(node)
+            started.set()
+            release.wait(10)
+            output_storage[0][0] = inputs[0] + 1
+
+    x = dscalar("x")
+    f = function(
+        [x], BlockingOp()(BlockingOp()(x)), mode=Mode(linker=linker, optimizer=None)
+    )
+
+    async def main():
+        release.set()
+        assert await f.acall(1.0) == 3.0
+        assert await f.acall(x=2.0) == 4.0
+
+        release.clear()
+        started.clear()
+        calls.clear()
+        task = asyncio.create_task(f.acall(1.0))
+        await asyncio.to_thread(started.wait, 10)
+        # This call waits for the cancelled one to stop
+        next_call = asyncio.create_task(f.acall(5.0))
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        release.set()
+        assert await next_call == 7.0
+        return len(calls)
+
+    n_calls = asyncio.run(main())
+    if linker == "py":
+        # The thunks of the `PerformLinker` cannot be cancelled
+        assert n_calls == 4
+    else:
+        # The second node of the cancelled call was not run
+        assert n_calls == 3
+
+
+def test_vectorize():
+    x = dvector("x")
+    y = dscalar("y")
+    s = shared(np.ones(3), name="s")
+    n_calls = shared(0.0, name="n_calls")
+    f = function(
+        [x, In(y, value=2.0)],
+        [x * y + s, (x * y).sum()],
+        updates={n_calls: n_calls + 1},
+    )
+
+    g = f.vectorize()
+    x_val = np.arange(6.0).reshape(2, 3)
+    y_val = np.array([1.0, 2.0])
+    out1, out2 = g(x_val, y_val)
+    np.testing.assert_allclose(out1, x_val * y_val[:, None] + 1)
+    np.testing.assert_allclose(out2, (x_val * y_val[:, None]).sum(-1))
+    # The shared variables and updates are kept
+    assert n_calls.get_value() == 1.0
+
+    # The inputs without batch dimensions keep their default value
+    g = f.vectorize(batch_axes=[2, 0])
+    out1, out2 = g(x_val[None])
+    assert out2.shape == (1, 2)
+    np.testing.assert_allclose(out1[0], x_val * 2 + 1)
+    assert n_calls.get_value() == 2.0
+
+    with pytest.raises(ValueError, match="batch_axes"):
+        f.vectorize([1])
+
+    h = function([x], x.sum(), updates={s: s + x})
+    with pytest.raises(ValueError, match="depends on the batched inputs"):
+        h.vectorize()
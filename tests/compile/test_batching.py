@@ -0,0 +1,67 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+import pytensor.tensor as pt
+from pytensor.compile.batching import BatchedFunction
+from pytensor.compile.io import In
+from pytensor.compile.sharedvalue import shared
+from pytensor.tensor.type import dmatrix, dvector
+
+
+def test_batched_function():
+    x = dvector("x")
+    y = pt.dscalar("y")
+    s = shared(np.array(2.0), name="s")
+    f = BatchedFunction(
+        [x, y], [pt.exp(x) * y, x.sum() + s, s * 3], max_batch_size=4, max_delay=1.0
+    )
+    calls = []
+    fn = f.fn
+
+    def counting_fn(*args):
+        calls.append(args[0].shape)
+        return fn(*args)
+
+    f.fn = counting_fn
+
+    args = [(np.arange(3.0) + i, float(i)) for i in range(8)]
+    with ThreadPoolExecutor(8) as executor:
+        results = list(executor.map(lambda a: f(*a), args))
+    # The calls are evaluated in batches of `max_batch_size`
+    assert calls == [(4, 3), (4, 3)]
+    for (x_val, y_val), (out1, out2, out3) in zip(args, results):
+        np.testing.assert_allclose(out1, np.exp(x_val) * y_val)
+        assert out2.shape == ()
+        np.testing.assert_allclose(out2, x_val.sum() + 2)
+        np.testing.assert_allclose(out3, 6.0)
+    # The outputs of the calls do not share memory
+    assert results[0][0].base is None
+    assert results[0][2] is not results[1][2]
+
+    # The calls with arguments of different shapes are evaluated separately
+    calls.clear()
+    futures = [f.submit(np.ones(2), 1.0), f.submit(np.ones(3), 1.0)]
+    assert [len(fut.result()[0]) for fut in futures] == [2, 3]
+    assert sorted(calls) == [(1, 2), (1, 3)]
+
+    f.close()
+    with pytest.raises(RuntimeError, match="closed"):
+        f(np.ones(2), 1.0)
+
+
+def test_batched_function_errors():
+    x = dmatrix("x")
+    f = BatchedFunction([x], pt.linalg.inv(x), max_delay=0.0)
+    np.testing.assert_allclose(f(np.eye(2) * 2), np.eye(2) / 2)
+    with pytest.raises(TypeError):
+        f(np.ones(2))
+    with pytest.raises(TypeError, match="Expected 1 arguments"):
+        f()
+    f.close()
+
+    with pytest.raises(TypeError, match="In instances"):
+        BatchedFunction([In(x)], x)
+    with pytest.raises(ValueError):
+        BatchedFunction([x], x, max_batch_size=0)
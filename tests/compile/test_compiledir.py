@@ -0,0 +1,52 @@
+import pickle
+from unittest.mock import patch
+
+import pytensor.tensor as pt
+from pytensor.compile.compiledir import precompile
+from pytensor.compile.function import function
+from pytensor.configdefaults import config
+from pytensor.graph.fg import FunctionGraph
+from pytensor.link.c import cmodule
+from pytensor.link.c.cmodule import ModuleCache
+
+
+def test_precompile(tmp_path):
+    # `compiledir` cannot be changed with `config.change_flags`, so the tests
+    # of the module cache patch it
+    compiledir = tmp_path / "compiledir"
+    compiledir.mkdir()
+    compiledir_prop = config._config_var_dict["compiledir"]
+    with (
+        patch.object(compiledir_prop, "val", str(compiledir), create=True),
+        patch.object(cmodule, "_module_cache", ModuleCache(str(compiledir))),
+    ):
+        x = pt.vector("x")
+        y = pt.vector("y")
+        graphs = [
+            FunctionGraph([x], [pt.exp(x) * 3]),
+            ([x, y], [pt.tanh(x) + y]),
+            function([x], pt.log1p(x)),
+        ]
+        graphs_path = tmp_path / "graphs.pkl"
+        with open(graphs_path, "wb") as f:
+            pickle.dump(graphs, f)
+
+        n_functions, hits, misses, compile_time = precompile(str(graphs_path))
+        assert n_functions == 3
+        assert misses > 0 and compile_time > 0
+
+        n_functions, hits, misses, compile_time = precompile(str(graphs_path))
+        assert n_functions == 3
+        assert hits > 0 and misses == 0 and compile_time == 0
+
+        module_path = tmp_path / "model.py"
+        module_path.write_text(
+            "import pytensor\n"
+            "import pytensor.tensor as pt\n"
+            "x = pt.vector('x')\n"
+            "f = pytensor.function([x], pt.exp(x) * 3)\n"
+            "g = f.maker.fgraph\n"
+        )
+        n_functions, hits, misses, compile_time = precompile(str(module_path))
+        assert n_functions == 1
+        assert hits > 0 and misses == 0
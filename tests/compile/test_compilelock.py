@@ -8,7 +8,13 @@ import time
 import filelock
 import pytest
 
-from pytensor.compile.compilelock import force_unlock, local_mem, lock_ctx
+from pytensor.compile.compilelock import (
+    force_unlock,
+    local_mem,
+    lock_ctx,
+    module_lock_ctx,
+    remove_module_lock,
+)
 
 
 def test_compilelock_force_unlock():
@@ -130,3 +136,72 @@ def test_locking_multiprocess_fork():
 def test_locking_multiprocess_spawn():
     ctx = multiprocessing.get_context("spawn")
     run_locking_test(ctx)
+
+
+def check_is_module_locked(dir_name, module_hash, q):
+    try:
+        with module_lock_ctx(module_hash, dir_name, timeout=0.1):
+            q.put("unlocked")
+    except filelock.Timeout:
+        q.put("locked")
+
+
+def get_subprocess_module_lock_state(ctx, dir_name, module_hash):
+    q = ctx.Queue()
+    p = ctx.Process(target=check_is_module_locked, args=(dir_name, module_hash, q))
+    p.start()
+    result = q.get()
+    p.join()
+    return result
+
+
+@pytest.mark.skipif(sys.platform != "linux", reason="Fork is only available on linux")
+def test_module_locking():
+    ctx = multiprocessing.get_context("fork")
+    with tempfile.TemporaryDirectory() as dir_name:
+        with module_lock_ctx("abc", dir_name):
+            assert get_subprocess_module_lock_state(ctx, dir_name, "abc") == "locked"
+            # Other modules and the whole directory can still be locked
+            assert get_subprocess_module_lock_state(ctx, dir_name, "def") == "unlocked"
+            assert get_subprocess_lock_state(ctx, dir_name) == "unlocked"
+
+            with module_lock_ctx("abc", dir_name, timeout=0.1):
+                assert (
+                    get_subprocess_module_lock_state(ctx, dir_name, "abc") == "locked"
+                )
+
+        assert get_subprocess_module_lock_state(ctx, dir_name, "abc") == "unlocked"
+
+        # Module locks are only acquired while holding the directory lock, so
+        # that `remove_module_lock` cannot delete a lock file being acquired
+        with lock_ctx(dir_name):
+            assert get_subprocess_module_lock_state(ctx, dir_name, "abc") == "locked"
+
+
+def hold_module_lock(dir_name, module_hash, locked, release):
+    with module_lock_ctx(module_hash, dir_name):
+        locked.set()
+        release.wait()
+
+
+@pytest.mark.skipif(sys.platform != "linux", reason="Fork is only available on linux")
+def test_remove_module_lock():
+    ctx = multiprocessing.get_context("fork")
+    with tempfile.TemporaryDirectory() as dir_name:
+        lock_file = os.path.join(dir_name, "lock_dir", "abc.lock")
+        assert not remove_module_lock("abc", dir_name)
+
+        locked, release = ctx.Event(), ctx.Event()
+        p = ctx.Process(
+            target=hold_module_lock, args=(dir_name, "abc", locked, release)
+        )
+        p.start()
+        locked.wait()
+        # The module is being compiled by another process
+        assert not remove_module_lock("abc", dir_name)
+        assert os.path.exists(lock_file)
+        release.set()
+        p.join()
+
+        assert remove_module_lock("abc", dir_name)
+        assert not os.path.exists(lock_file)
@@ -0,0 +1,88 @@
+import pickle
+import time
+
+import numpy as np
+import pytest
+
+import pytensor.tensor as pt
+from pytensor.compile.function import function
+from pytensor.compile.io import In
+from pytensor.compile.sharedvalue import shared
+from pytensor.compile.specializedmode import (
+    ShapeSpecializedFunction,
+    ShapeSpecializedMode,
+)
+from pytensor.tensor.shape import SpecifyShape
+from pytensor.tensor.type import dmatrix
+
+
+def test_variants():
+    x = dmatrix("x")
+    y = pt.dscalar("y")
+    s = shared(0.0, name="s")
+    f = function(
+        [x, In(y, value=2.0)],
+        pt.exp(x).sum() * y + s,
+        updates={s: s + 1},
+        mode=ShapeSpecializedMode(max_variants=2, min_calls=2, background=False),
+    )
+    assert isinstance(f, ShapeSpecializedFunction)
+
+    def expected(x_val, y_val=2.0):
+        return np.exp(x_val).sum() * y_val + s.get_value()
+
+    a, b, c = np.ones((2, 3)), np.ones((4, 1)), np.ones((1, 1))
+    expected_val = expected(a)
+    np.testing.assert_allclose(f(a), expected_val)
+    assert not f.variants
+    expected_val = expected(a)
+    np.testing.assert_allclose(f(a), expected_val)
+    assert list(f.variants) == [((2, 3), None)]
+
+    variant = f.variants[((2, 3), None)]
+    assert variant is not f
+    assert any(
+        isinstance(node.op, SpecifyShape) for node in variant.maker.fgraph.apply_nodes
+    )
+    # The variant shares the shared variables and the default values
+    expected_val = expected(a)
+    np.testing.assert_allclose(f(a), expected_val)
+    expected_val = expected(a, 3.0)
+    np.testing.assert_allclose(f(x=a, y=3.0), expected_val)
+    assert s.get_value() == 4.0
+
+    # The value set on the function is used by the next call
+    f["y"] = 5.0
+    expected_val = expected(a, 5.0)
+    np.testing.assert_allclose(f(a), expected_val)
+    expected_val = expected(a)
+    np.testing.assert_allclose(f(a), expected_val)
+
+    # The least recently used variant is dropped
+    f(b), f(b), f(a), f(c), f(c)
+    assert list(f.variants) == [((2, 3), None), ((1, 1), None)]
+
+
+def test_background():
+    x = dmatrix("x")
+    f = function(
+        [x], x.shape[0] * 2, mode=ShapeSpecializedMode(min_calls=1, background=True)
+    )
+    assert f(np.ones((3, 2))) == 6
+    for _ in range(600):
+        if f.variants:
+            break
+        time.sleep(0.1)
+    (variant,) = f.variants.values()
+    assert f(np.ones((3, 2))) == 6
+    assert f(np.ones((4, 2))) == 8
+    assert variant.maker.fgraph.outputs[0].owner.inputs[0].data == 6
+
+
+def test_mode():
+    mode = ShapeSpecializedMode(max_variants=3, min_calls=4, background=False)
+    mode = pickle.loads(pickle.dumps(mode.including("fast_run")))
+    assert (mode.max_variants, mode.min_calls, mode.background) == (3, 4, False)
+
+    with pytest.raises(ValueError):
+        ShapeSpecializedMode(min_calls=0)
@@ -0,0 +1,114 @@
+import pickle
+
+import numpy as np
+import pytest
+
+import pytensor.tensor as pt
+from pytensor.compile.compilelock import compile_thread_lock
+from pytensor.compile.function import function
+from pytensor.compile.mode import FAST_COMPILE, Mode
+from pytensor.compile.sharedvalue import shared
+from pytensor.compile.tieredmode import TieredFunction, TieredMode
+from pytensor.configdefaults import config
+from pytensor.graph.rewriting.basic import GraphRewriter
+from pytensor.link.basic import PerformLinker
+from pytensor.tensor.type import dvector
+
+
+def test_promotion():
+    x = dvector("x")
+    s = shared(np.zeros(3), name="s")
+    out = pt.exp(x) + s
+    target = Mode(linker="py", optimizer="fast_run")
+    f = function([x], out, updates={s: s + 1}, mode=TieredMode(target))
+
+    assert isinstance(f, TieredFunction)
+    assert f.maker.mode.linker is not target.linker
+
+    x_val = np.arange(3.0)
+    np.testing.assert_allclose(f(x_val), np.exp(x_val))
+    assert f.wait(timeout=60)
+    assert isinstance(f.promoted.maker.linker, PerformLinker)
+    assert f.promoted.maker.mode is target
+
+    # The state of the shared variables is kept through the promotion
+    np.testing.assert_allclose(f(x_val), np.exp(x_val) + 1)
+    np.testing.assert_allclose(s.get_value(), np.full(3, 2.0))
+    np.testing.assert_allclose(f(x=x_val), np.exp(x_val) + 2)
+
+
+def test_default_values():
+    x = dvector("x")
+    y = pt.dscalar("y")
+    f = function(
+        [x, (y, 1.0)], x * y, mode=TieredMode(Mode(linker="py", optimizer="fast_run"))
+    )
+    assert f.wait(timeout=60)
+    np.testing.assert_allclose(f([1.0, 2.0]), [1.0, 2.0])
+    f["y"] = 3.0
+    np.testing.assert_allclose(f([1.0, 2.0]), [3.0, 6.0])
+    np.testing.assert_allclose(f([1.0, 2.0], 2.0), [2.0, 4.0])
+
+
+def test_failed_promotion():
+    class FailingRewriter(GraphRewriter):
+        def apply(self, fgraph):
+            raise RuntimeError("rewrite failed")
+
+    x = dvector("x")
+    f = function(
+        [x], x * 2, mode=TieredMode(Mode(linker="py", optimizer=FailingRewriter()))
+    )
+    assert not f.wait(timeout=60)
+    assert f.promoted is None
+    np.testing.assert_allclose(f([1.0, 2.0]), [2.0, 4.0])
+
+
+def test_promotion_waits_for_other_compilations():
+    x = dvector("x")
+    with compile_thread_lock:
+        f = function(
+            [x], x * 2, mode=TieredMode(Mode(linker="py", optimizer="fast_run"))
+        )
+        # The second tier is not compiled while this thread compiles
+        assert not f.wait(timeout=0.5)
+    assert f.wait(timeout=60)
+    np.testing.assert_allclose(f([1.0, 2.0]), [2.0, 4.0])
+
+
+def test_target_flags():
+    """The second tier is compiled with the config of the caller."""
+    x = dvector("x")
+    with config.change_flags(on_unused_input="ignore"):
+        f = function(
+            [x, pt.dscalar("y")],
+            x * 2,
+            mode=TieredMode(Mode(linker="py", optimizer="fast_run")),
+        )
+    assert f.wait(timeout=60)
+    np.testing.assert_allclose(f([1.0, 2.0], 0.0), [2.0, 4.0])
+
+
+def test_mode():
+    mode = TieredMode("FAST_RUN")
+    assert mode.provided_linker is FAST_COMPILE.provided_linker
+    assert mode.including("fast_run").target == "FAST_RUN"
+
+    mode = pickle.loads(pickle.dumps(mode))
+    assert mode.target == "FAST_RUN"
+
+    with pytest.raises(ValueError):
+        TieredMode(mode)
+
+
+def test_pickle():
+    x = dvector("x")
+    f = function(
+        [x], pt.exp(x), mode=TieredMode(Mode(linker="py", optimizer="fast_run"))
+    )
+    f.wait(timeout=60)
+
+    g = pickle.loads(pickle.dumps(f))
+    assert isinstance(g, TieredFunction)
+    assert g.wait(timeout=60)
+    np.testing.assert_allclose(g([0.0, 1.0]), np.exp([0.0, 1.0]))
@@ -23,6 +23,7 @@ from pytensor.graph.basic import (
     io_toposort,
     list_of_nodes,
     orphans_between,
+    structural_hash,
     truncated_graph_inputs,
     variable_depends_on,
     vars_between,
@@ -438,6 +439,43 @@ def test_equal_computations():
     assert equal_computations(max_argmax1, max_argmax2)
 
 
+def test_structural_hash():
+    a, b = iscalars(2)
+
+    x1 = pt.exp(a + b) * 2
+    x2 = pt.exp(a + b) * 2
+    assert structural_hash([x1]) == structural_hash([x2])
+    assert structural_hash([x1]) != structural_hash([pt.exp(a + b) * 3])
+    assert structural_hash([x1]) != structural_hash([pt.exp(b + a) * 2])
+
+    # Inputs are hashed by position
+    c, d = iscalars(2)
+    y = pt.exp(c + d) * 2
+    assert structural_hash([x1]) != structural_hash([y])
+    assert structural_hash([x1], inputs=[a, b]) == structural_hash([y], inputs=[c, d])
+    assert structural_hash([x1], inputs=[a, b]) != structural_hash([y], inputs=[d, c])
+
+    # Constants are hashed by value
+    assert structural_hash([pt.as_tensor(np.r_[2, 1])]) == structural_hash(
+        [pt.as_tensor(np.r_[2, 1])]
+    )
+    assert structural_hash([pt.as_tensor(np.r_[2, 1])]) != structural_hash(
+        [pt.as_tensor(np.r_[1, 2])]
+    )
+
+    m = matrix()
+    max_argmax1 = max_and_argmax(m)
+    max_argmax2 = max_and_argmax(m)
+    hashes = structural_hash(max_argmax1 + max_argmax2)
+    assert hashes[:2] == hashes[2:]
+    assert hashes[0] != hashes[1]
+
+    memo = {}
+    structural_hash([x1], memo=memo)
+    assert memo[x1] == structural_hash([x1])[0]
+    assert a in memo and x1.owner.inputs[0] in memo
+
+
 def test_walk():
     r1, r2, r3 = MyVariable(1), MyVariable(2), MyVariable(3)
     o1 = MyOp(r1, r2)
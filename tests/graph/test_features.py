@@ -1,11 +1,17 @@
 import pytest
 
 from pytensor.graph.basic import Apply, Variable
-from pytensor.graph.features import Feature, NodeFinder, ReplaceValidate
+from pytensor.graph.features import (
+    AlreadyThere,
+    Feature,
+    NodeFinder,
+    ReplaceValidate,
+    StructuralHashFeature,
+)
 from pytensor.graph.fg import FunctionGraph
 from pytensor.graph.op import Op
 from pytensor.graph.type import Type
-from tests.graph.utils import MyVariable, op1
+from tests.graph.utils import MyVariable, op1, op2
 
 
 class TestNodeFinder:
@@ -119,3 +125,46 @@ class TestReplaceValidate:
 
         capres = capsys.readouterr()
         assert "rewriting: validate failed on node Op1.0" in capres.out
+
+
+class TestStructuralHashFeature:
+    def test_graph_hash(self):
+        x, y = MyVariable("x"), MyVariable("y")
+        fg1 = FunctionGraph([x, y], [op1(op2(x, y), y)], clone=False)
+        fg2 = fg1.clone()
+        fg3 = FunctionGraph([x, y], [op1(op2(y, x), y)], clone=False)
+        for fg in (fg1, fg2, fg3):
+            fg.attach_feature(StructuralHashFeature())
+
+        assert fg1.structural_hash_feature.graph_hash() == (
+            fg2.structural_hash_feature.graph_hash()
+        )
+        assert fg1.structural_hash_feature.graph_hash() != (
+            fg3.structural_hash_feature.graph_hash()
+        )
+
+    def test_replace(self):
+        x, y = MyVariable("x"), MyVariable("y")
+        inner = op2(x, y)
+        out = op1(inner, y)
+        fg = FunctionGraph([x, y], [out], clone=False)
+        fg.attach_feature(StructuralHashFeature())
+        feature = fg.structural_hash_feature
+
+        old_hash = feature.graph_hash()
+        old_out_hash = feature.variable_hash(out)
+        fg.replace(inner, op2(y, x))
+        assert feature.graph_hash() != old_hash
+        assert feature.variable_hash(out) != old_out_hash
+
+        fg.replace(fg.outputs[0].owner.inputs[0], op2(x, y))
+        assert feature.graph_hash() == old_hash
+        assert feature.variable_hash(fg.outputs[0]) == old_out_hash
+
+    def test_already_there(self):
+        fg = FunctionGraph([], [], clone=False)
+        feature = StructuralHashFeature()
+        fg.attach_feature(feature)
+        with pytest.raises(AlreadyThere):
+            StructuralHashFeature().on_attach(fg)
+        assert fg.structural_hash_feature is feature
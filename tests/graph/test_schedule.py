@@ -0,0 +1,134 @@
+import warnings
+
+import numpy as np
+import pytest
+
+import pytensor.tensor as pt
+from pytensor.compile.function import function
+from pytensor.compile.mode import Mode
+from pytensor.compile.profiling import ProfileStats
+from pytensor.configdefaults import config
+from pytensor.graph.fg import FunctionGraph
+from pytensor.graph.schedule import (
+    MemoryScheduler,
+    estimate_sizes,
+    memory_schedule,
+    peak_memory,
+)
+from pytensor.link.vm import Loop, VMLinker
+from pytensor.tensor.type import dvector, matrix
+
+
+def two_reductions():
+    """Two independent large intermediate results reduced to scalars."""
+    x = dvector("x")
+    y = dvector("y")
+    a = pt.outer(x, x).sum()
+    b = pt.outer(y, y).sum()
+    return [x, y], [a + b]
+
+
+def test_estimate_sizes():
+    x = matrix("x", shape=(3, None), dtype="float32")
+    y = x.T
+    fg = FunctionGraph([x], [y], clone=False)
+    sizes = estimate_sizes(fg, default_dim=5)
+    assert sizes[x] == 3 * 5 * 4
+    assert sizes[y] == 3 * 5 * 4
+
+
+def test_memory_schedule():
+    inputs, outputs = two_reductions()
+    fg = FunctionGraph(inputs, outputs, clone=False)
+    sizes = estimate_sizes(fg)
+    order = memory_schedule(fg, sizes)
+
+    assert set(order) == set(fg.apply_nodes)
+    seen = set()
+    for node in order:
+        assert all(inp.owner is None or inp.owner in seen for inp in node.inputs)
+        seen.add(node)
+    assert peak_memory(fg, order, sizes) <= peak_memory(fg, fg.toposort(), sizes)
+
+
+def test_memory_schedule_views():
+    x = dvector("x")
+    big = pt.outer(x, x)
+    # The transpose is a view of `big`, which is only freed after its last use
+    out = big.T.sum() + (big * 2).sum()
+    fg = FunctionGraph([x], [out], clone=False)
+    sizes = estimate_sizes(fg)
+    order = memory_schedule(fg, sizes)
+    assert len(order) == len(fg.apply_nodes)
+    assert peak_memory(fg, order, sizes) >= 2 * sizes[big]
+
+
+def test_linker_schedule():
+    inputs, outputs = two_reductions()
+    x_val = np.arange(4.0)
+    y_val = np.arange(4.0, 8.0)
+    expected = np.outer(x_val, x_val).sum() + np.outer(y_val, y_val).sum()
+
+    mode = Mode(linker=VMLinker(use_cloop=True, schedule=MemoryScheduler()))
+    with pytest.warns(UserWarning, match="memory schedule"):
+        f = function(inputs, outputs, mode=mode)
+    assert isinstance(f.vm, Loop)
+    np.testing.assert_allclose(f(x_val, y_val)[0], expected)
+
+    with config.change_flags(vm__schedule="memory"):
+        with pytest.warns(UserWarning, match="memory schedule"):
+            f = function(inputs, outputs, mode=Mode(linker="cvm"))
+    assert isinstance(f.vm, Loop)
+    np.testing.assert_allclose(f(x_val, y_val)[0], expected)
+
+
+@pytest.mark.skipif(
+    not config.cxx, reason="G++ not available, so we need to skip this test."
+)
+def test_linker_other_schedule_uses_cvm():
+    from pytensor.link.c.cvm import CVM
+
+    inputs, outputs = two_reductions()
+    mode = Mode(linker=VMLinker(use_cloop=True, schedule=lambda fg: fg.toposort()))
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        f = function(inputs, outputs, mode=mode)
+    assert isinstance(f.vm, CVM)
+
+
+def test_memory_scheduler_profile():
+    x = dvector("x")
+    y = dvector("y")
+    a = pt.exp(x)
+    b_sum = pt.exp(y).sum()
+    # `a` is kept alive by its view until the last node, so the peak memory is
+    # lower when `exp(y)` is computed and reduced first, if it is smaller
+    out = b_sum * a[:1]
+
+    profile = ProfileStats(atexit_print=False)
+    with config.change_flags(profile=True, profile_memory=True):
+        f = function(
+            [x, y],
+            out,
+            mode=Mode(linker=VMLinker(use_cloop=False), optimizer=None),
+            profile=profile,
+        )
+        f(np.ones(1000), np.ones(2))
+
+    def first_exp_input(scheduler):
+        # A new compilation works on a copy of the profiled graph
+        orders = []
+
+        def schedule(fgraph):
+            orders.append(scheduler(fgraph))
+            return orders[-1]
+
+        mode = Mode(linker=VMLinker(schedule=schedule), optimizer=None)
+        g = function([x, y], out, mode=mode)
+        (order,) = orders
+        first_exp = next(node for node in order if node.op == a.owner.op)
+        return g.maker.fgraph.inputs.index(first_exp.inputs[0])
+
+    # Without the profile, both vectors have the same estimated size
+    assert first_exp_input(MemoryScheduler()) == 0
+    assert first_exp_input(MemoryScheduler(profile=profile)) == 1
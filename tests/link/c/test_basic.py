@@ -492,3 +492,38 @@ def test_cmodule_key_empty_props():
     key = linker.cmodule_key()
     # None of the C version values should be empty
     assert all(kv for kv in key[0])
+
+
+class AddNoGIL(Binary):
+    def c_code_release_gil(self, node):
+        return True
+
+    def c_code(self, node, name, inp, out, sub):
+        x, y = inp
+        (z,) = out
+        return f"""
+        {sub["begin_nogil"]}
+        {z} = {x} + {y};
+        {sub["end_nogil"]}
+        """
+
+    def impl(self, x, y):
+        return x + y
+
+
+add_nogil = AddNoGIL()
+
+
+@pytest.mark.skipif(
+    not config.cxx, reason="G++ not available, so we need to skip this test."
+)
+@pytest.mark.parametrize("release_gil", [True, False])
+def test_c_code_release_gil(release_gil):
+    x, y, z = inputs()
+    e = add_nogil(add(x, y), z)
+    with config.change_flags(cmodule__release_gil=release_gil):
+        lnk = CLinker().accept(FunctionGraph([x, y, z], [e]))
+        src = lnk.get_src_code()
+        assert src.count("Py_BEGIN_ALLOW_THREADS") == int(release_gil)
+        fn = make_function(lnk)
+        assert fn(2.0, 3.0, 4.0) == 9.0
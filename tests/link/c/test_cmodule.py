@@ -8,8 +8,10 @@ deterministic based on the input type and the op.
 import multiprocessing
 import os
 import re
+import shutil
 import sys
 import tempfile
+import time
 from unittest.mock import MagicMock, patch
 
 import numpy as np
@@ -23,7 +25,12 @@ from pytensor.configdefaults import config
 from pytensor.graph.basic import Apply
 from pytensor.graph.fg import FunctionGraph
 from pytensor.link.c.basic import CLinker
-from pytensor.link.c.cmodule import GCC_compiler, ModuleCache, default_blas_ldflags
+from pytensor.link.c.cmodule import (
+    GCC_compiler,
+    ModuleCache,
+    default_blas_ldflags,
+    get_module_hash,
+)
 from pytensor.link.c.exceptions import CompileError
 from pytensor.link.c.op import COp
 from pytensor.tensor.type import dvectors, vector
@@ -394,3 +401,244 @@ def test_cache_race_condition():
                 assert not any(
                     exit_code != 0 for exit_code in [proc.exitcode for proc in procs]
                 )
+
+
+class MyAddBroken(MyAddVersioned):
+    def c_code(self, node, name, inp, out, sub):
+        return "this is not C++;"
+
+
+def test_compile_many():
+    x = vector("x")
+    outs = [MyAddVersioned()(x), pt.exp(x), pt.log(x), MyAddBroken()(x)]
+
+    with tempfile.TemporaryDirectory() as dir_name:
+        cache = ModuleCache(dir_name)
+        keys_and_linkers = []
+        for out in outs:
+            lnk = CLinker().accept(FunctionGraph([x], [out]))
+            keys_and_linkers.append((lnk.cmodule_key(), lnk))
+
+        # The failure is not raised here, but when the module is requested
+        cache.compile_many(keys_and_linkers, n_workers=4)
+        assert cache.stats[2] == 3
+
+        for key, lnk in keys_and_linkers[:-1]:
+            assert key in cache.entry_from_key
+            cache.module_from_key(key, lnk)
+        assert cache.stats[2] == 3
+
+        key, lnk = keys_and_linkers[-1]
+        assert key not in cache.entry_from_key
+        with pytest.raises(CompileError):
+            cache.module_from_key(key, lnk)
+
+        # The modules are found by a fresh cache in the same directory
+        other_cache = ModuleCache(dir_name)
+        for key, lnk in keys_and_linkers[:-1]:
+            other_cache.module_from_key(key, lnk)
+        assert other_cache.stats[2] == 0
+
+
+def test_module_from_key_other_process():
+    """Modules compiled by another `ModuleCache` are loaded without refreshing or locking."""
+    x = vector("x")
+    fgraph = FunctionGraph([x], [MyAddVersioned()(x)])
+
+    with tempfile.TemporaryDirectory() as dir_name:
+        cache = ModuleCache(dir_name)
+        other_cache = ModuleCache(dir_name)
+
+        lnk = CLinker().accept(fgraph)
+        key = lnk.cmodule_key()
+        module = cache.module_from_key(key, lnk)
+        assert cache.stats[2] == 1
+        assert os.path.dirname(module.__file__) == os.path.join(
+            dir_name, get_module_hash(lnk.get_src_code(), key)
+        )
+
+        other_lnk = CLinker().accept(fgraph)
+        with (
+            patch.object(other_cache, "refresh", side_effect=AssertionError),
+            patch("pytensor.link.c.cmodule.lock_ctx", side_effect=AssertionError),
+        ):
+            other_module = other_cache.module_from_key(key, other_lnk)
+        assert other_cache.stats[2] == 0
+        assert other_module.__file__ == module.__file__
+        assert key in other_cache.entry_from_key
+
+
+def test_module_cache_index():
+    x = vector("x")
+    linkers = [
+        CLinker().accept(FunctionGraph([x], [out]))
+        for out in (MyAddVersioned()(x), pt.exp(x))
+    ]
+
+    with tempfile.TemporaryDirectory() as dir_name:
+        cache = ModuleCache(dir_name)
+        # The cache was empty, so the (empty) index was created by `refresh`
+        assert os.path.exists(os.path.join(dir_name, cache.index_filename))
+        modules = [cache.module_from_key(lnk.cmodule_key(), lnk) for lnk in linkers]
+
+        # A new cache reads the index instead of refreshing, and only loads
+        # the keys of the modules it uses
+        with patch.object(ModuleCache, "refresh", side_effect=AssertionError):
+            other_cache = ModuleCache(dir_name)
+        assert other_cache.entry_from_key == {}
+        assert sorted(other_cache.module_hash_to_entry.values()) == sorted(
+            m.__file__ for m in modules
+        )
+        lnk = linkers[0]
+        assert other_cache.module_from_key(lnk.cmodule_key(), lnk) is modules[0]
+        assert other_cache.stats[2] == 0
+        assert len(other_cache.loaded_key_pkl) == 1
+
+        # Modules that were not accessed for too long are deleted from the
+        # disk and the index
+        old_entry = modules[1].__file__
+        os.utime(old_entry, (0, 0))
+        with patch.object(
+            pytensor.link.c.cmodule.time, "time", return_value=time.time() + 3600
+        ):
+            other_cache.clear_old(age_thresh_del=60)
+        assert not os.path.exists(old_entry)
+        assert list(ModuleCache(dir_name).module_hash_to_entry.values()) == [
+            modules[0].__file__
+        ]
+
+        # Without an index, the cache is refreshed and the index rebuilt
+        os.remove(os.path.join(dir_name, cache.index_filename))
+        new_cache = ModuleCache(dir_name)
+        assert len(new_cache.entry_from_key) == 1
+        assert list(ModuleCache(dir_name).module_hash_to_entry.values()) == [
+            modules[0].__file__
+        ]
+
+
+def test_module_cache_periodic_refresh():
+    with tempfile.TemporaryDirectory() as dir_name:
+        ModuleCache(dir_name)
+        failed_dir = os.path.join(dir_name, "tmp_failed")
+        os.mkdir(failed_dir)
+        open(os.path.join(failed_dir, "delete.me"), "w").close()
+
+        # The index is used as long as the last refresh is recent enough
+        ModuleCache(dir_name)
+        assert os.path.exists(failed_dir)
+
+        stamp = os.path.join(dir_name, ModuleCache.refresh_stamp_filename)
+        old_time = time.time() - ModuleCache.refresh_interval - 60
+        os.utime(stamp, (old_time, old_time))
+        ModuleCache(dir_name)
+        assert not os.path.exists(failed_dir)
+        assert os.path.getmtime(stamp) > old_time
+
+
+def test_module_cache_trim():
+    x = vector("x")
+    outs = [pt.exp(x), pt.log(x), pt.sin(x)]
+
+    with tempfile.TemporaryDirectory() as dir_name:
+        cache = ModuleCache(dir_name)
+        for out in outs:
+            lnk = CLinker().accept(FunctionGraph([x], [out]))
+            cache.module_from_key(lnk.cmodule_key(), lnk)
+
+        other_cache = ModuleCache(dir_name)
+        index = other_cache._read_index()
+        sizes = {e.entry: e.size for e in index.values()}
+        assert len(sizes) == 3 and all(size > 0 for size in sizes.values())
+        lru_first = sorted(index.values(), key=lambda e: e.last_access)
+
+        assert other_cache.trim(max_size=0) == 0
+        assert other_cache.trim(max_size=sum(sizes.values())) == 0
+
+        # Only the least recently used module has to go
+        max_size = sum(sizes.values()) - 1
+        assert other_cache.trim(max_size=max_size) == lru_first[0].size
+        assert not os.path.exists(lru_first[0].entry)
+        assert sorted(ModuleCache(dir_name).module_hash_to_entry.values()) == sorted(
+            e.entry for e in lru_first[1:]
+        )
+
+        # Modules loaded by the process are kept
+        with config.change_flags(cmodule__max_size=0):
+            assert other_cache.trim() == 0
+        other_cache._get_module(lru_first[1].entry)
+        assert other_cache.trim(max_size=1) == lru_first[2].size
+        assert os.path.exists(lru_first[1].entry)
+
+
+def test_module_cache_trim_deleted_module():
+    """Modules whose directory was deleted by hand are dropped from the index."""
+    x = vector("x")
+    outs = [pt.exp(x), pt.log(x)]
+
+    with tempfile.TemporaryDirectory() as dir_name:
+        cache = ModuleCache(dir_name)
+        modules = []
+        for out in outs:
+            lnk = CLinker().accept(FunctionGraph([x], [out]))
+            modules.append(cache.module_from_key(lnk.cmodule_key(), lnk))
+
+        shutil.rmtree(os.path.dirname(modules[0].__file__))
+        other_cache = ModuleCache(dir_name)
+        assert other_cache.trim(max_size=1) > 0
+        assert not os.path.exists(modules[1].__file__)
+        assert other_cache._read_index() == {}
+        # The lock files of the deleted modules are deleted too
+        assert os.listdir(os.path.join(dir_name, "lock_dir")) == []
+
+
+def test_module_cache_readonly_layers():
+    x = vector("x")
+    outs = [pt.exp(x), pt.log(x), pt.sin(x)]
+    linkers = [CLinker().accept(FunctionGraph([x], [out])) for out in outs]
+
+    def snapshot(dir_name):
+        return {
+            os.path.join(root, name): os.stat(os.path.join(root, name)).st_mtime_ns
+            for root, _, files in os.walk(dir_name)
+            for name in files
+        }
+
+    with (
+        tempfile.TemporaryDirectory() as layer_dir,
+        tempfile.TemporaryDirectory() as dir_name,
+    ):
+        layer_cache = ModuleCache(layer_dir)
+        for lnk in linkers[:2]:
+            layer_cache.module_from_key(lnk.cmodule_key(), lnk)
+        layer_content = snapshot(layer_dir)
+
+        cache = ModuleCache(dir_name, readonly_layers=[layer_dir])
+        with (
+            patch("pytensor.link.c.cmodule.lock_ctx", side_effect=AssertionError),
+            patch(
+                "pytensor.link.c.cmodule.module_lock_ctx", side_effect=AssertionError
+            ),
+        ):
+            for lnk in linkers[:2]:
+                module = cache.module_from_key(lnk.cmodule_key(), lnk)
+                assert module.__file__.startswith(layer_dir)
+        assert cache.stats[2] == 0
+
+        # Modules missing from the layers are compiled into the top layer
+        module = cache.module_from_key(linkers[2].cmodule_key(), linkers[2])
+        assert module.__file__.startswith(dir_name)
+        assert cache.stats[2] == 1
+
+        cache.refresh()
+        cache.clear_old(age_thresh_del=0)
+        assert cache.trim(max_size=1) == 0
+        assert snapshot(layer_dir) == layer_content
+        assert [entry.entry for entry in cache._read_index().values()] == [
+            module.__file__
+        ]
+
+        # The cache directory itself is never used as a read-only layer
+        same_cache = ModuleCache(
+            os.path.join(dir_name, ""), readonly_layers=[os.path.realpath(dir_name)]
+        )
+        assert same_cache.readonly_layers == []
@@ -1,3 +1,4 @@
+import inspect
 from collections.abc import Iterable
 from functools import partial
 from typing import Callable, Optional
@@ -197,6 +198,23 @@ def test_jax_ifelse():
     compare_jax_and_py(x_fg, [get_test_value(i) for i in x_fg.inputs])
 
 
+def test_jax_ifelse_lazy():
+    """The nodes only needed by one branch are computed inside `jax.lax.cond`."""
+    a = dscalar("a")
+    x = vector("x")
+    inner = ifelse(a > 1, x.sum() * 2, x.prod())
+    out = ifelse(a > 0, [inner + a, x * 2], [a - 1, x + x.sum()])
+    out_fg = FunctionGraph([a, x], out)
+
+    x_val = np.array([1.0, 2.0, 3.0], dtype=config.floatX)
+    for a_val in (-1.0, 0.5, 2.0):
+        compare_jax_and_py(out_fg, [np.array(a_val), x_val])
+
+    fn = function([a, x], out, mode=jax_mode)
+    fn_src = inspect.getsource(fn.vm.jit_fn.__wrapped__)
+    assert fn_src.count("def if_else") == 4
+
+
 def test_jax_checkandraise():
     p = scalar()
     p.tag.test_value = 0
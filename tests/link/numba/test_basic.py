@@ -35,6 +35,7 @@ from pytensor.tensor import blas
 from pytensor.tensor import subtensor as pt_subtensor
 from pytensor.tensor.elemwise import Elemwise
 from pytensor.tensor.shape import Reshape, Shape, Shape_i, SpecifyShape
+from pytensor.tensor.type_other import NoneConst
 
 
 if TYPE_CHECKING:
@@ -430,6 +431,22 @@ def test_AdvancedSubtensor1_out_of_bounds():
             pt.as_tensor(np.arange(3 * 4 * 5).reshape((3, 4, 5))),
             ([1, 2], slice(None), [3, 4]),
         ),
+        (
+            pt.as_tensor(np.arange(3 * 4 * 5).reshape((3, 4, 5))),
+            (slice(1, None), [[-1], [2]], [0, -2, 3]),
+        ),
+        (
+            pt.as_tensor(np.arange(3 * 4 * 5).reshape((3, 4, 5))),
+            (1, slice(None, None, -1), [0, 4]),
+        ),
+        (
+            pt.as_tensor(np.arange(3 * 4 * 5).reshape((3, 4, 5))),
+            (np.arange(3 * 4).reshape((3, 4)) % 3 == 0,),
+        ),
+        (
+            pt.as_tensor(np.arange(3 * 4 * 5).reshape((3, 4, 5))),
+            ([2, 0, 1], slice(None), np.array([True, False, False, True, True])),
+        ),
     ],
 )
 def test_AdvancedSubtensor(x, indices):
@@ -440,6 +457,33 @@ def test_AdvancedSubtensor(x, indices):
     compare_numba_and_py(out_fg, [])
 
 
+@pytest.mark.parametrize(
+    "indices",
+    [
+        ([1, 3], [0, 1]),
+        ([1, 2], [[0], [1]], [0, 5]),
+        (np.ones((3, 5), dtype=bool),),
+    ],
+)
+def test_AdvancedSubtensor_invalid_indices(indices):
+    x = pt.as_tensor(np.arange(3 * 4 * 5).reshape((3, 4, 5)))
+    out_pt = x[indices]
+    assert isinstance(out_pt.owner.op, pt_subtensor.AdvancedSubtensor)
+    out_fg = FunctionGraph([], [out_pt])
+    with pytest.raises(IndexError):
+        compare_numba_and_py(out_fg, [])
+
+
+def test_AdvancedSubtensor_newaxis():
+    """New axes are evaluated by the `Op.perform` method in object mode."""
+    x = pt.matrix("x")
+    out_pt = pt_subtensor.advanced_subtensor(x, [0, 1], NoneConst, [1, 0])
+    with pytest.warns(UserWarning, match="object mode"):
+        compare_numba_and_py(
+            ([x], [out_pt]), [np.arange(4.0, dtype=config.floatX).reshape((2, 2))]
+        )
+
+
 @pytest.mark.parametrize(
     "x, y, indices",
     [
@@ -534,6 +578,16 @@ def test_AdvancedIncSubtensor1(x, y, indices):
             pt.as_tensor(rng.poisson(size=(2, 5))),
             ([1, 1], [2, 2]),
         ),
+        (
+            pt.as_tensor(np.arange(3 * 4 * 5).reshape((3, 4, 5))),
+            pt.as_tensor(rng.poisson(size=(5,))),
+            ([0, 0, 2, -1], [1, 1, -2, 1]),
+        ),
+        (
+            pt.as_tensor(np.arange(3 * 4 * 5).reshape((3, 4, 5))),
+            pt.as_tensor(rng.poisson(size=(3, 2))),
+            (slice(None), [[1], [1], [2]], np.array([False, True, True, False, False])),
+        ),
     ],
 )
 def test_AdvancedIncSubtensor(x, y, indices):
@@ -547,6 +601,11 @@ def test_AdvancedIncSubtensor(x, y, indices):
     out_fg = FunctionGraph([], [out_pt])
     compare_numba_and_py(out_fg, [])
 
+    out_pt = pt.inc_subtensor(x[indices], y, ignore_duplicates=True)
+    assert isinstance(out_pt.owner.op, pt_subtensor.AdvancedIncSubtensor)
+    out_fg = FunctionGraph([], [out_pt])
+    compare_numba_and_py(out_fg, [])
+
     x_pt = x.type()
     out_pt = pt.set_subtensor(x_pt[indices], y)
     # Inplace isn't really implemented for `AdvancedIncSubtensor`, so we just
@@ -556,6 +615,20 @@ def test_AdvancedIncSubtensor(x, y, indices):
     out_fg = FunctionGraph([x_pt], [out_pt])
     compare_numba_and_py(out_fg, [x.data])
 
+    out_pt = pt.inc_subtensor(x_pt[indices], y, ignore_duplicates=True)
+    out_pt.owner.op.inplace = True
+    assert isinstance(out_pt.owner.op, pt_subtensor.AdvancedIncSubtensor)
+    out_fg = FunctionGraph([x_pt], [out_pt])
+    compare_numba_and_py(out_fg, [x.data])
+
+
+def test_AdvancedIncSubtensor_ignore_duplicates():
+    """The last increment of a duplicated index wins, like ``x[idx] += y``."""
+    x = pt.dvector("x")
+    out = pt.inc_subtensor(x[[0, 0, 1]], np.ones(3), ignore_duplicates=True)
+    fn = function([x], out, mode=numba_mode)
+    np.testing.assert_array_equal(fn(np.zeros(3)), [1.0, 1.0, 0.0])
+
 
 @pytest.mark.parametrize(
     "x, i",
@@ -1006,6 +1079,36 @@ def test_IfElse(inputs, cond_fn, true_vals, false_vals):
     compare_numba_and_py(out_fg, [get_test_value(i) for i in out_fg.inputs])
 
 
+def test_IfElse_lazy():
+    """Only the branch of an `IfElse` selected by the condition is evaluated."""
+    x = pt.dvector("x")
+    true_val = assert_op(pt.exp(x), pt.all(x > 0))
+    false_val = assert_op(pt.log(-x), pt.all(x < 0))
+    out = ifelse(pt.all(x > 0), true_val, false_val)
+
+    fn = function([x], out, mode=numba_mode)
+    np.testing.assert_allclose(fn(np.array([1.0, 2.0])), np.exp([1.0, 2.0]))
+    np.testing.assert_allclose(fn(np.array([-1.0, -2.0])), np.log([1.0, 2.0]))
+    with pytest.raises(AssertionError):
+        fn(np.array([1.0, -2.0]))
+
+
+def test_IfElse_lazy_destroyed_view():
+    """A branch reading a view of a variable that is later updated in place is not delayed."""
+    c = pt.scalar("c", dtype="bool")
+    x = pt.dvector("x")
+    a = pt.exp(x)
+    out = ifelse(c, a[1:].sum(), pt.constant(0.0, dtype="float64"))
+    destroy_out = Elemwise(ps.add, {0: 0})(a, pt.constant(1.0))
+
+    compare_numba_and_py(
+        ([c, x], [out, destroy_out]),
+        [np.array(True), np.array([0.0, 1.0, 2.0])],
+        numba_mode=Mode(NumbaLinker(), optimizer=None),
+        py_mode=Mode("py", optimizer=None),
+    )
+
+
 @pytest.mark.xfail(reason="https://github.com/numba/numba/issues/7409")
 def test_config_options_parallel():
     x = pt.dvector()
@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+
+from pytensor import config, function
+from pytensor.tensor import tensor
+from pytensor.tensor.blockwise import Blockwise, safe_signature
+from pytensor.tensor.nlinalg import SLogDet
+from pytensor.tensor.slinalg import Cholesky, Solve
+from tests.link.numba.test_basic import compare_numba_and_py, numba_mode
+
+
+rng = np.random.default_rng(sum(map(ord, "numba_blockwise")))
+
+
+def posdef(batch_shape, m):
+    x = rng.normal(size=(*batch_shape, m, m))
+    return np.einsum("...ij,...kj->...ik", x, x) + np.eye(m)
+
+
+@pytest.mark.parametrize("parallel", [False, True])
+@pytest.mark.parametrize("batch_shape", [(), (5,), (3, 0), (3, 4)])
+def test_blockwise_cholesky(batch_shape, parallel):
+    x = tensor("x", shape=(*batch_shape, 4, 4))
+    out = Blockwise(Cholesky(lower=True))(x)
+    target = "parallel" if parallel else "cpu"
+    with config.change_flags(numba__vectorize_target=target):
+        compare_numba_and_py(([x], [out]), [posdef(batch_shape, 4)])
+
+
+@pytest.mark.parametrize("b_ndim", [1, 2])
+def test_blockwise_solve_broadcast(b_ndim):
+    a = tensor("a", shape=(None, 1, 3, 3))
+    b = tensor("b", shape=(1, None, 3) + (2,) * (b_ndim - 1))
+    out = Blockwise(Solve(b_ndim=b_ndim))(a, b)
+    compare_numba_and_py(
+        ([a, b], [out]),
+        [posdef((4, 1), 3), rng.normal(size=(1, 5, 3) + (2,) * (b_ndim - 1))],
+    )
+
+
+def test_blockwise_multiple_outputs():
+    x = tensor("x", shape=(None, None, 3, 3))
+    outs = Blockwise(SLogDet())(x)
+    compare_numba_and_py(([x], outs), [posdef((2, 5), 3)])
+
+
+def test_blockwise_unknown_core_shapes():
+    x = tensor("x", shape=(None, None, None))
+    core_x = tensor(shape=(None, None))
+    core_op = Cholesky(lower=False)
+    signature = safe_signature([core_x], [core_op(core_x)])
+    out = Blockwise(core_op, signature=signature)(x)
+    compare_numba_and_py(([x], [out]), [posdef((6,), 3)])
+
+    fn = function([x], out, mode=numba_mode)
+    with pytest.raises(ValueError, match="unknown for empty batch dimensions"):
+        fn(np.zeros((0, 3, 3)))
+
+
+def test_blockwise_incompatible_batch_shapes():
+    a = tensor("a", shape=(None, 3, 3))
+    b = tensor("b", shape=(None, 3))
+    out = Blockwise(Solve(b_ndim=1))(a, b)
+    fn = function([a, b], out, mode=numba_mode)
+    with pytest.raises(ValueError, match="incompatible batch dimensions"):
+        fn(posdef((4,), 3), np.ones((1, 3)))
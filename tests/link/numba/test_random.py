@@ -581,17 +581,114 @@ def test_RandomState_updates():
     assert np.allclose(res, ref)
 
 
-def test_random_Generator():
+@pytest.mark.parametrize(
+    "rv_op, dist_args, size",
+    [
+        (
+            ptr.normal,
+            [
+                set_test_value(pt.dvector(), np.array([1.0, 2.0])),
+                set_test_value(pt.dscalar(), np.array(1.0)),
+            ],
+            pt.as_tensor([3, 2]),
+        ),
+        (
+            ptr.normal,
+            [
+                set_test_value(pt.dvector(), np.array([1.0, 2.0])),
+                set_test_value(pt.dmatrix(), np.array([[1.0], [2.0]])),
+            ],
+            None,
+        ),
+        (
+            ptr.standard_normal,
+            [],
+            None,
+        ),
+        (
+            ptr.t,
+            [
+                set_test_value(pt.dscalar(), np.array(3.0)),
+                set_test_value(pt.dvector(), np.array([1.0, 2.0])),
+                set_test_value(pt.dscalar(), np.array(2.0)),
+            ],
+            (4, 2),
+        ),
+        (
+            ptr.bernoulli,
+            [set_test_value(pt.dvector(), np.array([0.2, 0.7]))],
+            None,
+        ),
+        (
+            ptr.integers,
+            [
+                set_test_value(pt.lscalar(), np.array(-3, dtype=np.int64)),
+                set_test_value(pt.lvector(), np.array([5, 10], dtype=np.int64)),
+            ],
+            (3, 2),
+        ),
+        (
+            ptr.nbinom,
+            [
+                set_test_value(pt.lscalar(), np.array(10, dtype=np.int64)),
+                set_test_value(pt.dvector(), np.array([0.3, 0.8])),
+            ],
+            None,
+        ),
+        (
+            ptr.laplace,
+            [
+                set_test_value(pt.dscalar(), np.array(1.0)),
+                set_test_value(pt.dscalar(), np.array(2.0)),
+            ],
+            (5,),
+        ),
+    ],
+    ids=str,
+)
+def test_Generator_RandomVariable(rv_op, dist_args, size):
     rng = shared(np.random.default_rng(29402))
-    g = ptr.normal(rng=rng)
+    g = rv_op(*dist_args, size=size, rng=rng)
     g_fg = FunctionGraph(outputs=[g])
 
-    with pytest.raises(TypeError):
-        compare_numba_and_py(
-            g_fg,
-            [
-                i.tag.test_value
-                for i in g_fg.inputs
-                if not isinstance(i, (SharedVariable, Constant))
-            ],
-        )
+    compare_numba_and_py(
+        g_fg,
+        [
+            i.tag.test_value
+            for i in g_fg.inputs
+            if not isinstance(i, (SharedVariable, Constant))
+        ],
+    )
+
+
+def test_Generator_updates():
+    """The state of a `Generator` is updated in place by in-place variables."""
+    rng = shared(np.random.default_rng(123))
+    next_rng, x = pt.random.normal(size=(3,), rng=rng).owner.outputs
+    fn = function([], x, updates={rng: next_rng}, mode="NUMBA")
+    assert fn.maker.fgraph.toposort()[-1].op.inplace
+
+    ref_rng = np.random.default_rng(123)
+    for _ in range(3):
+        np.testing.assert_array_equal(fn(), ref_rng.normal(size=(3,)))
+    assert rng.get_value(borrow=True).bit_generator.state == ref_rng.bit_generator.state
+
+
+def test_Generator_not_inplace():
+    """The `Generator` is not modified by variables that are not in-place."""
+    rng = shared(np.random.default_rng(123))
+    x = ptr.normal(size=(3,), rng=rng)
+    fn = function([], x, mode=numba_mode)
+    np.testing.assert_array_equal(fn(), fn())
+    assert (
+        rng.get_value(borrow=True).bit_generator.state
+        == np.random.default_rng(123).bit_generator.state
+    )
+
+
+def test_Generator_object_mode():
+    """The distributions without a Numba `Generator` implementation use object mode."""
+    rng = shared(np.random.default_rng(29402))
+    g = ptr.dirichlet(np.ones(3), size=(2,), rng=rng)
+    with pytest.warns(UserWarning, match="object mode"):
+        compare_numba_and_py(FunctionGraph(outputs=[g]), [])
@@ -2,19 +2,23 @@ import inspect
 from functools import singledispatch
 
 import numpy as np
+import pytest
 
 from pytensor import config
 from pytensor.graph.basic import Apply
 from pytensor.graph.fg import FunctionGraph
 from pytensor.graph.op import Op
+from pytensor.ifelse import ifelse
 from pytensor.link.utils import (
     fgraph_to_python,
     get_name_for_object,
+    ifelse_branch_contexts,
     unique_name_generator,
 )
-from pytensor.scalar.basic import Add, float64
+from pytensor.scalar.basic import Add, add, float64
 from pytensor.tensor import constant
 from pytensor.tensor.elemwise import Elemwise
+from pytensor.tensor.math import exp
 from pytensor.tensor.type import scalar, vector
 from pytensor.tensor.type_other import NoneConst
 
@@ -195,6 +199,77 @@ def test_fgraph_to_python_constant_inputs():
     assert res == (4.0,)
 
 
+@pytest.mark.parametrize("cond_fn", [None, lambda c, t, f: t() if c else f()])
+def test_fgraph_to_python_lazy_ifelse(cond_fn):
+    """Make sure that only the nodes of the taken branch of an `IfElse` are computed."""
+
+    x = vector("x")
+    c = scalar("c", dtype="bool")
+
+    class CountingOp(Op):
+        def __init__(self):
+            self.called = 0
+
+        def make_node(self, x):
+            return Apply(self, [x], [x.type()])
+
+        def perform(self, node, inputs, outputs):
+            outputs[0][0] = inputs[0]
+
+    @to_python.register(CountingOp)
+    def to_python_CountingOp(op, **kwargs):
+        def func(x, op=op):
+            op.called += 1
+            return x
+
+        return func
+
+    true_op = CountingOp()
+    false_op = CountingOp()
+    shared_op = CountingOp()
+
+    shared_out = shared_op(x)
+    true_out = true_op(shared_out + x)
+    out, other_out = ifelse(c, [true_out, shared_out], [false_op(x), shared_out])
+
+    out_fg = FunctionGraph([c, x], [out, other_out, shared_out], clone=False)
+    out_py = fgraph_to_python(out_fg, to_python, lazy_ifelse=True, cond_fn=cond_fn)
+    if cond_fn is None:
+        assert "if c:" in inspect.getsource(out_py)
+
+    x_val = np.r_[1, 2].astype(config.floatX)
+    res = out_py(np.array(True), x_val)
+    np.testing.assert_array_equal(res[0], 2 * x_val)
+    np.testing.assert_array_equal(res[1], x_val)
+    assert (true_op.called, false_op.called, shared_op.called) == (1, 0, 1)
+
+    res = out_py(np.array(False), x_val)
+    np.testing.assert_array_equal(res[0], x_val)
+    assert (true_op.called, false_op.called, shared_op.called) == (1, 1, 2)
+
+
+def test_ifelse_branch_contexts_destroyed_view():
+    """Nodes that read a view of a variable destroyed in place are not moved in a branch."""
+
+    x = vector("x")
+    c = scalar("c", dtype="bool")
+
+    a = exp(x)
+    a_view = a[1:]
+    a_sum = a_view.sum()
+    x_sum = x.sum()
+    out = ifelse(c, a_sum, x_sum)
+    destroy_out = Elemwise(add, {0: 0})(a, constant(1.0))
+
+    out_fg = FunctionGraph([c, x], [out, destroy_out], clone=False)
+    contexts = ifelse_branch_contexts(out_fg, out_fg.toposort())
+
+    assert contexts[a_view.owner] is None
+    assert contexts[a_sum.owner] is None
+    assert contexts[destroy_out.owner] is None
+    assert contexts[x_sum.owner] == (out.owner, False)
+
+
 def test_unique_name_generator():
     unique_names = unique_name_generator(["blah"], suffix_sep="_")
 
@@ -1,4 +1,7 @@
+import tempfile
+import threading
 import time
+from unittest.mock import patch
 
 import numpy as np
 import pytest
@@ -12,12 +15,22 @@ from pytensor.graph.basic import Apply
 from pytensor.graph.fg import FunctionGraph
 from pytensor.graph.op import Op
 from pytensor.ifelse import ifelse
-from pytensor.link.c.basic import OpWiseCLinker
+from pytensor.link.c import cmodule
+from pytensor.link.c.basic import CLinker, OpWiseCLinker
+from pytensor.link.c.cmodule import ModuleCache
 from pytensor.link.c.exceptions import MissingGXX
 from pytensor.link.utils import map_storage
-from pytensor.link.vm import VM, Loop, Stack, VMLinker
-from pytensor.tensor.math import cosh, tanh
-from pytensor.tensor.type import lscalar, scalar, scalars, vector, vectors
+from pytensor.link.vm import (
+    VM,
+    ArenaLoop,
+    Loop,
+    ParallelLoop,
+    Stack,
+    VMLinker,
+    plan_arena,
+)
+from pytensor.tensor.math import cosh, dot, log, tanh
+from pytensor.tensor.type import lscalar, matrix, scalar, scalars, vector, vectors
 from pytensor.tensor.variable import TensorConstant
 from tests import unittest_tools as utt
 
@@ -544,3 +557,193 @@ def test_Stack_updates():
 
     assert res == [np.array(1.0), np.array(2.0)]
     assert storage_map[a][0] == np.array(2.0)
+
+
+@pytest.mark.parametrize("allow_gc", [True, False])
+def test_ParallelLoop(allow_gc):
+    x = vector("x")
+    y = vector("y")
+    s = shared(np.zeros(3, dtype=config.floatX), name="s")
+    outs = [tanh(x) + cosh(y), (x * y).sum(), tanh(x + y) * cosh(x - y)]
+
+    seq_mode = Mode(linker=VMLinker(allow_gc=allow_gc, use_cloop=False))
+    par_mode = Mode(linker=VMLinker(allow_gc=allow_gc, use_cloop=False, n_threads=4))
+
+    f_seq = function([x, y], outs, mode=seq_mode)
+    f_par = function([x, y], outs, mode=par_mode, updates={s: s + outs[2]})
+    assert isinstance(f_par.vm, ParallelLoop)
+    assert f_par.vm.allow_gc == allow_gc
+
+    x_val = np.arange(3, dtype=config.floatX)
+    y_val = np.ones(3, dtype=config.floatX)
+    for i in range(1, 4):
+        for res_seq, res_par in zip(f_seq(x_val, y_val), f_par(x_val, y_val)):
+            np.testing.assert_allclose(res_par, res_seq)
+        np.testing.assert_allclose(s.get_value(), i * f_seq(x_val, y_val)[2])
+
+    if allow_gc:
+        for var, cell in f_par.vm.storage_map.items():
+            if var.owner is not None and var not in f_par.maker.fgraph.outputs:
+                assert cell[0] is None
+
+
+def test_ParallelLoop_inplace():
+    x = vector("x")
+    a = x + 1
+    # `a` is an intermediate result that can be destroyed by one branch, which
+    # must then be serialized after the other branch by the destroy dependencies
+    b = tanh(a) * 2
+    c = cosh(a) * 3
+    mode = Mode(
+        linker=VMLinker(use_cloop=False, n_threads=4), optimizer="fast_run"
+    ).excluding("fusion")
+    f = function([x], [b, c], mode=mode)
+    assert isinstance(f.vm, ParallelLoop)
+    assert any(node.op.destroy_map for node in f.maker.fgraph.apply_nodes)
+
+    x_val = np.arange(5, dtype=config.floatX)
+    f_ref = function([x], [b, c], mode=Mode(linker="py"))
+    for res, exp in zip(f(x_val), f_ref(x_val)):
+        np.testing.assert_allclose(res, exp, rtol=1e-5)
+
+
+def test_ParallelLoop_concurrent():
+    barrier = threading.Barrier(2, timeout=10)
+
+    class BarrierOp(Op):
+        """Wait for another node to reach the barrier before returning its input."""
+
+        def make_node(self, x):
+            return Apply(self, [x], [x.type()])
+
+        def perform(self, node, inputs, outputs):
+            barrier.wait()
+            outputs[0][0] = inputs[0].copy()
+
+    x = vector("x")
+    mode = Mode(optimizer=None, linker=VMLinker(use_cloop=False, n_threads=2))
+    # The two independent nodes only return if they run at the same time
+    f = function([x], [BarrierOp()(x), BarrierOp()(x)], mode=mode)
+    assert isinstance(f.vm, ParallelLoop)
+
+    x_val = np.arange(3, dtype=config.floatX)
+    for res in f(x_val):
+        np.testing.assert_allclose(res, x_val)
+
+
+def test_ParallelLoop_exception():
+    class BadOp(Op):
+        def make_node(self, x):
+            return Apply(self, [x], [x.type()])
+
+        def perform(self, node, inputs, outputs):
+            raise ValueError("bad Op")
+
+    x = vector("x")
+    mode = Mode(optimizer=None, linker=VMLinker(use_cloop=False, n_threads=2))
+    f = function([x], [BadOp()(x), tanh(x)], mode=mode)
+    assert isinstance(f.vm, ParallelLoop)
+
+    with pytest.raises(ValueError, match=".*Apply node that caused the error.*"):
+        f(np.ones(3, dtype=config.floatX))
+
+
+def test_ParallelLoop_not_used_with_lazy():
+    a, b, c = scalars("abc")
+    mode = Mode(linker=VMLinker(use_cloop=False, n_threads=2))
+    f = function([a, b, c], ifelse(a, b, c), mode=mode)
+    assert isinstance(f.vm, Stack)
+
+    f = function([a, b], a + b, mode=Mode(linker="vm_parallel"))
+    assert isinstance(f.vm, ParallelLoop) == (VMLinker(n_threads=0).get_n_threads() > 1)
+
+
+@pytest.mark.skipif(
+    not config.cxx, reason="G++ not available, so we need to skip this test."
+)
+@config.change_flags(cmodule__compilation_workers=2)
+def test_VMLinker_precompile_c_thunks():
+    compile_many = ModuleCache.compile_many
+    x = vector("x")
+    out = tanh(x) * cosh(x) - x
+
+    with tempfile.TemporaryDirectory() as dir_name:
+        cache = ModuleCache(dir_name)
+        compiledir_prop = config._config_var_dict["compiledir"]
+        with (
+            patch.object(compiledir_prop, "val", dir_name, create=True),
+            patch.object(cmodule, "_module_cache", cache),
+            patch.object(
+                ModuleCache, "compile_many", autospec=True, side_effect=compile_many
+            ) as compile_many_mock,
+        ):
+            f = function([x], out, mode=Mode(linker=VMLinker(), optimizer=None))
+            compile_many_mock.assert_called_once()
+            # Every node was compiled by `ModuleCache.compile_many`, and
+            # building the thunks only hit the cache
+            assert cache.stats[2] == len(f.maker.fgraph.apply_nodes)
+
+            # The C code of the modules that are already loaded is not generated
+            with patch.object(
+                CLinker, "get_src_code", autospec=True, side_effect=CLinker.get_src_code
+            ) as get_src_code_mock:
+                function([x], out, mode=Mode(linker=VMLinker(), optimizer=None))
+            get_src_code_mock.assert_not_called()
+            compile_many_mock.assert_called_once()
+
+    x_val = np.arange(3, dtype=config.floatX)
+    np.testing.assert_allclose(
+        f(x_val), np.tanh(x_val) * np.cosh(x_val) - x_val, rtol=1e-6
+    )
+
+
+def test_plan_arena():
+    a, b, c, d = vectors("abcd")
+    intervals = {a: (0, 1), b: (1, 2), c: (2, 3), d: (0, 3)}
+    nbytes = {a: 100, b: 64, c: 100, d: 10}
+    offsets, size = plan_arena(intervals, nbytes, alignment=64)
+
+    assert all(offset % 64 == 0 for offset in offsets.values())
+    for x, y in ((a, b), (a, d), (b, c), (b, d), (c, d)):
+        x_end = offsets[x] + nbytes[x]
+        y_end = offsets[y] + nbytes[y]
+        assert x_end <= offsets[y] or y_end <= offsets[x]
+    # `c` reuses the memory of `a`
+    assert offsets[c] == offsets[a]
+    assert size == 128 + 64 + 64
+
+
+def test_arena_loop():
+    x = matrix("x")
+    y = cosh(x) + 1
+    z = dot((y * y).T, log(y))
+    out = (tanh(z) + z).sum(axis=0)
+
+    with config.change_flags(vm__arena=True):
+        if config.cxx:
+            with pytest.warns(UserWarning, match="CVM does not support the arena"):
+                f = function([x], out, mode=Mode(linker="cvm"))
+        else:
+            f = function([x], out, mode=Mode(linker="cvm"))
+    assert isinstance(f.vm, ArenaLoop)
+    g = function([x], out, mode=Mode(linker=VMLinker(arena=False)))
+    assert not isinstance(g.vm, ArenaLoop)
+
+    x_val = np.random.random((5, 5)).astype(config.floatX)
+    utt.assert_allclose(f(x_val), g(x_val))
+    # The shapes seen in the first call are used to plan the arena
+    utt.assert_allclose(f(x_val), g(x_val))
+    assert f.vm.arena is not None
+    arena_outputs = [
+        view for outputs in f.vm.node_arena_outputs for _, _, view in outputs
+    ]
+    assert any(view is not None for view in arena_outputs)
+    # The outputs of the function are not stored in the arena
+    assert not np.shares_memory(f(x_val), f.vm.arena)
+
+    # The arena is planned again when the shapes change
+    x_val = np.random.random((3, 7)).astype(config.floatX)
+    utt.assert_allclose(f(x_val), g(x_val))
+    assert f.vm.replan
+    utt.assert_allclose(f(x_val), g(x_val))
+    assert not f.vm.replan
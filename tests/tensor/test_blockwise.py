@@ -4,6 +4,7 @@ from typing import Optional, Union
 
 import numpy as np
 import pytest
+import scipy.linalg
 
 import pytensor
 from pytensor import config, function
@@ -399,3 +400,60 @@ def test_cop_with_params():
 
     with pytest.raises(AssertionError):
         fn(np.zeros((5, 3, 2)) - 1)
+
+
+@pytest.mark.parametrize("lower", [True, False])
+@pytest.mark.parametrize("on_error", ["raise", "nan"])
+def test_cholesky_batched_perform(lower, on_error):
+    rng = np.random.default_rng(sum(map(ord, "cholesky_batched_perform")))
+    x = rng.normal(size=(4, 3, 5, 5))
+    x_val = np.einsum("...ij,...kj->...ik", x, x)
+    core_op = Cholesky(lower=lower, on_error=on_error)
+    out = Blockwise(core_op)(tensor(shape=(None, None, 5, 5)))
+
+    np_func = np.vectorize(
+        lambda x: scipy.linalg.cholesky(x, lower=lower), signature="(m,m)->(m,m)"
+    )
+    output_storage = [[None]]
+    out.owner.op.perform(out.owner, [x_val], output_storage)
+    np.testing.assert_allclose(output_storage[0][0], np_func(x_val))
+
+    # Only the matrices that are not positive definite fail
+    x_val[1, 2] = -np.eye(5)
+    if on_error == "raise":
+        with pytest.raises(np.linalg.LinAlgError):
+            out.owner.op.perform(out.owner, [x_val], output_storage)
+    else:
+        out.owner.op.perform(out.owner, [x_val], output_storage)
+        res = output_storage[0][0]
+        assert np.isnan(res[1, 2]).all()
+        res[1, 2] = x_val[1, 2] = np.eye(5)
+        np.testing.assert_allclose(res, np_func(x_val))
+
+    x_val[0, 0, 0, 0] = np.inf
+    with pytest.raises(ValueError, match="infs or NaNs"):
+        out.owner.op.perform(out.owner, [x_val], output_storage)
+
+
+@pytest.mark.parametrize("assume_a", ["gen", "pos"])
+@pytest.mark.parametrize("b_ndim", [1, 2])
+def test_solve_batched_perform(assume_a, b_ndim):
+    rng = np.random.default_rng(sum(map(ord, "solve_batched_perform")))
+    a = rng.normal(size=(3, 1, 4, 4))
+    a_val = np.einsum("...ij,...kj->...ik", a, a)
+    b_val = rng.normal(size=(1, 2, 4) + (3,) * (b_ndim - 1))
+    core_op = Solve(assume_a=assume_a, b_ndim=b_ndim)
+    out = Blockwise(core_op)(
+        tensor(shape=(None, 1, 4, 4)), tensor(shape=(1, None) + (None,) * b_ndim)
+    )
+    assert out.type.shape[:2] == (None, None)
+
+    output_storage = [[None]]
+    out.owner.op.perform(out.owner, [a_val, b_val], output_storage)
+    np_func = np.vectorize(
+        lambda a, b: scipy.linalg.solve(a, b, assume_a=assume_a),
+        signature=core_op.gufunc_signature,
+    )
+    res = output_storage[0][0]
+    assert res.shape == (3, 2, 4) + (3,) * (b_ndim - 1)
+    np.testing.assert_allclose(res, np_func(a_val, b_val))
@@ -680,6 +680,20 @@ class TestCAReduce(unittest_tools.InferShapeTester):
             self.op(ps.add, axis=(-2,))(x)
 
 
+@pytest.mark.skipif(
+    not pytensor.config.cxx, reason="G++ not available, so we need to skip this test."
+)
+def test_careduce_c_code_release_gil():
+    x = matrix("x")
+    fg = FunctionGraph([x], [pt_sum(x, axis=0, acc_dtype=x.dtype)])
+    src = CLinker().accept(fg).get_src_code()
+    assert "Py_BEGIN_ALLOW_THREADS" in src
+
+    f = make_function(CLinker().accept(fg))
+    x_val = np.arange(12, dtype=config.floatX).reshape((3, 4))
+    np.testing.assert_allclose(f(x_val), x_val.sum(axis=0))
+
+
 class TestBitOpReduceGrad:
     def setup_method(self):
         self.rng = np.random.default_rng(unittest_tools.fetch_seed())
@@ -884,6 +898,31 @@ class TestElemwise(unittest_tools.InferShapeTester):
         y = tensor(dtype="float64", shape=(0, 1, None))
         assert (x + y).type.shape == (0, 0, 0)
 
+    @pytest.mark.skipif(
+        not pytensor.config.cxx,
+        reason="G++ not available, so we need to skip this test.",
+    )
+    def test_c_code_release_gil(self):
+        x = matrix("x")
+        fg = FunctionGraph([x], [exp(x)])
+        assert "Py_BEGIN_ALLOW_THREADS" in CLinker().accept(fg).get_src_code()
+
+        with config.change_flags(cmodule__release_gil=False):
+            fg = FunctionGraph([x], [exp(x)])
+            src = CLinker().accept(fg).get_src_code()
+            assert "Py_BEGIN_ALLOW_THREADS" not in src
+
+        # The integer division raises a Python error, so it must keep the GIL
+        a = lscalar("a")
+        b = lscalar("b")
+        fg = FunctionGraph([a, b], [a // b])
+        assert "Py_BEGIN_ALLOW_THREADS" not in CLinker().accept(fg).get_src_code()
+
+        fg = FunctionGraph([x], [exp(x)])
+        f = make_function(CLinker().accept(fg))
+        x_val = np.ones((3, 4), dtype=config.floatX)
+        np.testing.assert_allclose(f(x_val), np.exp(x_val), rtol=1e-6)
+
     def test_invalid_static_shape(self):
         x = tensor(dtype="float64", shape=(2,))
         y = tensor(dtype="float64", shape=(3,))
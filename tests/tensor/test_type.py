@@ -196,6 +196,27 @@ def test_filter_memmap():
     assert res is fp
 
 
+def test_filter_many():
+    test_type = TensorType("float64", shape=(None,))
+    a = np.zeros(2)
+    b = np.ones(2)
+    res = test_type.filter_many([a, b, [1, 2]])
+    assert res[0] is a and res[1] is b
+    np.testing.assert_array_equal(res[2], [1.0, 2.0])
+
+    with pytest.raises(TypeError):
+        test_type.filter_many([a, np.zeros((2, 2))])
+    with pytest.raises(TypeError):
+        test_type.filter_many([a, np.zeros(2, dtype="float32")], strict=True)
+
+    scalar_type = TensorType("int64", shape=())
+    res = scalar_type.filter_many([1, 2, 3])
+    assert all(isinstance(r, np.ndarray) and r.dtype == "int64" for r in res)
+    assert [int(r) for r in res] == [1, 2, 3]
+    with pytest.raises(OverflowError):
+        scalar_type.filter_many([1, 2**70])
+
+
 def test_may_share_memory():
     a = np.array(2)
     b = np.broadcast_to(a, (2, 3))
@@ -3,6 +3,7 @@
 import configparser as stdlib_configparser
 import io
 import pickle
+import threading
 
 import pytest
 
@@ -159,6 +160,44 @@ def test_config_context():
     assert root.test__config_context == "test_default"
 
 
+def test_thread_flags():
+    root = _create_test_config()
+    root.add(
+        "test__thread_flags",
+        "A config var from a test case.",
+        configparser.StrParam("test_default"),
+    )
+
+    with root.change_flags(test__thread_flags="snapshot_value"):
+        flags = root.snapshot_flags()
+    assert flags["test__thread_flags"] == "snapshot_value"
+
+    seen = []
+
+    def run():
+        with root.thread_flags(flags):
+            seen.append(root.test__thread_flags)
+            with root.change_flags(test__thread_flags="thread_value"):
+                seen.append(root.test__thread_flags)
+                main_thread_changed.set()
+                main_thread_checked.wait()
+            seen.append(root.test__thread_flags)
+        seen.append(root.test__thread_flags)
+
+    main_thread_changed = threading.Event()
+    main_thread_checked = threading.Event()
+    thread = threading.Thread(target=run)
+    thread.start()
+    main_thread_changed.wait()
+    # The flags changed in the thread are not seen by the other threads
+    assert root.test__thread_flags == "test_default"
+    main_thread_checked.set()
+    thread.join()
+
+    assert seen == ["snapshot_value", "thread_value", "snapshot_value", "test_default"]
+    assert root.test__thread_flags == "test_default"
+
+
 def test_invalid_configvar_access():
     root = configdefaults.config
     root_test = _create_test_config()